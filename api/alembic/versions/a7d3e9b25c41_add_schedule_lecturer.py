@@ -0,0 +1,39 @@
+"""add schedule lecturer
+
+Revision ID: a7d3e9b25c41
+Revises: f2c8d4a61b93
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9b25c41'
+down_revision: Union[str, None] = 'f2c8d4a61b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tblScheduleLecturer',
+    sa.Column('group', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('group', 'name')
+    )
+    op.execute(
+        'INSERT INTO "tblScheduleLecturer" ("group", name) '
+        'SELECT DISTINCT "group", lecturer FROM "tblSchedulePair" WHERE lecturer IS NOT NULL AND lecturer <> \'\''
+    )
+    op.create_index('ix_tblTeacher_user_id_name', 'tblTeacher', ['user_id', 'name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tblTeacher_user_id_name', table_name='tblTeacher')
+    op.drop_table('tblScheduleLecturer')
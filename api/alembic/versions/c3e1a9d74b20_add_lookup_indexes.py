@@ -0,0 +1,38 @@
+"""add lookup indexes
+
+Revision ID: c3e1a9d74b20
+Revises: 45864e2fd478
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e1a9d74b20'
+down_revision: Union[str, None] = '45864e2fd478'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_tblUser_telegram_id'), 'tblUser', ['telegram_id'], unique=True)
+    op.create_index(op.f('ix_tblTeacher_user_id'), 'tblTeacher', ['user_id'], unique=False)
+    op.create_index(op.f('ix_tblDiscipline_user_id'), 'tblDiscipline', ['user_id'], unique=False)
+    op.create_index(op.f('ix_tblLesson_user_id'), 'tblLesson', ['user_id'], unique=False)
+    op.create_index('ix_tblTask_user_id_end_date', 'tblTask', ['user_id', 'end_date'], unique=False)
+    op.create_index(op.f('ix_tblFile_task_id'), 'tblFile', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_tblFile_task_id'), table_name='tblFile')
+    op.drop_index('ix_tblTask_user_id_end_date', table_name='tblTask')
+    op.drop_index(op.f('ix_tblLesson_user_id'), table_name='tblLesson')
+    op.drop_index(op.f('ix_tblDiscipline_user_id'), table_name='tblDiscipline')
+    op.drop_index(op.f('ix_tblTeacher_user_id'), table_name='tblTeacher')
+    op.drop_index(op.f('ix_tblUser_telegram_id'), table_name='tblUser')
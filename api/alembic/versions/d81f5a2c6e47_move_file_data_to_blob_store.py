@@ -0,0 +1,69 @@
+"""move file_data to blob store
+
+Revision ID: d81f5a2c6e47
+Revises: c3e1a9d74b20
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+import hashlib
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config.project_config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f5a2c6e47'
+down_revision: Union[str, None] = 'c3e1a9d74b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Раскладка повторяет LocalBlobStore на момент миграции: <корень>/<2 символа>/<2 символа>/<sha256>
+def blob_path(key: str) -> str:
+    return os.path.join(settings.BLOB_STORE_PATH, key[:2], key[2:4], key)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tblFile', sa.Column('blob_key', sa.String(length=64), nullable=True))
+    op.add_column('tblFile', sa.Column('file_size', sa.Integer(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execution_options(stream_results=True, yield_per=100).execute(
+        sa.text('SELECT file_id, file_data FROM "tblFile"'))
+    for file_id, file_data in rows:
+        file_data = bytes(file_data)
+        key = hashlib.sha256(file_data).hexdigest()
+        path = blob_path(key)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as blob_file:
+                blob_file.write(file_data)
+        bind.execute(sa.text('UPDATE "tblFile" SET blob_key = :key, file_size = :size WHERE file_id = :file_id'),
+                     {"key": key, "size": len(file_data), "file_id": file_id})
+
+    op.alter_column('tblFile', 'blob_key', nullable=False)
+    op.alter_column('tblFile', 'file_size', nullable=False, server_default='0')
+    op.create_index(op.f('ix_tblFile_blob_key'), 'tblFile', ['blob_key'], unique=False)
+    op.drop_column('tblFile', 'file_data')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('tblFile', sa.Column('file_data', sa.LargeBinary(), nullable=True))
+
+    bind = op.get_bind()
+    rows = bind.execute(sa.text('SELECT file_id, blob_key FROM "tblFile"')).all()
+    for file_id, key in rows:
+        with open(blob_path(key), 'rb') as blob_file:
+            bind.execute(sa.text('UPDATE "tblFile" SET file_data = :data WHERE file_id = :file_id'),
+                         {"data": blob_file.read(), "file_id": file_id})
+
+    op.alter_column('tblFile', 'file_data', nullable=False)
+    op.drop_index(op.f('ix_tblFile_blob_key'), table_name='tblFile')
+    op.drop_column('tblFile', 'file_size')
+    op.drop_column('tblFile', 'blob_key')
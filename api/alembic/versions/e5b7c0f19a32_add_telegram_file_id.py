@@ -0,0 +1,30 @@
+"""add telegram file_id to file
+
+Revision ID: e5b7c0f19a32
+Revises: d81f5a2c6e47
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7c0f19a32'
+down_revision: Union[str, None] = 'd81f5a2c6e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tblFile', sa.Column('telegram_file_id', sa.String(length=255), nullable=True))
+    op.add_column('tblFile', sa.Column('telegram_file_unique_id', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tblFile', 'telegram_file_unique_id')
+    op.drop_column('tblFile', 'telegram_file_id')
@@ -0,0 +1,42 @@
+"""add schedule pair
+
+Revision ID: f2c8d4a61b93
+Revises: e5b7c0f19a32
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8d4a61b93'
+down_revision: Union[str, None] = 'e5b7c0f19a32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tblSchedulePair',
+    sa.Column('pair_id', sa.Integer(), nullable=False),
+    sa.Column('group', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('pair_date', sa.Date(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=True),
+    sa.Column('end_time', sa.Time(), nullable=True),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('lesson_type', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('lecturer', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('classroom', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.PrimaryKeyConstraint('pair_id')
+    )
+    op.create_index('ix_tblSchedulePair_group_pair_date', 'tblSchedulePair', ['group', 'pair_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tblSchedulePair_group_pair_date', table_name='tblSchedulePair')
+    op.drop_table('tblSchedulePair')
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -7,6 +9,23 @@ load_dotenv()
 class Settings(BaseSettings):
     DATABASE_URL: str
 
+    # Асинхронное подключение к БД, используемое сервисом API.
+    # Если ASYNC_DATABASE_URL не задан, он строится из DATABASE_URL заменой драйвера на DATABASE_ASYNC_DRIVER
+    ASYNC_DATABASE_URL: str | None = None
+    DATABASE_ASYNC_DRIVER: str = "asyncpg"
+
+    # Параметры пула соединений с БД
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+
+    # Хранилище содержимого файлов заданий. В БД хранятся только метаданные и ключ
+    BLOB_STORE_BACKEND: str = "local"
+    BLOB_STORE_PATH: str = str(Path(__file__).resolve().parent.parent / "blobs")
+    BLOB_CHUNK_SIZE: int = 1024 * 1024
+
     class Config:
         env_file = ".env"  # Путь к .env файлу относительно этого сервиса
         env_file_encoding = 'utf-8'
@@ -0,0 +1,130 @@
+"""
+Этот файл содержит хранилище содержимого файлов заданий
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from typing import AsyncIterator
+
+from ..config.project_config import settings
+
+
+class BlobStore:
+    """
+    Интерфейс хранилища. Содержимое записывается и читается потоком частей,
+    наружу отдается только ключ, по которому его можно найти.
+    """
+
+    async def put(self, chunks: AsyncIterator[bytes]) -> tuple[str, int]:
+        """
+        Сохраняет поток частей и возвращает ключ и размер содержимого в байтах.
+        """
+        key, size, staged = await self.stage(chunks)
+        await self.commit(key, staged)
+        return key, size
+
+    async def stage(self, chunks: AsyncIterator[bytes]) -> tuple[str, int, str]:
+        """
+        Записывает поток частей во временную копию и возвращает ключ, размер и идентификатор копии.
+        Содержимое становится доступным по ключу только после commit.
+        """
+        raise NotImplementedError
+
+    async def commit(self, key: str, staged: str):
+        """
+        Делает временную копию доступной по ключу. Если такое содержимое уже есть, копия удаляется.
+        """
+        raise NotImplementedError
+
+    async def discard(self, staged: str):
+        raise NotImplementedError
+
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def open(self, key: str) -> AsyncIterator[bytes]:
+        """
+        Возвращает содержимое по ключу в виде потока частей.
+        """
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """
+    Хранилище в локальной файловой системе с адресацией по содержимому:
+    ключом служит SHA-256, одинаковые файлы хранятся в одном экземпляре.
+    """
+
+    def __init__(self, root: str, chunk_size: int):
+        self.root = root
+        self.chunk_size = chunk_size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    async def stage(self, chunks: AsyncIterator[bytes]) -> tuple[str, int, str]:
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await asyncio.to_thread(tmp_file.write, chunk)
+        except BaseException:
+            await self.discard(tmp_path)
+            raise
+        return digest.hexdigest(), size, tmp_path
+
+    async def commit(self, key: str, staged: str):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Если такое содержимое уже есть, временная копия просто удаляется
+            if os.path.exists(path):
+                os.remove(staged)
+            else:
+                os.replace(staged, path)
+        except BaseException:
+            await self.discard(staged)
+            raise
+
+    async def discard(self, staged: str):
+        if os.path.exists(staged):
+            os.remove(staged)
+
+    async def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    async def open(self, key: str) -> AsyncIterator[bytes]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            raise ValueError(f"Содержимое файла {key} не найдено в хранилище")
+        with open(path, "rb") as blob_file:
+            while chunk := await asyncio.to_thread(blob_file.read, self.chunk_size):
+                yield chunk
+
+    async def delete(self, key: str):
+        path = self._path(key)
+        if os.path.exists(path):
+            await asyncio.to_thread(os.remove, path)
+
+
+blob_store_backends = {
+    "local": lambda: LocalBlobStore(settings.BLOB_STORE_PATH, settings.BLOB_CHUNK_SIZE),
+}
+
+if settings.BLOB_STORE_BACKEND not in blob_store_backends:
+    raise ValueError(f"Неизвестное хранилище файлов {settings.BLOB_STORE_BACKEND}")
+
+blob_store = blob_store_backends[settings.BLOB_STORE_BACKEND]()
@@ -1,21 +1,46 @@
 from typing import Annotated
 
 from fastapi import Depends
-from sqlalchemy import create_engine
-from sqlmodel import Session
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
 from ..config.project_config import settings
+from .pool_metrics import InstrumentedPool, register_pool_events
 
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL
+
+def get_async_database_url() -> str:
+    """
+    Возвращает адрес БД для асинхронного драйвера.
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(SQLALCHEMY_DATABASE_URL)
+    return url.set(drivername=f"{url.get_backend_name()}+{settings.DATABASE_ASYNC_DRIVER}")\
+        .render_as_string(hide_password=False)
+
+
+async_engine = create_async_engine(
+    get_async_database_url(),
+    poolclass=InstrumentedPool,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
 )
+register_pool_events(async_engine.sync_engine.pool)
+
+# expire_on_commit=False: обработчики возвращают объекты после commit, а ленивая
+# подгрузка атрибутов в асинхронной сессии невозможна
+async_session_maker = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
 
-def get_session():
-    with Session(engine) as session:
+async def get_session():
+    async with async_session_maker() as session:
         yield session
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
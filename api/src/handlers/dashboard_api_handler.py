@@ -0,0 +1,79 @@
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from api.src.schemas import GetDashboardSchema, GetDashboardResponseSchema, GetLabResponseSchema, \
+    GetDisciplineResponseSchema, GetLessonResponseSchema, GetTeacherResponseSchema
+from api.src.models import User
+
+
+async def get_dashboard_handler(session: AsyncSession, schema: GetDashboardSchema) -> GetDashboardResponseSchema:
+    # Все связанные записи пользователя подгружаются в одном обращении к сессии:
+    # selectinload выполняет по одному запросу IN (...) на каждую коллекцию без декартова произведения строк
+    user_query = select(User).where(User.telegram_id == schema.telegram_id).options(
+        selectinload(User.tasks),
+        selectinload(User.disciplines),
+        selectinload(User.lessons),
+        selectinload(User.teachers)
+    )
+    user = (await session.exec(user_query)).first()
+    if not user:
+        raise ValueError(f"Пользователь с Telegram ID {schema.telegram_id} не найден")
+
+    labs_list = []
+    for lab in user.tasks:
+        labs_list.append(GetLabResponseSchema(
+            task_id=lab.task_id,
+            user_id=lab.user_id,
+            discipline_id=lab.discipline_id,
+            name=lab.name,
+            task_text=lab.task_text,
+            task_link=lab.task_link,
+            start_date=lab.start_date,
+            end_date=lab.end_date,
+            extra_info=lab.extra_info,
+            status=lab.status.value
+        ))
+
+    disciplines_list = []
+    for discipline in sorted(user.disciplines, key=lambda x: x.name):
+        disciplines_list.append(GetDisciplineResponseSchema(
+            discipline_id=discipline.discipline_id,
+            user_id=discipline.user_id,
+            teacher_id=discipline.teacher_id,
+            name=discipline.name,
+            is_from_API=discipline.is_from_API
+        ))
+
+    lessons_list = []
+    for lesson in user.lessons:
+        lessons_list.append(GetLessonResponseSchema(
+            lesson_id=lesson.lesson_id,
+            user_id=lesson.user_id,
+            discipline_id=lesson.discipline_id,
+            classroom=lesson.classroom,
+            start_date=lesson.start_date,
+            start_time=lesson.start_time,
+            end_time=lesson.end_time,
+            periodicity_days=lesson.periodicity_days
+        ))
+
+    teachers_list = []
+    for teacher in user.teachers:
+        teachers_list.append(GetTeacherResponseSchema(
+            user_id=teacher.user_id,
+            teacher_id=teacher.teacher_id,
+            name=teacher.name,
+            phone_number=teacher.phone_number,
+            email=teacher.email,
+            social_page_link=teacher.social_page_link,
+            classroom=teacher.classroom,
+            is_from_API=teacher.is_from_API
+        ))
+
+    return GetDashboardResponseSchema(
+        user_id=user.user_id,
+        labs=labs_list,
+        disciplines=disciplines_list,
+        lessons=lessons_list,
+        teachers=teachers_list
+    )
@@ -1,13 +1,15 @@
-from sqlmodel import Session, select, delete, update
+from sqlmodel import select, delete, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 from api.src.schemas import AddDisciplineSchema, GetDisciplinesSchema, GetDisciplinesResponseSchema, GetDisciplineSchema, \
     GetDisciplineResponseSchema, GetDisciplineApiStatusSchema, GetDisciplineApiStatusResponseSchema, EditDisciplineAttributeSchema,\
     DeleteDisciplineSchema
+from api.src.pagination import fetch_page
 from api.src.models import Discipline, User
 
 
-def add_discipline_handler(session: Session, schema: AddDisciplineSchema):
+async def add_discipline_handler(session: AsyncSession, schema: AddDisciplineSchema):
     user_query = select(User).where(User.user_id == schema.user_id)
-    user = session.exec(user_query).first()
+    user = (await session.exec(user_query)).first()
     new_item = Discipline(
         user_id=user.user_id,
         teacher_id=schema.teacher_id,
@@ -15,14 +17,17 @@ def add_discipline_handler(session: Session, schema: AddDisciplineSchema):
         is_from_API=schema.is_from_API
     )
     session.add(new_item)
-    session.commit()
-    session.refresh(new_item)
+    await session.commit()
+    await session.refresh(new_item)
     return {f"Дисциплина {schema} добавлена."}
 
 
-def get_disciplines_handler(session: Session, schema: GetDisciplinesSchema) -> GetDisciplinesResponseSchema:
+async def get_disciplines_handler(session: AsyncSession, schema: GetDisciplinesSchema) -> GetDisciplinesResponseSchema:
     user_query = select(Discipline).where(Discipline.user_id == schema.user_id)
-    disciplines = session.exec(user_query).all()
+    if schema.discipline_ids is not None:
+        user_query = user_query.where(Discipline.discipline_id.in_(schema.discipline_ids))
+    disciplines, next_cursor = await fetch_page(session, user_query, [Discipline.name, Discipline.discipline_id],
+                                                schema.cursor, schema.limit)
     disciplines_list = []
     for discipline in disciplines:
         disciplines_list.append(GetDisciplineResponseSchema(
@@ -33,12 +38,12 @@ def get_disciplines_handler(session: Session, schema: GetDisciplinesSchema) -> G
             is_from_API=discipline.is_from_API
         ))
 
-    return GetDisciplinesResponseSchema(disciplines=disciplines_list)
+    return GetDisciplinesResponseSchema(disciplines=disciplines_list, next_cursor=next_cursor)
 
 
-def get_discipline_handler(session: Session, schema: GetDisciplineSchema) -> GetDisciplineResponseSchema:
+async def get_discipline_handler(session: AsyncSession, schema: GetDisciplineSchema) -> GetDisciplineResponseSchema:
     discipline_query = select(Discipline).where(Discipline.discipline_id == schema.discipline_id)
-    discipline = session.exec(discipline_query).first()
+    discipline = (await session.exec(discipline_query)).first()
     get_discipline = GetDisciplineResponseSchema(
         discipline_id=discipline.discipline_id,
         user_id=discipline.user_id,
@@ -50,17 +55,17 @@ def get_discipline_handler(session: Session, schema: GetDisciplineSchema) -> Get
     return get_discipline
 
 
-def get_discipline_api_status_handler(session: Session, schema: GetDisciplineApiStatusSchema) -> GetDisciplineApiStatusResponseSchema:
+async def get_discipline_api_status_handler(session: AsyncSession, schema: GetDisciplineApiStatusSchema) -> GetDisciplineApiStatusResponseSchema:
     discipline_query = select(Discipline).where(Discipline.discipline_id == schema.discipline_id)
-    discipline = session.exec(discipline_query).first()
+    discipline = (await session.exec(discipline_query)).first()
     return GetDisciplineApiStatusResponseSchema(is_from_API=discipline.is_from_API)
 
 
-def edit_discipline_attribute_handler(session: Session, schema: EditDisciplineAttributeSchema):
+async def edit_discipline_attribute_handler(session: AsyncSession, schema: EditDisciplineAttributeSchema):
     # update_data = {schema.editing_attribute : schema.editing_value}
     # discipline_query = update(Discipline).where(Discipline.discipline_id == schema.discipline_id).values(**update_data)
     discipline_query = select(Discipline).where(Discipline.discipline_id == schema.discipline_id)
-    discipline = session.exec(discipline_query).first()
+    discipline = (await session.exec(discipline_query)).first()
 
     if schema.editing_attribute == "teacher_id":
         editing_value = int(schema.editing_value)
@@ -70,19 +75,19 @@ def edit_discipline_attribute_handler(session: Session, schema: EditDisciplineAt
     if discipline:
         setattr(discipline, schema.editing_attribute, editing_value)
         # session.add(discipline)
-        session.commit()
-        # session.refresh(discipline)
+        await session.commit()
+        # await session.refresh(discipline)
         return discipline
     else:
         raise ValueError(f"Дисциплина с ID {schema.discipline_id} не найдена")
 
 
-def delete_discipline_handler(session: Session, schema: DeleteDisciplineSchema):
+async def delete_discipline_handler(session: AsyncSession, schema: DeleteDisciplineSchema):
     discipline_query = select(Discipline).where(Discipline.discipline_id == schema.discipline_id)
-    discipline = session.exec(discipline_query).first()
+    discipline = (await session.exec(discipline_query)).first()
 
     if discipline:
-        session.exec(delete(Discipline).where(Discipline.discipline_id == schema.discipline_id))
-        session.commit()
+        await session.execute(delete(Discipline).where(Discipline.discipline_id == schema.discipline_id))
+        await session.commit()
     else:
         raise ValueError(f"Дисциплина с ID {schema.discipline_id} не найдена")
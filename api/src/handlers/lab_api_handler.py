@@ -1,6 +1,17 @@
-from sqlmodel import Session, select, delete, update
-from api.src.schemas import AddLabSchema, AddFileSchema, GetLabsSchema, GetLabsResponseSchema, GetLabResponseSchema, \
-    GetLabFilesSchema, GetFileResponseSchema, GetLabFilesResponseSchema, EditLabAttributeSchema, DeleteFilesSchema
+import logging
+from datetime import date
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, not_, func
+from sqlmodel import select, delete, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+from api.src.blob_store import blob_store
+from api.src.pagination import fetch_page
+from api.src.schemas import AddLabSchema, UploadFileSchema, GetFileDataSchema, GetLabsSchema, GetLabsResponseSchema, \
+    GetLabResponseSchema, GetLabFilesSchema, GetFileResponseSchema, GetLabFilesResponseSchema, EditLabAttributeSchema, \
+    DeleteFilesSchema, EditFileTelegramIdSchema
 from api.src.models import Task, User, Status, File, FileType
 
 status_dict = {
@@ -18,9 +29,9 @@ file_type_dict = {
 }
 
 
-def add_lab_handler(session: Session, schema: AddLabSchema):
+async def add_lab_handler(session: AsyncSession, schema: AddLabSchema):
     user_query = select(User).where(User.user_id == schema.user_id)
-    user = session.exec(user_query).first()
+    user = (await session.exec(user_query)).first()
     print(schema)
     new_item = Task(
         user_id=user.user_id,
@@ -34,27 +45,120 @@ def add_lab_handler(session: Session, schema: AddLabSchema):
         status=status_dict[schema.status]
     )
     session.add(new_item)
-    session.commit()
-    session.refresh(new_item)
+    await session.commit()
+    await session.refresh(new_item)
     return {"task_id": new_item.task_id}
 
 
-def add_file_handler(session: Session, schema: AddFileSchema):
+async def lock_blob(session: AsyncSession, blob_key: str):
+    """
+    Блокирует ключ содержимого до конца транзакции сессии. Под блокировкой загрузка привязывает к содержимому
+    новую запись о файле, а удаление проверяет, что ссылок на содержимое не осталось, поэтому удаление
+    не может убрать содержимое, которое параллельная загрузка только что посчитала уже сохраненным.
+    """
+    # Первые 15 шестнадцатеричных цифр SHA-256 помещаются в bigint ключа pg_advisory_xact_lock
+    await session.exec(select(func.pg_advisory_xact_lock(int(blob_key[:15], 16))))
+
+
+async def upload_file_handler(session: AsyncSession, schema: UploadFileSchema, chunks: AsyncIterator[bytes]):
+    blob_key, file_size, staged = await blob_store.stage(chunks)
+    try:
+        await lock_blob(session, blob_key)
+    except BaseException:
+        await blob_store.discard(staged)
+        raise
+    await blob_store.commit(blob_key, staged)
     new_item = File(
         task_id=schema.task_id,
         file_name=schema.file_name,
-        file_data=schema.file_data,
-        file_type=file_type_dict[schema.file_type]
+        blob_key=blob_key,
+        file_size=file_size,
+        file_type=file_type_dict[schema.file_type],
+        telegram_file_id=schema.telegram_file_id,
+        telegram_file_unique_id=schema.telegram_file_unique_id
     )
     session.add(new_item)
-    session.commit()
-    session.refresh(new_item)
-    return {f"Файл {schema} добавлен."}
+    await session.commit()
+    await session.refresh(new_item)
+    return {"file_id": new_item.file_id}
+
+
+async def get_file_data_handler(session: AsyncSession, schema: GetFileDataSchema) -> StreamingResponse:
+    file_query = select(File).where(File.file_id == schema.file_id)
+    file = (await session.exec(file_query)).first()
+    if not file:
+        raise HTTPException(status_code=404, detail=f"Файл с ID {schema.file_id} не найден")
+    # После начала передачи ответа ошибку уже нельзя вернуть, поэтому наличие содержимого проверяется заранее
+    if not await blob_store.exists(file.blob_key):
+        raise HTTPException(status_code=404, detail=f"Содержимое файла с ID {schema.file_id} не найдено")
+    return StreamingResponse(blob_store.open(file.blob_key), media_type="application/octet-stream",
+                             headers={"Content-Length": str(file.file_size)})
+
+
+async def edit_file_telegram_id_handler(session: AsyncSession, schema: EditFileTelegramIdSchema):
+    file_query = select(File).where(File.file_id == schema.file_id)
+    file = (await session.exec(file_query)).first()
+    if file:
+        file.telegram_file_id = schema.telegram_file_id
+        file.telegram_file_unique_id = schema.telegram_file_unique_id
+        await session.commit()
+        return {"message": f"Идентификатор Telegram файла {schema.file_id} обновлен."}
+    else:
+        raise ValueError(f"Файл с ID {schema.file_id} не найден")
+
 
+async def delete_unused_blobs(session: AsyncSession, blob_keys: set[str]):
+    """
+    Удаляет из хранилища содержимое, на которое больше не ссылается ни одна запись о файле.
+    Вызывается после фиксации удаления записей, проверка и удаление выполняются под блокировкой ключа.
+    Удаление записей к этому моменту уже выполнено, поэтому ошибка очистки только записывается в журнал:
+    оставшееся содержимое занимает место, но не влияет на результат запроса.
+    """
+    try:
+        # Ключи блокируются в одном порядке, чтобы параллельные удаления не ждали друг друга по кругу
+        for blob_key in sorted(blob_keys):
+            await lock_blob(session, blob_key)
+            if not (await session.exec(select(File.file_id).where(File.blob_key == blob_key))).first():
+                await blob_store.delete(blob_key)
+        # Завершение транзакции снимает блокировки
+        await session.commit()
+    except Exception:
+        logging.exception("Не удалось удалить неиспользуемое содержимое файлов %s", sorted(blob_keys))
+        await session.rollback()
 
-def get_labs_handler(session: Session, schema: GetLabsSchema) -> GetLabsResponseSchema:
-    user_query = select(Task).where(Task.user_id == schema.user_id)
-    labs = session.exec(user_query).all()
+
+lab_order_columns = {
+    "end_date": Task.end_date,
+    "start_date": Task.start_date,
+    "name": Task.name,
+    "task_id": Task.task_id
+}
+
+
+async def get_labs_handler(session: AsyncSession, schema: GetLabsSchema) -> GetLabsResponseSchema:
+    # Фильтрация, сортировка и ограничение выполняются в БД по индексу (user_id, end_date)
+    labs_query = select(Task).where(Task.user_id == schema.user_id)
+    if schema.status is not None:
+        if schema.status not in status_dict:
+            raise ValueError(f"Неизвестный статус {schema.status}")
+        labs_query = labs_query.where(Task.status == status_dict[schema.status])
+    if schema.discipline_id is not None:
+        labs_query = labs_query.where(Task.discipline_id == schema.discipline_id)
+    if schema.end_date_from is not None:
+        labs_query = labs_query.where(Task.end_date >= schema.end_date_from)
+    if schema.end_date_before is not None:
+        labs_query = labs_query.where(Task.end_date < schema.end_date_before)
+    if schema.overdue is not None:
+        overdue = and_(Task.end_date < date.today(), Task.status != Status.submitted)
+        labs_query = labs_query.where(overdue if schema.overdue else not_(overdue))
+
+    if schema.order_by not in lab_order_columns:
+        raise ValueError(f"Сортировка по полю {schema.order_by} не поддерживается")
+    order_columns = [lab_order_columns[schema.order_by]]
+    if schema.order_by != "task_id":
+        order_columns.append(Task.task_id)
+    labs, next_cursor = await fetch_page(session, labs_query, order_columns, schema.cursor, schema.limit,
+                                         schema.descending)
     labs_list = []
     for lab in labs:
         labs_list.append(GetLabResponseSchema(
@@ -70,30 +174,32 @@ def get_labs_handler(session: Session, schema: GetLabsSchema) -> GetLabsResponse
             status=lab.status.value
         ))
 
-    return GetLabsResponseSchema(labs=labs_list)
+    return GetLabsResponseSchema(labs=labs_list, next_cursor=next_cursor)
 
 
-def get_lab_files_handler(session: Session, schema: GetLabFilesSchema) -> GetLabFilesResponseSchema:
+async def get_lab_files_handler(session: AsyncSession, schema: GetLabFilesSchema) -> GetLabFilesResponseSchema:
     files_query = select(File).where(File.task_id == schema.task_id)
-    files = session.exec(files_query).all()
+    files = (await session.exec(files_query)).all()
     files_list = []
     for file in files:
         files_list.append(GetFileResponseSchema(
             file_id=file.file_id,
             task_id=file.task_id,
             file_name=file.file_name,
-            file_data=file.file_data,
-            file_type=file.file_type
+            file_size=file.file_size,
+            file_type=file.file_type,
+            telegram_file_id=file.telegram_file_id,
+            telegram_file_unique_id=file.telegram_file_unique_id
         ))
 
     return GetLabFilesResponseSchema(files=files_list)
 
 
-def edit_lab_attribute_handler(session: Session, schema: EditLabAttributeSchema):
+async def edit_lab_attribute_handler(session: AsyncSession, schema: EditLabAttributeSchema):
     # update_data = {schema.editing_attribute : schema.editing_value}
     # discipline_query = update(Discipline).where(Discipline.discipline_id == schema.discipline_id).values(**update_data)
     lab_query = select(Task).where(Task.task_id == schema.task_id)
-    lab = session.exec(lab_query).first()
+    lab = (await session.exec(lab_query)).first()
 
     print(schema.editing_attribute)
 
@@ -109,41 +215,44 @@ def edit_lab_attribute_handler(session: Session, schema: EditLabAttributeSchema)
     if lab:
         setattr(lab, schema.editing_attribute, editing_value)
         # session.add(discipline)
-        session.commit()
-        # session.refresh(discipline)
+        await session.commit()
+        # await session.refresh(discipline)
         return lab
     else:
         raise ValueError(f"Лабораторная работа с ID {schema.task_id} не найдена")
 
 
-def delete_lab_handler(session: Session, schema: DeleteFilesSchema):
+async def delete_lab_handler(session: AsyncSession, schema: DeleteFilesSchema):
     lab_query = select(Task).where(Task.task_id == schema.task_id)
-    lab = session.exec(lab_query).first()
+    lab = (await session.exec(lab_query)).first()
 
     if lab:
         try:
-            session.exec(delete(File).where(File.task_id == schema.task_id))
-            session.exec(delete(Task).where(Task.task_id == schema.task_id))
-            session.commit()
-            return {"message": f"Лабораторная работа удалена."}
-
+            blob_keys = set((await session.exec(select(File.blob_key).where(File.task_id == schema.task_id))).all())
+            await session.execute(delete(File).where(File.task_id == schema.task_id))
+            await session.execute(delete(Task).where(Task.task_id == schema.task_id))
+            await session.commit()
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             raise ValueError(f"Ошибка при удалении файлов: {str(e)}")
 
+        await delete_unused_blobs(session, blob_keys)
+        return {"message": f"Лабораторная работа удалена."}
+
 
-def delete_files_handler(session: Session, schema: DeleteFilesSchema):
+async def delete_files_handler(session: AsyncSession, schema: DeleteFilesSchema):
     files_query = select(File).where(File.task_id == schema.task_id)
-    files = session.exec(files_query).all()
+    files = (await session.exec(files_query)).all()
 
     if files:
         try:
-            session.exec(delete(File).where(File.task_id == schema.task_id))
-            session.commit()
-            return {"message": f"Удалено {len(files)} файлов для задачи {schema.task_id}"}
-
+            await session.execute(delete(File).where(File.task_id == schema.task_id))
+            await session.commit()
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             raise ValueError(f"Ошибка при удалении файлов: {str(e)}")
 
+        await delete_unused_blobs(session, {file.blob_key for file in files})
+        return {"message": f"Удалено {len(files)} файлов для задачи {schema.task_id}"}
+
 
@@ -1,14 +1,16 @@
 from datetime import datetime
 
-from sqlmodel import Session, select, delete, update
+from sqlmodel import select, delete, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 from api.src.schemas import AddLessonSchema, GetLessonsSchema, GetLessonsResponseSchema, GetLessonResponseSchema, \
     EditLessonAttributeSchema, DeleteLessonSchema
+from api.src.pagination import fetch_page
 from api.src.models import Lesson, User
 
 
-def add_lesson_handler(session: Session, schema: AddLessonSchema):
+async def add_lesson_handler(session: AsyncSession, schema: AddLessonSchema):
     user_query = select(User).where(User.user_id == schema.user_id)
-    user = session.exec(user_query).first()
+    user = (await session.exec(user_query)).first()
 
     new_item = Lesson(
         user_id=user.user_id,
@@ -20,14 +22,15 @@ def add_lesson_handler(session: Session, schema: AddLessonSchema):
         periodicity_days=schema.periodicity_days
     )
     session.add(new_item)
-    session.commit()
-    session.refresh(new_item)
+    await session.commit()
+    await session.refresh(new_item)
     return {"Занятие добавлено."}
 
 
-def get_lessons_handler(session: Session, schema: GetLessonsSchema) -> GetLessonsResponseSchema:
+async def get_lessons_handler(session: AsyncSession, schema: GetLessonsSchema) -> GetLessonsResponseSchema:
     user_query = select(Lesson).where(Lesson.user_id == schema.user_id)
-    lessons = session.exec(user_query).all()
+    lessons, next_cursor = await fetch_page(session, user_query, [Lesson.start_date, Lesson.lesson_id],
+                                            schema.cursor, schema.limit)
     lessons_list = []
     for lesson in lessons:
         lessons_list.append(GetLessonResponseSchema(
@@ -41,14 +44,14 @@ def get_lessons_handler(session: Session, schema: GetLessonsSchema) -> GetLesson
             periodicity_days=lesson.periodicity_days
         ))
 
-    return GetLessonsResponseSchema(lessons=lessons_list)
+    return GetLessonsResponseSchema(lessons=lessons_list, next_cursor=next_cursor)
 
 
-def edit_lesson_attribute_handler(session: Session, schema: EditLessonAttributeSchema):
+async def edit_lesson_attribute_handler(session: AsyncSession, schema: EditLessonAttributeSchema):
     # update_data = {schema.editing_attribute : schema.editing_value}
     # discipline_query = update(Discipline).where(Discipline.discipline_id == schema.discipline_id).values(**update_data)
     lesson_query = select(Lesson).where(Lesson.lesson_id == schema.lesson_id)
-    lesson = session.exec(lesson_query).first()
+    lesson = (await session.exec(lesson_query)).first()
 
     print(schema.editing_attribute)
 
@@ -61,25 +64,25 @@ def edit_lesson_attribute_handler(session: Session, schema: EditLessonAttributeS
     if lesson:
         setattr(lesson, schema.editing_attribute, editing_value)
         # session.add(discipline)
-        session.commit()
-        # session.refresh(discipline)
+        await session.commit()
+        # await session.refresh(discipline)
         return lesson
     else:
         raise ValueError(f"Лабораторная работа с ID {schema.task_id} не найдена")
 
 
-def delete_lesson_handler(session: Session, schema: DeleteLessonSchema):
+async def delete_lesson_handler(session: AsyncSession, schema: DeleteLessonSchema):
     lesson_query = select(Lesson).where(Lesson.lesson_id == schema.lesson_id)
-    lesson = session.exec(lesson_query).first()
+    lesson = (await session.exec(lesson_query)).first()
 
     if lesson:
         try:
-            session.exec(delete(Lesson).where(Lesson.lesson_id == schema.lesson_id))
-            session.commit()
+            await session.execute(delete(Lesson).where(Lesson.lesson_id == schema.lesson_id))
+            await session.commit()
             return {"message": f"Лабораторная работа удалена."}
 
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             raise ValueError(f"Ошибка при удалении файлов: {str(e)}")
 
 
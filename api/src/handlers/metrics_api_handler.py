@@ -0,0 +1,23 @@
+from api.src.schemas import PoolMetricsResponseSchema
+from api.src.database import async_engine
+from api.src.pool_metrics import pool_metrics
+
+
+async def get_pool_metrics_handler() -> PoolMetricsResponseSchema:
+    pool = async_engine.sync_engine.pool
+    if pool_metrics.checkouts:
+        wait_time_avg = pool_metrics.wait_time_total / pool_metrics.checkouts
+    else:
+        wait_time_avg = 0.0
+    return PoolMetricsResponseSchema(
+        pool_size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        checkouts=pool_metrics.checkouts,
+        wait_time_total=pool_metrics.wait_time_total,
+        wait_time_avg=wait_time_avg,
+        wait_time_max=pool_metrics.wait_time_max,
+        timeouts=pool_metrics.timeouts,
+        overflow_events=pool_metrics.overflow_events
+    )
@@ -0,0 +1,135 @@
+from datetime import datetime
+
+from sqlalchemy import not_, or_, exists
+from sqlmodel import select, delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+from api.src.schemas import UpdateScheduleSchema, GetSchedulePairsSchema, GetSchedulePairsResponseSchema, \
+    GetSchedulePairResponseSchema, GetScheduleLecturersSchema, GetScheduleLecturersResponseSchema, \
+    GetNewScheduleLecturersSchema, GetNewScheduleDisciplinesSchema, GetScheduleDisciplinesResponseSchema
+from api.src.pagination import fetch_page
+from api.src.models import SchedulePair, ScheduleLecturer, Teacher, User, Discipline
+
+# Недели расписания ПетрГУ: числитель и знаменатель
+SCHEDULE_WEEKS = ("numerator", "denominator")
+
+
+def parse_time(value):
+    if not value:
+        return None
+    return datetime.strptime(value[:5], "%H:%M").time()
+
+
+def parse_schedule_pairs(group: str, schedule: dict) -> list[SchedulePair]:
+    """
+    Разбирает ответ API расписания ПетрГУ в строки tblSchedulePair.
+    Поля, которых нет в ответе, остаются пустыми.
+    """
+    pairs = []
+    for week in SCHEDULE_WEEKS:
+        for day_lessons in schedule.get(week, []):
+            for lesson in day_lessons:
+                try:
+                    pair_date = datetime.strptime(lesson["date"], "%d.%m.%Y").date()
+                    pairs.append(SchedulePair(
+                        group=group,
+                        pair_date=pair_date,
+                        start_time=parse_time(lesson.get("start_time")),
+                        end_time=parse_time(lesson.get("end_time")),
+                        title=lesson["title"],
+                        lesson_type=lesson.get("type"),
+                        lecturer=lesson.get("lecturer"),
+                        classroom=lesson.get("classroom"),
+                    ))
+                except (KeyError, TypeError, ValueError):
+                    raise ValueError(f"Некорректная пара в расписании группы {group}: {lesson}")
+    return pairs
+
+
+async def update_schedule_handler(session: AsyncSession, schema: UpdateScheduleSchema):
+    """
+    Заменяет сохраненное расписание группы и список ее преподавателей новыми.
+    """
+    pairs = parse_schedule_pairs(schema.group, schema.schedule)
+    lecturers = {pair.lecturer for pair in pairs if pair.lecturer}
+    await session.execute(delete(SchedulePair).where(SchedulePair.group == schema.group))
+    await session.execute(delete(ScheduleLecturer).where(ScheduleLecturer.group == schema.group))
+    session.add_all(pairs)
+    session.add_all(ScheduleLecturer(group=schema.group, name=name) for name in lecturers)
+    await session.commit()
+    return {"Расписание обновлено."}
+
+
+async def get_schedule_pairs_handler(session: AsyncSession,
+                                     schema: GetSchedulePairsSchema) -> GetSchedulePairsResponseSchema:
+    pairs_query = select(SchedulePair).where(SchedulePair.group == schema.group)
+    if schema.date_from is not None:
+        pairs_query = pairs_query.where(SchedulePair.pair_date >= schema.date_from)
+    if schema.date_to is not None:
+        pairs_query = pairs_query.where(SchedulePair.pair_date <= schema.date_to)
+    if schema.exclude_type:
+        pairs_query = pairs_query.where(or_(SchedulePair.lesson_type.is_(None),
+                                            not_(SchedulePair.lesson_type.contains(schema.exclude_type))))
+    pairs_query = pairs_query.order_by(SchedulePair.pair_date, SchedulePair.start_time, SchedulePair.pair_id)
+    pairs = (await session.exec(pairs_query)).all()
+    return GetSchedulePairsResponseSchema(pairs=[
+        GetSchedulePairResponseSchema(
+            pair_date=pair.pair_date,
+            start_time=pair.start_time,
+            end_time=pair.end_time,
+            title=pair.title,
+            lesson_type=pair.lesson_type,
+            lecturer=pair.lecturer,
+            classroom=pair.classroom,
+        ) for pair in pairs
+    ])
+
+
+async def get_schedule_lecturers_handler(session: AsyncSession,
+                                         schema: GetScheduleLecturersSchema) -> GetScheduleLecturersResponseSchema:
+    if schema.title is None:
+        lecturers_query = select(ScheduleLecturer.name).where(ScheduleLecturer.group == schema.group) \
+            .order_by(ScheduleLecturer.name)
+    else:
+        lecturers_query = select(SchedulePair.lecturer).where(SchedulePair.group == schema.group,
+                                                              SchedulePair.title == schema.title,
+                                                              SchedulePair.lecturer.is_not(None)) \
+            .distinct().order_by(SchedulePair.lecturer)
+    lecturers = (await session.exec(lecturers_query)).all()
+    return GetScheduleLecturersResponseSchema(lecturers=list(lecturers))
+
+
+async def get_user_group(session: AsyncSession, user_id: int) -> str | None:
+    user = (await session.exec(select(User).where(User.user_id == user_id))).first()
+    if user is None:
+        raise ValueError(f"Пользователь с ID {user_id} не найден")
+    return user.group
+
+
+async def get_new_schedule_lecturers_handler(session: AsyncSession,
+                                             schema: GetNewScheduleLecturersSchema) -> GetScheduleLecturersResponseSchema:
+    """
+    Преподаватели из расписания группы пользователя, которых еще нет среди его преподавателей.
+    """
+    group = await get_user_group(session, schema.user_id)
+    if not group:
+        return GetScheduleLecturersResponseSchema(lecturers=[])
+    added = exists().where(Teacher.user_id == schema.user_id, Teacher.name == ScheduleLecturer.name)
+    lecturers_query = select(ScheduleLecturer).where(ScheduleLecturer.group == group, not_(added))
+    lecturers, next_cursor = await fetch_page(session, lecturers_query, [ScheduleLecturer.name],
+                                              schema.cursor, schema.limit)
+    return GetScheduleLecturersResponseSchema(lecturers=[lecturer.name for lecturer in lecturers],
+                                              next_cursor=next_cursor)
+
+
+async def get_new_schedule_disciplines_handler(session: AsyncSession, schema: GetNewScheduleDisciplinesSchema) \
+        -> GetScheduleDisciplinesResponseSchema:
+    """
+    Дисциплины из расписания группы пользователя, которых еще нет среди его дисциплин.
+    """
+    group = await get_user_group(session, schema.user_id)
+    if not group:
+        return GetScheduleDisciplinesResponseSchema(disciplines=[])
+    added = exists().where(Discipline.user_id == schema.user_id, Discipline.name == SchedulePair.title)
+    titles_query = select(SchedulePair.title).where(SchedulePair.group == group, not_(added)).distinct()
+    titles, next_cursor = await fetch_page(session, titles_query, [SchedulePair.title], schema.cursor, schema.limit)
+    return GetScheduleDisciplinesResponseSchema(disciplines=list(titles), next_cursor=next_cursor)
@@ -1,13 +1,15 @@
-from sqlmodel import Session, select, delete, update
+from sqlmodel import select, delete, update
+from sqlmodel.ext.asyncio.session import AsyncSession
 from api.src.schemas import AddTeacherSchema, GetTeachersSchema, GetTeachersResponseSchema, GetTeacherSchema, \
     GetTeacherResponseSchema, GetTeacherApiStatusSchema, GetTeacherApiStatusResponseSchema, EditTeacherAttributeSchema,\
     DeleteTeacherSchema, GetTeacherNameSchema, GetTeacherNameResponseSchema
-from api.src.models import Teacher, User
+from api.src.pagination import fetch_page
+from api.src.models import Teacher, User, SchedulePair
 
 
-def add_teacher_handler(session: Session, schema: AddTeacherSchema):
+async def add_teacher_handler(session: AsyncSession, schema: AddTeacherSchema):
     user_query = select(User).where(User.user_id == schema.user_id)
-    user = session.exec(user_query).first()
+    user = (await session.exec(user_query)).first()
     new_item = Teacher(
         user_id=user.user_id,
         name=schema.name,
@@ -18,14 +20,20 @@ def add_teacher_handler(session: Session, schema: AddTeacherSchema):
         is_from_API=schema.is_from_API
     )
     session.add(new_item)
-    session.commit()
-    session.refresh(new_item)
+    await session.commit()
+    await session.refresh(new_item)
     return {f"Преподаватель {schema} добавлен."}
 
 
-def get_teachers_handler(session: Session, schema: GetTeachersSchema) -> GetTeachersResponseSchema:
+async def get_teachers_handler(session: AsyncSession, schema: GetTeachersSchema) -> GetTeachersResponseSchema:
     user_query = select(Teacher).where(Teacher.user_id == schema.user_id)
-    teachers = session.exec(user_query).all()
+    if schema.schedule_title is not None:
+        user_group = select(User.group).where(User.user_id == schema.user_id).scalar_subquery()
+        schedule_lecturers = select(SchedulePair.lecturer).where(SchedulePair.group == user_group,
+                                                                 SchedulePair.title == schema.schedule_title)
+        user_query = user_query.where(Teacher.name.in_(schedule_lecturers))
+    teachers, next_cursor = await fetch_page(session, user_query, [Teacher.name, Teacher.teacher_id],
+                                             schema.cursor, schema.limit)
     teachers_list = []
     for teacher in teachers:
         teachers_list.append(GetTeacherResponseSchema(
@@ -39,12 +47,12 @@ def get_teachers_handler(session: Session, schema: GetTeachersSchema) -> GetTeac
             is_from_API=teacher.is_from_API
         ))
 
-    return GetTeachersResponseSchema(teachers=teachers_list)
+    return GetTeachersResponseSchema(teachers=teachers_list, next_cursor=next_cursor)
 
 
-def get_teacher_handler(session: Session, schema: GetTeacherSchema) -> GetTeacherResponseSchema:
+async def get_teacher_handler(session: AsyncSession, schema: GetTeacherSchema) -> GetTeacherResponseSchema:
     teacher_query = select(Teacher).where(Teacher.teacher_id == schema.teacher_id)
-    teacher = session.exec(teacher_query).first()
+    teacher = (await session.exec(teacher_query)).first()
     get_teacher = GetTeacherResponseSchema(
         user_id=teacher.user_id,
         teacher_id=teacher.teacher_id,
@@ -59,40 +67,40 @@ def get_teacher_handler(session: Session, schema: GetTeacherSchema) -> GetTeache
     return get_teacher
 
 
-def get_teacher_api_status_handler(session: Session, schema: GetTeacherApiStatusSchema) -> GetTeacherApiStatusResponseSchema:
+async def get_teacher_api_status_handler(session: AsyncSession, schema: GetTeacherApiStatusSchema) -> GetTeacherApiStatusResponseSchema:
     teacher_query = select(Teacher).where(Teacher.teacher_id == schema.teacher_id)
-    teacher = session.exec(teacher_query).first()
+    teacher = (await session.exec(teacher_query)).first()
     return GetTeacherApiStatusResponseSchema(is_from_API=teacher.is_from_API)
 
 
-def get_teacher_name_handler(session: Session, schema: GetTeacherNameSchema) -> GetTeacherNameResponseSchema:
+async def get_teacher_name_handler(session: AsyncSession, schema: GetTeacherNameSchema) -> GetTeacherNameResponseSchema:
     teacher_query = select(Teacher).where(Teacher.teacher_id == schema.teacher_id)
-    teacher = session.exec(teacher_query).first()
+    teacher = (await session.exec(teacher_query)).first()
     return GetTeacherNameResponseSchema(name=teacher.name)
 
 
-def edit_teacher_attribute_handler(session: Session, schema: EditTeacherAttributeSchema):
+async def edit_teacher_attribute_handler(session: AsyncSession, schema: EditTeacherAttributeSchema):
     # update_data = {schema.editing_attribute : schema.editing_value}
     # teacher_query = update(Teacher).where(Teacher.teacher_id == schema.teacher_id).values(**update_data)
     teacher_query = select(Teacher).where(Teacher.teacher_id == schema.teacher_id)
-    teacher = session.exec(teacher_query).first()
+    teacher = (await session.exec(teacher_query)).first()
 
     if teacher:
         setattr(teacher, schema.editing_attribute, schema.editing_value)
         # session.add(teacher)
-        session.commit()
-        # session.refresh(teacher)
+        await session.commit()
+        # await session.refresh(teacher)
         return teacher
     else:
         raise ValueError(f"Преподаватель с ID {schema.teacher_id} не найден")
 
 
-def delete_teacher_handler(session: Session, schema: DeleteTeacherSchema):
+async def delete_teacher_handler(session: AsyncSession, schema: DeleteTeacherSchema):
     teacher_query = select(Teacher).where(Teacher.teacher_id == schema.teacher_id)
-    teacher = session.exec(teacher_query).first()
+    teacher = (await session.exec(teacher_query)).first()
 
     if teacher:
-        session.exec(delete(Teacher).where(Teacher.teacher_id == schema.teacher_id))
-        session.commit()
+        await session.execute(delete(Teacher).where(Teacher.teacher_id == schema.teacher_id))
+        await session.commit()
     else:
         raise ValueError(f"Преподаватель с ID {schema.teacher_id} не найден")
@@ -1,8 +1,9 @@
 import uvicorn
 
 from fastapi import FastAPI
-from .database import SessionDep
-from .routers import auth_api_router, settings_api_router, teacher_api_router, discipline_api_router, lab_api_router, lesson_api_router
+from .database import SessionDep, async_engine
+from .routers import auth_api_router, settings_api_router, teacher_api_router, discipline_api_router, lab_api_router, lesson_api_router, \
+    dashboard_api_router, metrics_api_router, schedule_api_router
 
 
 def create_app() -> FastAPI:
@@ -11,6 +12,9 @@ def create_app() -> FastAPI:
     """
     app = FastAPI()
 
+    # Закрытие пула соединений с БД при остановке сервиса
+    app.add_event_handler("shutdown", async_engine.dispose)
+
     # Подключение маршрутов
     app.include_router(auth_api_router.router)
     app.include_router(settings_api_router.router)
@@ -18,6 +22,9 @@ def create_app() -> FastAPI:
     app.include_router(discipline_api_router.router)
     app.include_router(lab_api_router.router)
     app.include_router(lesson_api_router.router)
+    app.include_router(dashboard_api_router.router)
+    app.include_router(metrics_api_router.router)
+    app.include_router(schedule_api_router.router)
 
     # Пример базового маршрута
     @app.get("/")
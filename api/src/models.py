@@ -4,7 +4,7 @@
 import enum
 from typing import Optional
 
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, Index
 from sqlmodel import Field, SQLModel, Relationship
 from datetime import time, date
 
@@ -31,7 +31,7 @@ class FileType(enum.Enum):
 class User(SQLModel, table=True):
     __tablename__ = "tblUser"
     user_id: int = Field(default=None, primary_key=True, description="Уникальный идентификатор записи о пользователе")
-    telegram_id: str = Field(max_length=20, description="Идентификатор Telegram аккаунта пользователя")
+    telegram_id: str = Field(max_length=20, unique=True, index=True, description="Идентификатор Telegram аккаунта пользователя")
     is_petrsu_student: bool = Field(default=False, description="Флаг, является ли пользователь студентом ПетрГУ")
     group: Optional[str] = Field(default=None, max_length=100, description="Группа студента ПетрГУ")
 
@@ -43,8 +43,10 @@ class User(SQLModel, table=True):
 
 class Teacher(SQLModel, table=True):
     __tablename__ = "tblTeacher"
+    # Индекс по (user_id, name) обслуживает поиск преподавателей расписания, еще не добавленных пользователем
+    __table_args__ = (Index("ix_tblTeacher_user_id_name", "user_id", "name"),)
     teacher_id: int = Field(default=None, primary_key=True, description="Уникальный идентификатор записи о преподавателе")
-    user_id: int = Field(foreign_key="tblUser.user_id", description="Ссылка на идентификатор записи о пользователе")
+    user_id: int = Field(foreign_key="tblUser.user_id", index=True, description="Ссылка на идентификатор записи о пользователе")
     name: str = Field(max_length=100, description="ФИО преподавателя")
     phone_number: Optional[str] = Field(default=None, max_length=20, description="Номер телефона преподавателя")
     email: Optional[str] = Field(default=None, max_length=255, description="Электронный почтовый адрес преподавателя")
@@ -59,7 +61,7 @@ class Teacher(SQLModel, table=True):
 class Discipline (SQLModel, table=True):
     __tablename__ = "tblDiscipline"
     discipline_id: int = Field(default=None, primary_key=True, description="Уникальный идентификатор записи о дисциплине")
-    user_id: int = Field(foreign_key="tblUser.user_id", description="Ссылка на идентификатор записи о пользователе")
+    user_id: int = Field(foreign_key="tblUser.user_id", index=True, description="Ссылка на идентификатор записи о пользователе")
     teacher_id: Optional[int] = Field(foreign_key="tblTeacher.teacher_id", description="Ссылка на идентификатор записи о преподавателе")
     name: str = Field(max_length=100, description="Название дисциплины")
     is_from_API: bool = Field(default=False, description="Флаг, получена ли дисциплина из API ПетрГУ")
@@ -73,7 +75,7 @@ class Discipline (SQLModel, table=True):
 class Lesson(SQLModel, table=True):
     __tablename__ = "tblLesson"
     lesson_id: int = Field(default=None, primary_key=True, description="Уникальный идентификатор записи о паре")
-    user_id: int = Field(foreign_key="tblUser.user_id", description="Ссылка на идентификатор записи о пользователе")
+    user_id: int = Field(foreign_key="tblUser.user_id", index=True, description="Ссылка на идентификатор записи о пользователе")
     discipline_id: int = Field(foreign_key="tblDiscipline.discipline_id", description="Ссылка на идентификатор записи о дисциплине")
     classroom: str = Field(max_length=100, description="Аудитория, в которой проходит пара")
     start_time: time = Field(description="Время начала пары")
@@ -87,6 +89,8 @@ class Lesson(SQLModel, table=True):
 
 class Task(SQLModel, table=True):
     __tablename__ = "tblTask"
+    # Индекс по (user_id, end_date) обслуживает и выборку всех работ пользователя, и запросы по срокам сдачи
+    __table_args__ = (Index("ix_tblTask_user_id_end_date", "user_id", "end_date"),)
     task_id: int = Field(default=None, primary_key=True, description="Уникальный идентификатор записи о лабораторной работе")
     user_id: int = Field(foreign_key="tblUser.user_id", description="Ссылка на идентификатор записи о пользователе")
     discipline_id: int = Field(foreign_key="tblDiscipline.discipline_id", description="Ссылка на идентификатор записи о дисциплине")
@@ -106,9 +110,34 @@ class Task(SQLModel, table=True):
 class File(SQLModel, table=True):
     __tablename__ = "tblFile"
     file_id: int = Field(default=None, primary_key=True, description="Уникальный идентификатор записи о файле")
-    task_id: int = Field(foreign_key="tblTask.task_id", description="Ссылка на идентификатор записи о лабораторной работе")
+    task_id: int = Field(foreign_key="tblTask.task_id", index=True, description="Ссылка на идентификатор записи о лабораторной работе")
     file_name: str = Field(max_length=255, description="Имя файла")
-    file_data: bytes = Field(description="Содержимое файла любого формата в байтах")
+    blob_key: str = Field(max_length=64, index=True, description="Ключ содержимого файла в хранилище")
+    file_size: int = Field(default=0, description="Размер файла в байтах")
     file_type: FileType = Field(default=FileType.document, description="Тип файла Telegram")
+    telegram_file_id: Optional[str] = Field(default=None, max_length=255, description="Идентификатор файла в Telegram для повторной отправки")
+    telegram_file_unique_id: Optional[str] = Field(default=None, max_length=64, description="Постоянный уникальный идентификатор файла в Telegram")
 
     task: Task = Relationship(back_populates="files")
+
+
+class SchedulePair(SQLModel, table=True):
+    __tablename__ = "tblSchedulePair"
+    # Пары выбираются по группе и диапазону дат
+    __table_args__ = (Index("ix_tblSchedulePair_group_pair_date", "group", "pair_date"),)
+    pair_id: int = Field(default=None, primary_key=True, description="Уникальный идентификатор записи о паре из расписания")
+    group: str = Field(max_length=100, description="Группа студентов ПетрГУ")
+    pair_date: date = Field(description="Дата проведения пары")
+    start_time: Optional[time] = Field(default=None, description="Время начала пары")
+    end_time: Optional[time] = Field(default=None, description="Время окончания пары")
+    title: str = Field(max_length=255, description="Название дисциплины")
+    lesson_type: Optional[str] = Field(default=None, max_length=100, description="Вид занятия")
+    lecturer: Optional[str] = Field(default=None, max_length=255, description="ФИО преподавателя")
+    classroom: Optional[str] = Field(default=None, max_length=100, description="Аудитория")
+
+
+class ScheduleLecturer(SQLModel, table=True):
+    __tablename__ = "tblScheduleLecturer"
+    # Различные преподаватели из расписания группы, обновляются вместе с ее парами
+    group: str = Field(max_length=100, primary_key=True, description="Группа студентов ПетрГУ")
+    name: str = Field(max_length=255, primary_key=True, description="ФИО преподавателя")
@@ -0,0 +1,58 @@
+"""
+Этот файл содержит постраничную выборку списков по ключу (keyset): следующая страница
+начинается сразу после последней строки предыдущей, поэтому стоимость запроса не зависит от номера страницы
+"""
+
+import base64
+import json
+from datetime import date
+
+from sqlalchemy import tuple_, Row
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def encode_cursor(values: list) -> str:
+    payload = json.dumps([value.isoformat() if isinstance(value, date) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, columns: list) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("Некорректный курсор страницы")
+        return [date.fromisoformat(value) if column.type.python_type is date else value
+                for value, column in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise ValueError("Некорректный курсор страницы")
+
+
+async def fetch_page(session: AsyncSession, query, columns: list, cursor: str | None, limit: int | None,
+                     descending: bool = False):
+    """
+    Сортирует запрос по columns (последний столбец - первичный ключ для однозначного порядка)
+    и возвращает строки страницы и курсор следующей страницы или None, если страница последняя.
+    Без limit возвращаются все строки после курсора.
+    Запрос одного столбца (например, различных названий) возвращает значения этого столбца.
+    """
+    if descending:
+        query = query.order_by(*(column.desc() for column in columns))
+    else:
+        query = query.order_by(*columns)
+    if cursor is not None:
+        key = tuple_(*columns)
+        values = tuple(decode_cursor(cursor, columns))
+        query = query.where(key < values if descending else key > values)
+    if limit is None:
+        return (await session.exec(query)).all(), None
+
+    # Лишняя строка показывает, есть ли следующая страница
+    rows = (await session.exec(query.limit(limit + 1))).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last_row = rows[-1]
+    if not isinstance(last_row, (SQLModel, Row)):
+        return rows, encode_cursor([last_row])
+    return rows, encode_cursor([getattr(last_row, column.key) for column in columns])
@@ -0,0 +1,57 @@
+"""
+Этот файл содержит сбор метрик пула соединений с БД
+"""
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """
+    Накопленные с момента запуска сервиса показатели пула соединений.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+        self.overflow_events = 0
+
+    def record_wait(self, wait_time: float):
+        self.checkouts += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, замеряющий время ожидания свободного соединения.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        pool_metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def register_pool_events(pool: InstrumentedPool):
+    """
+    Подписывается на создание соединений, чтобы считать выходы за пределы pool_size.
+    """
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        if pool.overflow() > 0:
+            pool_metrics.overflow_events += 1
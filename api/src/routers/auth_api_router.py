@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
-from api.src.schemas import CheckUserExistSchema, AddUserSchema, CheckPetrsuStudentSchema, GetUserIdSchema, GetUserGroupSchema
+from api.src.schemas import CheckUserExistSchema, AddUserSchema, CheckPetrsuStudentSchema, GetUserIdSchema, GetUserGroupSchema, \
+    GetUserIdentitySchema
 from api.src.handlers.auth_api_handler import check_user_handler, add_user_handler, check_is_petrsu_student_handler,\
-    get_user_id_by_tg_handler, get_user_group_by_tg_handler
+    get_user_id_by_tg_handler, get_user_group_by_tg_handler, get_user_identity_handler, \
+    get_student_groups_handler
 
 from api.src.database import SessionDep
 
@@ -11,23 +13,33 @@ router = APIRouter()
 
 @router.get("/get_user_id", tags=["user"])
 async def get_user_id_by_tg_router(schema: GetUserIdSchema, session: SessionDep):
-    return get_user_id_by_tg_handler(session, schema)
+    return await get_user_id_by_tg_handler(session, schema)
+
+
+@router.get("/get_user_identity", tags=["user"])
+async def get_user_identity_router(schema: GetUserIdentitySchema, session: SessionDep):
+    return await get_user_identity_handler(session, schema)
+
+
+@router.get("/get_student_groups", tags=["user"])
+async def get_student_groups_router(session: SessionDep):
+    return await get_student_groups_handler(session)
 
 
 @router.get("/get_user_group", tags=["user"])
 async def get_user_group_by_tg_router(schema: GetUserGroupSchema, session: SessionDep):
-    return get_user_group_by_tg_handler(session, schema)
+    return await get_user_group_by_tg_handler(session, schema)
 
 @router.get("/check_user", tags=["user"])
 async def check_user_router(schema: CheckUserExistSchema, session: SessionDep):
-    return check_user_handler(session, schema)
+    return await check_user_handler(session, schema)
 
 
 @router.get("/check_is_petrsu_student", tags=["user"])
 async def check_user_router(schema: CheckPetrsuStudentSchema, session: SessionDep):
-    return check_is_petrsu_student_handler(session, schema)
+    return await check_is_petrsu_student_handler(session, schema)
 
 
 @router.post("/add_user", tags=["user"])
 async def check_user_router(schema: AddUserSchema, session: SessionDep):
-    return add_user_handler(session, schema)
\ No newline at end of file
+    return await add_user_handler(session, schema)
\ No newline at end of file
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+
+from api.src.schemas import GetDashboardSchema
+from api.src.handlers.dashboard_api_handler import get_dashboard_handler
+
+from api.src.database import SessionDep
+
+router = APIRouter()
+
+
+@router.get("/get_dashboard", tags=["user"])
+async def get_dashboard_router(schema: GetDashboardSchema, session: SessionDep):
+    return await get_dashboard_handler(session, schema)
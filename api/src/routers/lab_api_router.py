@@ -1,9 +1,12 @@
-from fastapi import APIRouter
+from typing import Annotated
 
-from api.src.schemas import AddLabSchema, AddFileSchema, GetLabsSchema, GetLabFilesSchema, EditLabAttributeSchema, \
-    DeleteFilesSchema, DeleteLabSchema
-from api.src.handlers.lab_api_handler import add_lab_handler, add_file_handler, get_labs_handler, get_lab_files_handler,\
-    edit_lab_attribute_handler, delete_files_handler, delete_lab_handler
+from fastapi import APIRouter, Query, Request
+
+from api.src.schemas import AddLabSchema, UploadFileSchema, GetFileDataSchema, GetLabsSchema, GetLabFilesSchema, \
+    EditLabAttributeSchema, DeleteFilesSchema, DeleteLabSchema, EditFileTelegramIdSchema
+from api.src.handlers.lab_api_handler import add_lab_handler, upload_file_handler, get_file_data_handler, \
+    get_labs_handler, get_lab_files_handler, edit_lab_attribute_handler, delete_files_handler, delete_lab_handler, \
+    edit_file_telegram_id_handler
 
 from api.src.database import SessionDep
 
@@ -12,34 +15,45 @@ router = APIRouter()
 
 @router.post("/add_lab", tags=["tasks"])
 async def add_discipline_router(schema: AddLabSchema, session: SessionDep):
-    return add_lab_handler(session, schema)
+    return await add_lab_handler(session, schema)
+
+
+@router.post("/upload_file", tags=["tasks"])
+async def upload_file_router(schema: Annotated[UploadFileSchema, Query()], request: Request, session: SessionDep):
+    # Метаданные передаются в параметрах запроса, содержимое файла - телом запроса без кодирования
+    return await upload_file_handler(session, schema, request.stream())
 
 
-@router.post("/add_file", tags=["tasks"])
-async def add_file_router(schema: AddFileSchema, session: SessionDep):
-    return add_file_handler(session, schema)
+@router.get("/get_file_data", tags=["tasks"])
+async def get_file_data_router(schema: GetFileDataSchema, session: SessionDep):
+    return await get_file_data_handler(session, schema)
 
 
 @router.delete("/delete_files", tags=["tasks"])
 async def delete_files_router(schema: DeleteFilesSchema, session: SessionDep):
-    return delete_files_handler(session, schema)
+    return await delete_files_handler(session, schema)
+
+
+@router.post("/edit_file_telegram_id", tags=["tasks"])
+async def edit_file_telegram_id_router(schema: EditFileTelegramIdSchema, session: SessionDep):
+    return await edit_file_telegram_id_handler(session, schema)
 
 
 @router.get("/get_labs", tags=["tasks"])
 async def get_labs_router(schema: GetLabsSchema, session: SessionDep):
-    return get_labs_handler(session, schema)
+    return await get_labs_handler(session, schema)
 
 
 @router.get("/get_lab_files", tags=["tasks"])
 async def get_lab_files_router(schema: GetLabFilesSchema, session: SessionDep):
-    return get_lab_files_handler(session, schema)
+    return await get_lab_files_handler(session, schema)
 
 
 @router.post("/edit_lab", tags=["tasks"])
 async def edit_lab_attribute_router(schema: EditLabAttributeSchema, session: SessionDep):
-    return edit_lab_attribute_handler(session, schema)
+    return await edit_lab_attribute_handler(session, schema)
 
 
 @router.delete("/delete_lab", tags=["tasks"])
 async def delete_lab_router(schema: DeleteLabSchema, session: SessionDep):
-    return delete_lab_handler(session, schema)
\ No newline at end of file
+    return await delete_lab_handler(session, schema)
\ No newline at end of file
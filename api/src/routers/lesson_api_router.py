@@ -12,19 +12,19 @@ router = APIRouter()
 
 @router.post("/add_lesson", tags=["lessons"])
 async def add_discipline_router(schema: AddLessonSchema, session: SessionDep):
-    return add_lesson_handler(session, schema)
+    return await add_lesson_handler(session, schema)
 
 
 @router.get("/get_lessons", tags=["lessons"])
 async def get_lessons_router(schema: GetLessonsSchema, session: SessionDep):
-    return get_lessons_handler(session, schema)
+    return await get_lessons_handler(session, schema)
 
 
 @router.post("/edit_lesson", tags=["lessons"])
 async def edit_lesson_attribute_router(schema: EditLessonAttributeSchema, session: SessionDep):
-    return edit_lesson_attribute_handler(session, schema)
+    return await edit_lesson_attribute_handler(session, schema)
 
 
 @router.delete("/delete_lesson", tags=["lessons"])
 async def delete_lesson_router(schema: DeleteLessonSchema, session: SessionDep):
-    return delete_lesson_handler(session, schema)
\ No newline at end of file
+    return await delete_lesson_handler(session, schema)
\ No newline at end of file
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from api.src.schemas import PoolMetricsResponseSchema
+from api.src.handlers.metrics_api_handler import get_pool_metrics_handler
+
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["metrics"])
+async def get_pool_metrics_router() -> PoolMetricsResponseSchema:
+    return await get_pool_metrics_handler()
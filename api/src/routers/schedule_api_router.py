@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+
+from api.src.schemas import UpdateScheduleSchema, GetSchedulePairsSchema, GetScheduleLecturersSchema, \
+    GetNewScheduleLecturersSchema, GetNewScheduleDisciplinesSchema
+from api.src.handlers.schedule_api_handler import update_schedule_handler, get_schedule_pairs_handler, \
+    get_schedule_lecturers_handler, get_new_schedule_lecturers_handler, \
+    get_new_schedule_disciplines_handler
+
+from api.src.database import SessionDep
+
+router = APIRouter()
+
+
+@router.post("/update_schedule", tags=["schedule"])
+async def update_schedule_router(schema: UpdateScheduleSchema, session: SessionDep):
+    return await update_schedule_handler(session, schema)
+
+
+@router.get("/get_schedule_pairs", tags=["schedule"])
+async def get_schedule_pairs_router(schema: GetSchedulePairsSchema, session: SessionDep):
+    return await get_schedule_pairs_handler(session, schema)
+
+
+@router.get("/get_schedule_lecturers", tags=["schedule"])
+async def get_schedule_lecturers_router(schema: GetScheduleLecturersSchema, session: SessionDep):
+    return await get_schedule_lecturers_handler(session, schema)
+
+
+@router.get("/get_new_schedule_lecturers", tags=["schedule"])
+async def get_new_schedule_lecturers_router(schema: GetNewScheduleLecturersSchema, session: SessionDep):
+    return await get_new_schedule_lecturers_handler(session, schema)
+
+
+@router.get("/get_new_schedule_disciplines", tags=["schedule"])
+async def get_new_schedule_disciplines_router(schema: GetNewScheduleDisciplinesSchema, session: SessionDep):
+    return await get_new_schedule_disciplines_handler(session, schema)
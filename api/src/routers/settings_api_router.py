@@ -10,9 +10,9 @@ router = APIRouter()
 
 @router.post("/change_user_group", tags=["settings"])
 async def change_user_group_router(schema: ChangeUserGroupSchema, session: SessionDep):
-    return change_user_group_handler(session, schema)
+    return await change_user_group_handler(session, schema)
 
 
 @router.post("/change_user_status", tags=["settings"])
 async def change_user_status_router(schema: ChangeUserStatusSchema, session: SessionDep):
-    return change_user_status_handler(session, schema)
\ No newline at end of file
+    return await change_user_status_handler(session, schema)
\ No newline at end of file
@@ -12,35 +12,35 @@ router = APIRouter()
 
 @router.post("/add_teacher", tags=["teachers"])
 async def add_teacher_router(schema: AddTeacherSchema, session: SessionDep):
-    return add_teacher_handler(session, schema)
+    return await add_teacher_handler(session, schema)
 
 
 @router.get("/get_teachers", tags=["teachers"])
 async def get_teachers_router(schema: GetTeachersSchema, session: SessionDep):
-    return get_teachers_handler(session, schema)
+    return await get_teachers_handler(session, schema)
 
 
 @router.get("/get_teacher", tags=["teachers"])
 async def get_teacher_router(schema: GetTeacherSchema, session: SessionDep):
-    return get_teacher_handler(session, schema)
+    return await get_teacher_handler(session, schema)
 
 
 @router.get("/get_teacher_api_status", tags=["teachers"])
 async def get_teacher_api_status_router(schema: GetTeacherApiStatusSchema, session: SessionDep):
-    return get_teacher_api_status_handler(session, schema)
+    return await get_teacher_api_status_handler(session, schema)
 
 
 @router.get("/get_teacher_name", tags=["teachers"])
 async def get_teacher_name_router(schema: GetTeacherNameSchema, session: SessionDep):
-    return get_teacher_name_handler(session, schema)
+    return await get_teacher_name_handler(session, schema)
 
 
 @router.post("/edit_teacher", tags=["teachers"])
 async def edit_teacher_attribute_router(schema: EditTeacherAttributeSchema, session: SessionDep):
-    return edit_teacher_attribute_handler(session, schema)
+    return await edit_teacher_attribute_handler(session, schema)
 
 
 @router.delete("/delete_teacher", tags=["teachers"])
 async def delete_teacher_router(schema: DeleteTeacherSchema, session: SessionDep):
-    return delete_teacher_handler(session, schema)
+    return await delete_teacher_handler(session, schema)
 
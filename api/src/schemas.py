@@ -6,7 +6,7 @@ from datetime import datetime, date, time
 
 from pydantic import BaseModel, field_validator
 from sqlalchemy.dialects.postgresql import Any
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, Field
 from api.src.models import Status
 
 
@@ -18,6 +18,20 @@ class GetUserIdResponseSchema(SQLModel):
     user_id: int
 
 
+class GetUserIdentitySchema(SQLModel):
+    telegram_id: str
+
+
+class GetUserIdentityResponseSchema(SQLModel):
+    user_id: int
+    is_petrsu_student: bool
+    group: str | None = None
+
+
+class GetStudentGroupsResponseSchema(SQLModel):
+    groups: list[str]
+
+
 class GetUserGroupSchema(SQLModel):
     telegram_id: str
 
@@ -87,10 +101,16 @@ class GetTeacherResponseSchema(SQLModel):
 
 class GetTeachersSchema(SQLModel):
     user_id: int
+    # Только преподаватели, которые ведут эту дисциплину по расписанию группы пользователя
+    schedule_title: str | None = None
+    # Постраничная выборка: курсор next_cursor из предыдущего ответа и размер страницы
+    cursor: str | None = None
+    limit: int | None = Field(default=None, ge=1)
 
 
 class GetTeachersResponseSchema(SQLModel):
     teachers: list[GetTeacherResponseSchema]
+    next_cursor: str | None = None
 
 
 class GetTeacherApiStatusSchema(SQLModel):
@@ -140,10 +160,15 @@ class GetDisciplineResponseSchema(SQLModel):
 
 class GetDisciplinesSchema(SQLModel):
     user_id: int
+    discipline_ids: list[int] | None = None  # Только дисциплины с указанными ID, например для подписей списка
+    # Постраничная выборка: курсор next_cursor из предыдущего ответа и размер страницы
+    cursor: str | None = None
+    limit: int | None = Field(default=None, ge=1)
 
 
 class GetDisciplinesResponseSchema(SQLModel):
     disciplines: list[GetDisciplineResponseSchema]
+    next_cursor: str | None = None
 
 
 class GetDisciplineApiStatusSchema(SQLModel):
@@ -176,15 +201,27 @@ class AddLabSchema(SQLModel):
     status: str
 
 
-class AddFileSchema(SQLModel):
+class UploadFileSchema(SQLModel):
     task_id: int
     file_name: str
-    file_data: bytes
     file_type: str
+    telegram_file_id: str | None = None
+    telegram_file_unique_id: str | None = None
 
 
 class GetLabsSchema(SQLModel):
     user_id: int
+    # Необязательные фильтры выполняются в запросе к БД
+    status: str | None = None  # Ключ статуса: not_started, in_progress, done, submitted
+    discipline_id: int | None = None
+    end_date_from: date | None = None  # Срок сдачи не раньше указанной даты
+    end_date_before: date | None = None  # Срок сдачи раньше указанной даты
+    overdue: bool | None = None  # Срок сдачи прошел, а задание не сдано
+    order_by: str = "end_date"  # end_date, start_date, name или task_id
+    descending: bool = False
+    # Постраничная выборка: курсор next_cursor из предыдущего ответа и размер страницы
+    cursor: str | None = None
+    limit: int | None = Field(default=None, ge=1)
 
 
 class GetLabResponseSchema(SQLModel):
@@ -202,6 +239,7 @@ class GetLabResponseSchema(SQLModel):
 
 class GetLabsResponseSchema(SQLModel):
     labs: list[GetLabResponseSchema]
+    next_cursor: str | None = None
 
 
 class GetLabFilesSchema(SQLModel):
@@ -212,8 +250,20 @@ class GetFileResponseSchema(SQLModel):
     file_id: int
     task_id: int
     file_name: str
-    file_data: bytes
+    file_size: int
     file_type: str
+    telegram_file_id: str | None = None
+    telegram_file_unique_id: str | None = None
+
+
+class GetFileDataSchema(SQLModel):
+    file_id: int
+
+
+class EditFileTelegramIdSchema(SQLModel):
+    file_id: int
+    telegram_file_id: str
+    telegram_file_unique_id: str
 
 
 class GetLabFilesResponseSchema(SQLModel):
@@ -246,6 +296,9 @@ class AddLessonSchema(SQLModel):
 
 class GetLessonsSchema(SQLModel):
     user_id: int
+    # Постраничная выборка: курсор next_cursor из предыдущего ответа и размер страницы
+    cursor: str | None = None
+    limit: int | None = Field(default=None, ge=1)
 
 
 class GetLessonResponseSchema(SQLModel):
@@ -261,6 +314,7 @@ class GetLessonResponseSchema(SQLModel):
 
 class GetLessonsResponseSchema(SQLModel):
     lessons: list[GetLessonResponseSchema]
+    next_cursor: str | None = None
 
 
 class GetLessonFilesSchema(SQLModel):
@@ -275,3 +329,84 @@ class EditLessonAttributeSchema(SQLModel):
 
 class DeleteLessonSchema(SQLModel):
     lesson_id: int
+
+
+class GetDashboardSchema(SQLModel):
+    telegram_id: str
+
+
+class GetDashboardResponseSchema(SQLModel):
+    user_id: int
+    labs: list[GetLabResponseSchema]
+    disciplines: list[GetDisciplineResponseSchema]
+    lessons: list[GetLessonResponseSchema]
+    teachers: list[GetTeacherResponseSchema]
+
+
+class PoolMetricsResponseSchema(SQLModel):
+    pool_size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    wait_time_total: float
+    wait_time_avg: float
+    wait_time_max: float
+    timeouts: int
+    overflow_events: int
+
+
+class UpdateScheduleSchema(SQLModel):
+    group: str
+    # Ответ API расписания ПетрГУ: списки пар по дням для недель numerator и denominator
+    schedule: dict
+
+
+class GetSchedulePairsSchema(SQLModel):
+    group: str
+    date_from: date | None = None  # Пары не раньше указанной даты
+    date_to: date | None = None  # Пары не позже указанной даты
+    exclude_type: str | None = None  # Пропустить пары, вид которых содержит строку, например "Лекция"
+
+
+class GetSchedulePairResponseSchema(SQLModel):
+    pair_date: date
+    start_time: time | None = None
+    end_time: time | None = None
+    title: str
+    lesson_type: str | None = None
+    lecturer: str | None = None
+    classroom: str | None = None
+
+
+class GetSchedulePairsResponseSchema(SQLModel):
+    pairs: list[GetSchedulePairResponseSchema]
+
+
+class GetScheduleLecturersSchema(SQLModel):
+    group: str
+    title: str | None = None  # Только преподаватели указанной дисциплины
+
+
+class GetScheduleLecturersResponseSchema(SQLModel):
+    lecturers: list[str]
+    next_cursor: str | None = None
+
+
+class GetNewScheduleLecturersSchema(SQLModel):
+    user_id: int
+    # Постраничная выборка: курсор next_cursor из предыдущего ответа и размер страницы
+    cursor: str | None = None
+    limit: int | None = Field(default=None, ge=1)
+
+
+class GetNewScheduleDisciplinesSchema(SQLModel):
+    user_id: int
+    # Постраничная выборка: курсор next_cursor из предыдущего ответа и размер страницы
+    cursor: str | None = None
+    limit: int | None = Field(default=None, ge=1)
+
+
+class GetScheduleDisciplinesResponseSchema(SQLModel):
+    disciplines: list[str]
+    next_cursor: str | None = None
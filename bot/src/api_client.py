@@ -0,0 +1,90 @@
+"""
+Асинхронный HTTP-клиент для обращения бота к API и внешним сервисам
+"""
+import asyncio
+import json
+from typing import BinaryIO
+
+import aiohttp
+
+from .settings import settings
+
+
+class ApiResponse:
+    """
+    Прочитанный ответ сервера. Повторяет используемую в обработчиках часть интерфейса requests.Response.
+    """
+
+    def __init__(self, status_code: int, text: str):
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class ApiClient:
+    """
+    Общий для всего процесса клиент с пулом keep-alive соединений и ограничением числа одновременных запросов.
+    """
+
+    def __init__(self, timeout: float, connect_timeout: float, pool_size: int, pool_size_per_host: int,
+                 keepalive_timeout: float, max_concurrency: int):
+        self._timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self._pool_size = pool_size
+        self._pool_size_per_host = pool_size_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_size,
+                limit_per_host=self._pool_size_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+        return self._session
+
+    async def request(self, method: str, url: str, **kwargs) -> ApiResponse:
+        async with self._semaphore:
+            async with self._get_session().request(method, url, **kwargs) as response:
+                text = await response.text()
+                return ApiResponse(response.status, text)
+
+    async def get(self, url: str, **kwargs) -> ApiResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> ApiResponse:
+        return await self.request("POST", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> ApiResponse:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def download(self, url: str, destination: BinaryIO, chunk_size: int = 64 * 1024, **kwargs) -> ApiResponse:
+        """
+        Записывает тело успешного ответа в destination по частям, не загружая его в память целиком.
+        """
+        async with self._semaphore:
+            async with self._get_session().get(url, **kwargs) as response:
+                if response.status != 200:
+                    return ApiResponse(response.status, await response.text())
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    destination.write(chunk)
+                return ApiResponse(response.status, "")
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+api_client = ApiClient(
+    timeout=settings.API_TIMEOUT,
+    connect_timeout=settings.API_CONNECT_TIMEOUT,
+    pool_size=settings.API_POOL_SIZE,
+    pool_size_per_host=settings.API_POOL_SIZE_PER_HOST,
+    keepalive_timeout=settings.API_KEEPALIVE_TIMEOUT,
+    max_concurrency=settings.API_MAX_CONCURRENCY,
+)
@@ -0,0 +1,171 @@
+"""
+Кэш построенных диаграмм. Ключ - хэш входных данных диаграммы и текущей даты,
+поэтому повторный просмотр без изменений в заданиях не требует новой отрисовки.
+Кроме содержимого (PNG или PDF) запоминаются идентификаторы файлов Telegram, чтобы повторно отправлять диаграмму без загрузки
+"""
+import asyncio
+import hashlib
+import json
+import os
+import struct
+from collections import OrderedDict
+from datetime import date
+
+from .settings import settings
+
+
+class ChartCache:
+    def __init__(self, max_bytes: int, max_file_ids: int, root: str | None = None, disk_max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        self.max_file_ids = max_file_ids
+        self.root = root
+        self.disk_max_bytes = disk_max_bytes
+        self._charts: OrderedDict[str, list[bytes]] = OrderedDict()
+        self._size = 0
+        self._file_ids: OrderedDict[tuple[str, str], list[str]] = OrderedDict()
+        # Объем файлов кэша на диске, вычисляется при первой записи и затем обновляется без обхода каталога
+        self._disk_size: int | None = None
+        self._trimming = False
+
+    @staticmethod
+    def make_key(kind: str, *args) -> str:
+        """
+        Текущая дата входит в ключ, так как от нее зависит отметка сегодняшнего дня на диаграмме.
+        """
+        payload = json.dumps([kind, date.today().isoformat(), args],
+                             sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    async def get(self, key: str) -> list[bytes] | None:
+        pages = self._charts.get(key)
+        if pages is not None:
+            self._charts.move_to_end(key)
+            return pages
+        if self.root:
+            try:
+                content = await asyncio.to_thread(self._read, key)
+            except FileNotFoundError:
+                return None
+            pages = self._unpack(content)
+            self._remember(key, pages)
+        return pages
+
+    async def put(self, key: str, pages: list[bytes]):
+        self._remember(key, pages)
+        if not self.root:
+            return
+        # Работа с диском выполняется в потоке, чтобы не останавливать цикл событий бота
+        if self._disk_size is None:
+            self._disk_size = sum(size for _, size, _ in await asyncio.to_thread(self._disk_entries))
+        self._disk_size += await asyncio.to_thread(self._write, key, self._pack(pages))
+        if self._disk_size > self.disk_max_bytes and not self._trimming:
+            self._trimming = True
+            try:
+                # Очистка с запасом в десятую часть объема, чтобы каталог не обходился при каждой следующей записи
+                excess = self._disk_size - self.disk_max_bytes * 9 // 10
+                self._disk_size -= await asyncio.to_thread(self._trim_disk, excess)
+            finally:
+                self._trimming = False
+
+    def _read(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as file:
+            return file.read()
+
+    def _write(self, key: str, content: bytes) -> int:
+        """
+        Записывает файл диаграммы и возвращает изменение объема кэша на диске.
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        with open(path + ".tmp", "wb") as file:
+            file.write(content)
+        os.replace(path + ".tmp", path)
+        return len(content) - replaced
+
+    @staticmethod
+    def _pack(pages: list[bytes]) -> bytes:
+        # Страницы хранятся в одном файле, чтобы очистка диска не оставляла диаграмму без части страниц
+        return b"".join(struct.pack(">I", len(page)) + page for page in pages)
+
+    @staticmethod
+    def _unpack(content: bytes) -> list[bytes]:
+        pages = []
+        offset = 0
+        while offset < len(content):
+            (length,) = struct.unpack_from(">I", content, offset)
+            offset += 4
+            pages.append(content[offset:offset + length])
+            offset += length
+        return pages
+
+    def _remember(self, key: str, pages: list[bytes]):
+        size = sum(len(page) for page in pages)
+        if size > self.max_bytes:
+            return
+        if key in self._charts:
+            self._size -= sum(len(page) for page in self._charts.pop(key))
+        self._charts[key] = pages
+        self._size += size
+        while self._size > self.max_bytes:
+            _, evicted = self._charts.popitem(last=False)
+            self._size -= sum(len(page) for page in evicted)
+
+    def _disk_entries(self) -> list[tuple[float, int, str]]:
+        """
+        Время изменения, размер и путь каждого файла в каталоге кэша.
+        """
+        entries = []
+        if not os.path.isdir(self.root):
+            return entries
+        for directory in os.scandir(self.root):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _trim_disk(self, excess: int) -> int:
+        """
+        Удаляет давно созданные файлы общим объемом не меньше excess и возвращает объем удаленных файлов.
+        """
+        removed = 0
+        for _, size, path in sorted(self._disk_entries()):
+            if removed >= excess:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += size
+        return removed
+
+    def get_file_ids(self, key: str, file_type: str) -> list[str] | None:
+        file_ids = self._file_ids.get((key, file_type))
+        if file_ids is not None:
+            self._file_ids.move_to_end((key, file_type))
+        return file_ids
+
+    def put_file_ids(self, key: str, file_type: str, file_ids: list[str]):
+        self._file_ids[(key, file_type)] = file_ids
+        self._file_ids.move_to_end((key, file_type))
+        while len(self._file_ids) > self.max_file_ids:
+            self._file_ids.popitem(last=False)
+
+
+chart_cache = ChartCache(
+    max_bytes=settings.CHART_CACHE_MAX_BYTES,
+    max_file_ids=settings.CHART_CACHE_MAX_FILE_IDS,
+    root=settings.CHART_CACHE_PATH,
+    disk_max_bytes=settings.CHART_CACHE_DISK_MAX_BYTES,
+)
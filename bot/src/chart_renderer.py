@@ -0,0 +1,98 @@
+"""
+Отрисовка диаграмм в пуле процессов, чтобы построение больших графиков не блокировало цикл событий бота
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .settings import settings
+
+
+def _render(kind, max_pixels, *args):
+    # matplotlib и numpy импортируются только в процессах пула, процесс бота их не загружает
+    from .diagrams import render
+    return render(kind, *args, max_pixels=max_pixels)
+
+
+def _warm_up():
+    from . import diagrams  # noqa: F401
+
+
+class RenderQueueFullError(Exception):
+    pass
+
+
+class RenderTimeoutError(Exception):
+    pass
+
+
+class ChartRenderer:
+    def __init__(self, workers: int, queue_limit: int, timeout: float, pdf_timeout: float, max_pixels: int):
+        self.workers = workers
+        self.timeout = timeout
+        self.pdf_timeout = pdf_timeout
+        self.max_pixels = max_pixels
+        # Одновременно принимается не больше задач, чем процессов плюс длина очереди
+        self._slots = asyncio.Semaphore(workers + queue_limit)
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: дочерний процесс не наследует потоки и открытые соединения процесса бота
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        return self._executor
+
+    async def render(self, kind: str, *args) -> list[bytes] | None:
+        """
+        Возвращает страницы диаграммы kind (full, month, week, kanban) в PNG, каждая не больше max_pixels пикселей,
+        один PDF для kind pdf или None, если отображать нечего.
+        Аргументы должны быть сериализуемыми: списки и словари из ответов API.
+        """
+        if self._slots.locked():
+            raise RenderQueueFullError()
+        await self._slots.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._get_executor().submit(_render, kind, self.max_pixels, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Место освобождается, только когда процесс пула закончил задачу: после тайм-аута она продолжает
+        # выполняться и занимает процесс, поэтому новые задачи не должны вставать за ней сверх лимита очереди
+        future.add_done_callback(lambda _: self._release_slot(loop))
+        try:
+            timeout = self.pdf_timeout if kind == "pdf" else self.timeout
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise RenderTimeoutError()
+
+    def _release_slot(self, loop: asyncio.AbstractEventLoop):
+        # Вызывается из потока пула процессов
+        try:
+            loop.call_soon_threadsafe(self._slots.release)
+        except RuntimeError:
+            # Цикл событий уже закрыт при остановке бота
+            pass
+
+    async def warm_up(self):
+        """
+        Запускает процессы пула и заранее загружает в них модуль диаграмм, чтобы первая диаграмма строилась без задержки.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, _warm_up) for _ in range(self.workers)))
+
+    async def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+chart_renderer = ChartRenderer(
+    workers=settings.CHART_RENDER_WORKERS,
+    queue_limit=settings.CHART_RENDER_QUEUE_LIMIT,
+    timeout=settings.CHART_RENDER_TIMEOUT,
+    pdf_timeout=settings.CHART_PDF_RENDER_TIMEOUT,
+    max_pixels=settings.CHART_MAX_IMAGE_PIXELS,
+)
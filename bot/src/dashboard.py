@@ -0,0 +1,26 @@
+"""
+Загрузка сводных данных пользователя (задания, дисциплины, пары, преподаватели) за один запрос к API
+"""
+from aiogram.fsm.context import FSMContext
+
+from bot.src.api_client import api_client, ApiResponse
+from .settings import settings
+
+
+async def load_dashboard(state: FSMContext, telegram_id: str) -> ApiResponse:
+    """
+    Запрашивает /get_dashboard и сохраняет ответ в состояние в том же виде,
+    в каком обработчики раньше собирали его из get_user_id, get_labs, get_disciplines и get_lessons.
+    """
+    url_req = f"{settings.API_URL}/get_dashboard"
+    response = await api_client.get(url_req, json={"telegram_id": telegram_id})
+    if response.status_code == 200:
+        dashboard = response.json()
+        # Дисциплины приходят уже отсортированными по названию
+        disciplines_dict = {d["discipline_id"]: d["name"] for d in dashboard["disciplines"]}
+        await state.update_data(user_id=dashboard["user_id"],
+                                labs_response={"labs": dashboard["labs"]},
+                                lessons_response={"lessons": dashboard["lessons"]},
+                                teachers_response={"teachers": dashboard["teachers"]},
+                                disciplines_dict=disciplines_dict)
+    return response
@@ -1,15 +1,31 @@
-from openai import OpenAI
+import asyncio
+
 from .settings import settings
 TOKEN = settings.openAI_API_KEY
 
-client = OpenAI(
-  base_url="https://openrouter.ai/api/v1",
-  api_key=TOKEN,
-)
+# Клиент OpenAI создается при первом обращении, чтобы импорт пакета openai не замедлял запуск бота
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        # Асинхронный клиент: ожидание ответа модели не останавливает обработку других чатов
+        from openai import AsyncOpenAI
+        _client = AsyncOpenAI(
+          base_url="https://openrouter.ai/api/v1",
+          api_key=TOKEN,
+        )
+    return _client
+
+
+async def warm_up():
+    await asyncio.to_thread(get_client)
 
 
 async def create_answer(message):
-    completion = client.chat.completions.create(
+    client = await asyncio.to_thread(get_client)
+    completion = await client.chat.completions.create(
       model="deepseek/deepseek-r1:free",
       messages=[
         {
@@ -0,0 +1,825 @@
+"""
+Построение диаграмм Ганта и канбан-доски. Модуль не зависит от aiogram и настроек бота,
+чтобы его можно было импортировать в процессах пула отрисовки
+"""
+import bisect
+import calendar
+import io
+import math
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+import numpy as np
+from datetime import datetime, timedelta
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import FancyBboxPatch
+
+from .recurrence import week_window, occurrences_array
+
+
+status_colors = {
+    'Не начато': '#dedede',
+    'В процессе': '#66e3ff',
+    'Готово к сдаче': '#ddb3fc',
+    'Сдано': '#94ffab'
+}
+
+lesson_colors = {
+    'schedule': '#f59527',
+    'database': '#675ce5',
+    'schedule_end': '#fac07d',
+    'database_end': '#a69ef7'
+}
+
+FIXED_SPACING = 1
+BAR_HEIGHT = 0.7
+
+
+def get_lab_bars(all_items, y_pos):
+    """
+    Собирает координаты полос заданий в массивы. Даты переводятся в числа matplotlib одним вызовом.
+    """
+    rows = [i for i, item in enumerate(all_items) if item['type'] == 'lab']
+    lab_tasks = [all_items[i]['data'] for i in rows]
+    start_dates = np.array([lab['start_date'] for lab in lab_tasks], dtype='datetime64[D]')
+    end_dates = np.array([lab['end_date'] for lab in lab_tasks], dtype='datetime64[D]')
+    statuses = np.array([lab['status'] for lab in lab_tasks], dtype=object)
+    overdue = (statuses != 'Сдано') & (end_dates < np.datetime64(datetime.now().date(), 'D'))
+    return {
+        'y': np.asarray(y_pos, dtype=float)[rows],
+        'start': mdates.date2num(start_dates),
+        'end': mdates.date2num(end_dates),
+        'statuses': statuses,
+        'overdue': overdue,
+    }
+
+
+def draw_bars(ax, y, left, width, **kwargs):
+    """
+    Рисует горизонтальные полосы одной коллекцией вместо отдельного barh для каждой полосы.
+    Возвращает коллекцию или None, если полос нет.
+    """
+    if len(y) == 0:
+        return None
+    right = left + width
+    top = y - BAR_HEIGHT / 2
+    bottom = y + BAR_HEIGHT / 2
+    verts = np.stack([np.column_stack([left, top]), np.column_stack([left, bottom]),
+                      np.column_stack([right, bottom]), np.column_stack([right, top])], axis=1)
+    return ax.add_collection(PolyCollection(verts, **kwargs))
+
+
+def draw_lab_bars(ax, bars):
+    return draw_bars(ax, bars['y'], bars['start'], bars['end'] - bars['start'],
+              facecolors=[status_colors.get(status) for status in bars['statuses']],
+              edgecolors='black', linewidths=0.5)
+
+
+def draw_overdue_bars(ax, bars, overdue_end):
+    """
+    Рисует полосы просрочки от срока сдачи до overdue_end.
+    """
+    overdue = bars['overdue']
+    deadline = bars['end'][overdue]
+    return draw_bars(ax, bars['y'][overdue], deadline, overdue_end - deadline,
+                     facecolors='#FFCCCC', linestyles='--', alpha=0.7,
+                     edgecolors='red', linewidths=0.5)
+
+
+def set_gantt_rows(fig, ax, y_labels, bars, overdue_end, discipline_names, label_sizes,
+                   points=None, point_size=150):
+    """
+    Задает строки диаграммы Ганта: полосы заданий и просрочки, подписи и точки занятий
+    (points - массивы x, y и цветов точек). label_sizes - размеры подписей дисциплин и заданий.
+    Строки рисует fig.draw_rows при сохранении (см. iter_pages), fig.row_edges - границы строк.
+    """
+    y_pos = np.arange(len(y_labels)) * FIXED_SPACING
+    if points is not None:
+        order = np.argsort(points[1], kind='stable')
+        points = [np.asarray(values)[order] for values in points]
+    row_artists = []
+
+    def draw_rows(first, last):
+        for artist in row_artists:
+            artist.remove()
+        row_artists.clear()
+        # Полосы и точки упорядочены по строкам, поэтому строки страницы находятся бинарным поиском
+        bounds = (first * FIXED_SPACING, last * FIXED_SPACING)
+        start, stop = np.searchsorted(bars['y'], bounds)
+        page_bars = {key: values[start:stop] for key, values in bars.items()}
+        row_artists.extend([draw_lab_bars(ax, page_bars), draw_overdue_bars(ax, page_bars, overdue_end)])
+        if points is not None:
+            start, stop = np.searchsorted(points[1], bounds)
+            if stop > start:
+                row_artists.append(ax.scatter(points[0][start:stop], points[1][start:stop],
+                                              s=point_size, marker='o',
+                                              color=points[2][start:stop].tolist(), zorder=5))
+        row_artists[:] = [artist for artist in row_artists if artist is not None]
+
+        ax.set_yticks(y_pos[first:last])
+        labels = ax.set_yticklabels(y_labels[first:last], ha='right', position=(-0.1, 0))
+        for label in labels:
+            if label.get_text() in discipline_names:
+                label.set_fontweight('bold')
+                label.set_fontsize(label_sizes[0])
+            else:
+                label.set_fontweight('normal')
+                label.set_fontsize(label_sizes[1])
+
+    fig.row_edges = [row - 0.5 for row in range(len(y_labels) + 1)]
+    fig.draw_rows = draw_rows
+
+
+def round_to_2weeks(dt):
+    if isinstance(dt, str):
+        dt = datetime.strptime(dt, '%Y-%m-%d')
+
+    days_since_epoch = (dt - datetime(1970, 1, 1)).days
+    remainder = days_since_epoch % 14
+    if remainder == 0:
+        return dt
+    else:
+        return dt + timedelta(days=(14 - remainder))
+
+
+def get_lessons_pairs(lessons_response, disciplines_dict):
+    pairs = []
+
+    for lesson in lessons_response['lessons']:
+        discipline_id = lesson['discipline_id']
+        pairs.append({
+            'discipline': disciplines_dict.get(discipline_id, f"Unknown ({discipline_id})"),
+            'discipline_id': discipline_id,
+            'start_date': lesson['start_date'],
+            'periodicity_days': lesson['periodicity_days']
+        })
+
+    return pairs
+
+
+def create_diagram_full(data):
+    labs = data['labs_response']['labs']
+    disciplines_dict = data['disciplines_dict']
+
+    disciplines_labs = {}
+    for lab in labs:
+        discipline_id = lab['discipline_id']
+        if discipline_id not in disciplines_labs:
+            disciplines_labs[discipline_id] = []
+        disciplines_labs[discipline_id].append(lab)
+
+    sorted_disciplines = sorted(disciplines_labs.items(),
+                                key=lambda x: min(lab['start_date'] for lab in x[1]))
+
+    plt.rcParams.update({
+        'font.family': 'DejaVu Sans',
+        'axes.titlesize': 12,
+        'font.weight': 'bold'
+    })
+
+    all_items = []
+    y_labels = []
+
+    for discipline_id, lab_list in sorted_disciplines:
+        discipline_name = disciplines_dict.get(discipline_id, f"Дисциплина {discipline_id}")
+
+        lab_list.sort(key=lambda x: x['start_date'])
+
+        y_labels.append(discipline_name)
+        all_items.append({'type': 'discipline'})
+
+        for lab in lab_list:
+            y_labels.append(lab['name'])
+            all_items.append({'type': 'lab', 'data': lab})
+
+        all_items.append({'type': 'empty'})
+        y_labels.append("")
+
+    if len(all_items) == 0:
+        return
+
+    total_labs = sum(len(labs) for labs in disciplines_labs.values())
+    fig_height = len(all_items) * 0.4
+    fig, ax = plt.subplots(figsize=(15, fig_height))
+
+    lab_tasks = [item['data'] for item in all_items if item['type'] == 'lab']
+
+    y_pos = np.arange(len(all_items)) * FIXED_SPACING
+
+    bars = get_lab_bars(all_items, y_pos)
+    deadline_num = int(bars['overdue'].sum())
+    set_gantt_rows(fig, ax, y_labels, bars, mdates.date2num(datetime.now()) - 0.5,
+                   set(disciplines_dict.values()), (12, 10))
+
+    ax.set_ylim(len(all_items) - 0.5, -0.5)
+
+    min_date = min(lab['start_date'] for lab in lab_tasks)
+    min_date_dt = datetime.strptime(min_date, '%Y-%m-%d')
+    min_date_num = mdates.date2num(min_date_dt)
+
+    max_date_dt = max(datetime.strptime(lab['end_date'], '%Y-%m-%d') for lab in lab_tasks)
+    today_dt = datetime.now()
+    max_date = max(max_date_dt, today_dt).strftime('%Y-%m-%d')
+    rounded_max_date = round_to_2weeks(max_date)
+    max_date_num = mdates.date2num(rounded_max_date)
+
+    ax.set_xlim(min_date_num - 0.001, max_date_num + 0.001)
+
+    ax.xaxis.set_major_locator(mdates.DayLocator(interval=14))
+
+    ax.set_xticks(list(ax.get_xticks()) + [min_date_num])
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%d.%m.%Y'))
+    ax.xaxis.tick_top()
+    for label in ax.get_xticklabels():
+        label.set_fontweight('normal')
+
+    ax.axvline(x=mdates.date2num(datetime.now()) - 0.5, color='red', linestyle='--', linewidth=1.5)
+
+    ax.grid(True, axis='x', linestyle=':', alpha=0.5)
+
+    for spine in ['left', 'right', 'bottom']:
+        ax.spines[spine].set_visible(False)
+
+    legend_elements = [plt.Rectangle((0, 0), 1, 1, fc=color, label=status)
+                       for status, color in status_colors.items()]
+    legend_elements.append(plt.Rectangle((0, 0), 1, 1, fc='#FFCCCC', label=f"Просроченные задания: {deadline_num}",
+                                         linestyle="--", edgecolor='red', linewidth=0.5))
+    legend = ax.legend(handles=legend_elements,
+                       loc='upper left',
+                       bbox_to_anchor=(1.02, 1),
+                       fontsize=9)
+    legend.set_title('Статусы', prop={'weight': 'normal'})
+    for text in legend.get_texts():
+        text.set_fontweight('normal')
+
+    plt.tight_layout()
+    plt.subplots_adjust(left=0.3, right=0.85, top=0.95, bottom=0.05)
+
+    return plt, fig
+
+
+def create_diagram_month(labs, disciplines_dict, month, year):
+    month = int(month)
+    year = int(year)
+
+    disciplines_labs = {}
+    for lab in labs:
+        discipline_id = lab['discipline_id']
+        if discipline_id not in disciplines_labs:
+            disciplines_labs[discipline_id] = []
+        disciplines_labs[discipline_id].append(lab)
+
+    sorted_disciplines = sorted(disciplines_labs.items(),
+                                key=lambda x: min(lab['start_date'] for lab in x[1]))
+
+    plt.rcParams.update({
+        'font.family': 'DejaVu Sans',
+        'axes.titlesize': 12,
+        'font.weight': 'bold'
+    })
+
+    all_items = []
+    y_labels = []
+
+    for discipline_id, lab_list in sorted_disciplines:
+        discipline_name = disciplines_dict.get(discipline_id, f"Дисциплина {discipline_id}")
+
+        lab_list.sort(key=lambda x: x['start_date'])
+
+        y_labels.append(discipline_name)
+        all_items.append({'type': 'discipline'})
+
+        for lab in lab_list:
+            y_labels.append(lab['name'])
+            all_items.append({'type': 'lab', 'data': lab})
+
+        all_items.append({'type': 'empty'})
+        y_labels.append("")
+
+    if len(all_items) == 0:
+        return
+
+    total_labs = sum(len(labs) for labs in disciplines_labs.values())
+    fig_height = len(all_items) * 0.4
+    fig, ax = plt.subplots(figsize=(15, fig_height))
+
+    y_pos = np.arange(len(all_items)) * FIXED_SPACING
+
+    bars = get_lab_bars(all_items, y_pos)
+    if datetime.now().month != month:
+        overdue_end = datetime(day=calendar.monthrange(year, month)[1], month=month, year=year)
+    else:
+        overdue_end = datetime(day=datetime.now().day, month=month, year=year)
+    deadline_num = int(bars['overdue'].sum())
+    set_gantt_rows(fig, ax, y_labels, bars, mdates.date2num(overdue_end),
+                   set(disciplines_dict.values()), (12, 10))
+
+    ax.set_ylim(len(all_items) - 0.5, -0.5)
+
+    min_date_dt = datetime(day=1, month=month, year=year)
+    min_date_num = mdates.date2num(min_date_dt)
+
+    max_date_dt = datetime(day=calendar.monthrange(year, month)[1], month=month, year=year)
+    max_date_num = mdates.date2num(max_date_dt)
+
+    ax.set_xlim(min_date_num - 0.001, max_date_num + 0.001)
+
+    days_in_month = calendar.monthrange(year, month)[1]
+    ax.set_xticks(np.arange(min_date_num, max_date_num + 1, 1))
+    ax.xaxis.set_major_formatter(plt.FixedFormatter(range(1, days_in_month + 1)))
+    ax.xaxis.tick_top()
+    for label in ax.get_xticklabels():
+        label.set_fontweight('normal')
+
+    ax.axvline(x=mdates.date2num(datetime.now().replace(hour=0)), color='red', linestyle='--', linewidth=1.5)
+
+    ax.grid(True, axis='x', which='major', linestyle='-', alpha=0.3)
+    ax.grid(True, axis='x', which='minor', linestyle=':', alpha=0.1)
+
+    for spine in ['left', 'right', 'bottom']:
+        ax.spines[spine].set_visible(False)
+
+    legend_elements = [plt.Rectangle((0, 0), 1, 1, fc=color, label=status)
+                       for status, color in status_colors.items()]
+    if deadline_num != 0:
+        legend_elements.append(plt.Rectangle((0, 0), 1, 1, fc='#FFCCCC', label=f"Просроченные задания: {deadline_num}",
+                                         linestyle="--", edgecolor='red', linewidth=0.5))
+    legend = ax.legend(handles=legend_elements,
+                       loc='upper left',
+                       bbox_to_anchor=(1.02, 1),
+                       fontsize=9)
+    legend.set_title('Статусы', prop={'weight': 'normal'})
+    for text in legend.get_texts():
+        text.set_fontweight('normal')
+
+    month_name = {
+        1: 'Январь', 2: 'Февраль', 3: 'Март', 4: 'Апрель',
+        5: 'Май', 6: 'Июнь', 7: 'Июль', 8: 'Август',
+        9: 'Сентябрь', 10: 'Октябрь', 11: 'Ноябрь', 12: 'Декабрь'
+    }.get(month, '')
+
+    plt.title(f"{month_name}, {year} год",
+              pad=40, fontsize=14, fontweight='bold')
+
+    plt.tight_layout()
+    plt.subplots_adjust(left=0.3, right=0.85, top=0.95, bottom=0.05)
+    return plt, fig
+
+
+def create_diagram_week(data):
+
+    labs = data['labs_response']['labs']
+    disciplines_dict = data['disciplines_dict']
+
+    lessons_data = {
+        'schedule_pairs': data.get('schedule_pairs', []),
+        'lessons_pairs': get_lessons_pairs(data['lessons_response'], data['disciplines_dict'])
+    }
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start_monday = today - timedelta(days=today.weekday()) - timedelta(days=7)
+    end_date = start_monday + timedelta(weeks=3) - timedelta(days=7)
+
+    disciplines_labs = {}
+    for lab in labs:
+        discipline_id = lab['discipline_id']
+        if discipline_id not in disciplines_labs:
+            disciplines_labs[discipline_id] = []
+        disciplines_labs[discipline_id].append(lab)
+
+    sorted_disciplines = sorted(disciplines_labs.items(),
+                                key=lambda x: min(lab['start_date'] for lab in x[1]))
+
+    plt.rcParams.update({
+        'font.family': 'DejaVu Sans',
+        'axes.titlesize': 12,
+        'font.weight': 'bold'
+    })
+
+    all_items = []
+    y_labels = []
+
+    for discipline_id, lab_list in sorted_disciplines:
+        discipline_name = disciplines_dict.get(discipline_id, f"Дисциплина {discipline_id}")
+
+        lab_list.sort(key=lambda x: x['start_date'])
+
+        y_labels.append(discipline_name)
+        all_items.append({'type': 'discipline'})
+
+        for lab in lab_list:
+            end_lab_date = datetime.strptime(lab['end_date'], '%Y-%m-%d').date()
+            if lab['status'] != 'Сдано' or (start_monday.date() <= end_lab_date <= end_date.date()):
+                y_labels.append(lab['name'])
+                all_items.append({'type': 'lab', 'data': lab})
+
+        all_items.append({'type': 'empty'})
+        y_labels.append("")
+
+    if len(all_items) == 0:
+        return
+
+    total_labs = sum(len(labs) for labs in disciplines_labs.values())
+    fig_height = len(all_items) * 0.4
+    fig, ax = plt.subplots(figsize=(15, fig_height))
+
+    y_pos = np.arange(len(all_items)) * FIXED_SPACING
+
+    bars = get_lab_bars(all_items, y_pos)
+    deadline_num = int(bars['overdue'].sum())
+
+    ax.set_ylim(len(all_items) - 0.5, -0.5)
+
+    ax.set_xlim([
+        mdates.date2num(start_monday - timedelta(days=0.5)),
+        mdates.date2num(end_date + timedelta(days=0.5))
+    ])
+
+    days_ru = ['пн', 'вт', 'ср', 'чт', 'пт', 'сб', 'вс']
+
+    all_dates = [start_monday + timedelta(days=i) for i in range(21)]  # 3 недели
+    date_numbers = [mdates.date2num(date) for date in all_dates]
+
+    ax.set_xticks(date_numbers)
+    ax.set_xticklabels([days_ru[d.weekday()] for d in all_dates])
+
+    current_day = datetime.now().replace(hour=0, minute=0, second=0)
+    ax.axvline(x=mdates.date2num(current_day),
+               color='red', linestyle='--', linewidth=1.5, zorder=10)
+
+    point_size = 150
+    points_x = []
+    points_y = []
+    points_colors = []
+
+    lessons_pairs = lessons_data['lessons_pairs']
+    window_start, window_end = week_window(datetime.now().date())
+    pair_indexes, pair_dates = occurrences_array([pair['start_date'] for pair in lessons_pairs],
+                                                 [pair['periodicity_days'] for pair in lessons_pairs],
+                                                 window_start, window_end)
+    for pair_index, date in zip(pair_indexes.tolist(), pair_dates.tolist()):
+        pair = lessons_pairs[pair_index]
+        pair_date = datetime.combine(date, datetime.min.time())
+        pair_num = mdates.date2num(pair_date)
+        for i, item in enumerate(all_items):
+            if item['type'] == 'lab' and disciplines_dict.get(item['data']['discipline_id']) == pair['discipline']:
+                if item['data']['status'] != 'Сдано':
+                    if datetime.strptime(item['data']['start_date'], '%Y-%m-%d') <= pair_date <= datetime.strptime(item['data']['end_date'], '%Y-%m-%d') or \
+                            datetime.strptime(item['data']['start_date'],'%Y-%m-%d') <= pair_date <= datetime.now().replace(hour=0, minute=0,second=0, microsecond=0):
+                        if pair_date < datetime.now().replace(hour=0, minute=0, second=0, microsecond=0):
+                            color = lesson_colors['database_end']
+                        else:
+                            color = lesson_colors['database']
+                        points_x.append(pair_num)
+                        points_y.append(y_pos[i])
+                        points_colors.append(color)
+
+    for pair in lessons_data['schedule_pairs']:
+        pair_date = datetime.strptime(pair['date'], '%Y-%m-%d')
+        pair_num = mdates.date2num(pair_date)
+
+        for i, item in enumerate(all_items):
+            if item['type'] == 'lab' and disciplines_dict.get(item['data']['discipline_id']) == pair['discipline']:
+                if item['data']['status'] != 'Сдано':
+                    if datetime.strptime(item['data']['start_date'], '%Y-%m-%d') <= pair_date <= datetime.strptime(item['data']['end_date'], '%Y-%m-%d') or \
+                            datetime.strptime(item['data']['start_date'], '%Y-%m-%d') <= pair_date <= datetime.now().replace(hour=0, minute=0, second=0, microsecond=0):
+                        if pair_date < datetime.now().replace(hour=0, minute=0, second=0, microsecond=0):
+                            color = lesson_colors['schedule_end']
+                        else:
+                            color = lesson_colors['schedule']
+                        points_x.append(pair_num)
+                        points_y.append(y_pos[i])
+                        points_colors.append(color)
+
+    set_gantt_rows(fig, ax, y_labels, bars, mdates.date2num(datetime.now().replace(hour=0)),
+                   set(disciplines_dict.values()), (13, 12),
+                   points=(points_x, points_y, points_colors) if points_x else None, point_size=point_size)
+
+    ax.xaxis.tick_top()
+    # plt.xticks(rotation=45)
+    ax.grid(True, axis='x', linestyle=':', alpha=0.5)
+
+    for date in all_dates:
+        if date.weekday() == 0:
+            ax.axvline(x=mdates.date2num(date), color='gray', linestyle='-', alpha=0.3)
+
+    ax.grid(True, axis='x', which='major', linestyle='-', alpha=0.3)
+    ax.grid(True, axis='x', which='minor', linestyle=':', alpha=0.1)
+
+    for spine in ['left', 'right', 'bottom']:
+        ax.spines[spine].set_visible(False)
+
+    legend_elements = [plt.Rectangle((0, 0), 1, 1, fc=color, label=status)
+                       for status, color in status_colors.items()]
+    if deadline_num != 0:
+        legend_elements.append(plt.Rectangle((0, 0), 1, 1, fc='#FFCCCC', label=f"Просроченные задания: {deadline_num}",
+                                         linestyle="--", edgecolor='red', linewidth=0.5))
+    legend_elements.append(
+        plt.Line2D([0], [0], marker='o', color='w', label='Занятия из расписания ПетрГУ',
+                   markerfacecolor=lesson_colors['schedule'], markersize=10))
+    legend_elements.append(plt.Line2D([0], [0], marker='o', color='w', label='Ваши добавленные занятия',
+                   markerfacecolor=lesson_colors['database'], markersize=10))
+
+    legend = ax.legend(handles=legend_elements,
+                       loc='upper left',
+                       bbox_to_anchor=(1.02, 1),
+                       fontsize=11)
+
+    legend.set_title('Статусы', prop={'weight': 'normal'})
+    for text in legend.get_texts():
+        text.set_fontweight('normal')
+
+    plt.tight_layout()
+    plt.subplots_adjust(left=0.3, right=0.85, top=0.95, bottom=0.05)
+    return plt, fig
+
+
+def wrap_text(text, max_length=30):
+    words = text.split()
+    lines = []
+    current_line = ""
+    for word in words:
+        if len(current_line) + len(word) + 1 <= max_length:
+            current_line += " " + word if current_line else word
+        else:
+            lines.append(current_line)
+            current_line = word
+    if current_line:
+        lines.append(current_line)
+    return lines
+
+
+def create_kanban(data):
+    # Получаем и группируем данные
+    labs = data['labs_response']['labs']
+    disciplines = data['disciplines_dict']
+
+    status_groups = {
+        "Не начато": [],
+        "В процессе": [],
+        "Готово к сдаче": [],
+        "Сдано": []
+    }
+
+    for lab in labs:
+        status = lab['status']
+        if status in status_groups:
+            lab['discipline_name'] = disciplines.get(lab['discipline_id'], 'Неизвестно')
+            status_groups[status].append(lab)
+
+    # Настройки визуализации
+    column_width = 5.0
+    margin = 0.4
+    spacing = 0.5
+    colors = [status_colors['Не начато'], status_colors['В процессе'],
+              status_colors['Готово к сдаче'], status_colors['Сдано']]
+
+    # Карточки выстраиваются в ряды: высота ряда равна высоте самой высокой карточки ряда во всех колонках,
+    # поэтому границы рядов совпадают и по ним можно делить доску на страницы
+    card_lines = {
+        status: [len(wrap_text(task['name'])) + len(wrap_text(f"Дисц.: {task['discipline_name']}")) + 1
+                 for task in tasks]
+        for status, tasks in status_groups.items()
+    }
+    max_cards = max(len(tasks) for tasks in status_groups.values())
+    row_heights = [max(lines[row] for lines in card_lines.values() if row < len(lines)) * 0.3
+                   for row in range(max_cards)]
+    total_height = margin * 2 + sum(row_height + spacing for row_height in row_heights) + margin / 2 - 0.2
+
+    row_tops = []
+    y_offset = total_height - margin - 0.3  # Начинаем от верхнего края
+    for row_height in row_heights:
+        row_tops.append(y_offset)
+        y_offset -= row_height + spacing
+
+    # Создаем фигуру
+    fig, ax = plt.subplots(figsize=(15, total_height))
+    ax.axis('off')
+
+    # Функция для переноса текста
+
+
+    for col_idx, (status, color) in enumerate(zip(status_groups.keys(), colors)):
+        x = col_idx * (column_width + margin) + margin
+
+        # Фон колонки
+        ax.add_patch(
+            FancyBboxPatch(
+                (x, margin),
+                column_width,
+                total_height - margin,
+                facecolor=color,
+                alpha=0.7,
+                edgecolor="black",
+                linewidth=2,
+                boxstyle="round,pad=0.1",
+                zorder=0
+            )
+        )
+
+        # Заголовок колонки
+        ax.text(
+            x + column_width / 2,
+            total_height,
+            status + " - " + str(len(status_groups[status])),
+            ha='center',
+            va='center',
+            fontsize=14,
+            weight='bold',
+            bbox=dict(facecolor='white', edgecolor='black', boxstyle='round,pad=0.3'),
+            zorder=2,
+            clip_on=True
+        )
+
+    # Карточки задач рисует fig.draw_rows при сохранении: при делении на страницы (см. iter_pages)
+    # на оси остаются только ряды страницы
+    card_artists = []
+
+    def draw_rows(first, last):
+        for artist in card_artists:
+            artist.remove()
+        card_artists.clear()
+        for col_idx, (status, tasks) in enumerate(status_groups.items()):
+            x = col_idx * (column_width + margin) + margin + 0.2
+
+            for task, y_offset in zip(tasks[first:last], row_tops[first:last]):
+                # Форматируем текст
+                name_lines = wrap_text(task['name'])
+                disc_lines = wrap_text(f"Дисц.: {task['discipline_name']}")
+                date_line = f"Срок: {datetime.strptime(task['end_date'], '%Y-%m-%d').strftime('%d.%m.%Y')}"
+
+                # Рассчитываем высоту карточки
+                line_count = len(name_lines) + len(disc_lines) + 1
+                current_card_height = line_count * 0.3
+
+                # Рисуем карточку
+                card_artists.append(ax.add_patch(
+                    FancyBboxPatch(
+                        (x, y_offset - current_card_height),
+                        column_width - 0.4,
+                        current_card_height,
+                        facecolor="white",
+                        edgecolor="gray",
+                        linewidth=1,
+                        boxstyle="round,pad=0.2,rounding_size=0.15",
+                        zorder=1
+                    )
+                ))
+
+                # Добавляем текст. Текст за пределами страницы обрезается, иначе он расширяет сохраняемое изображение
+                all_lines = name_lines + disc_lines + [date_line]
+                for i, line in enumerate(all_lines):
+                    weight = 'bold' if i < len(name_lines) else 'normal'
+                    card_artists.append(ax.text(
+                        x + 0.3,
+                        y_offset - current_card_height + 0.23 + (len(all_lines) - i - 1) * 0.3,
+                        line,
+                        ha='left',
+                        va='top',
+                        fontsize=11,
+                        fontfamily='sans-serif',
+                        weight=weight,
+                        zorder=3,
+                        clip_on=True
+                    ))
+
+    fig.draw_rows = draw_rows
+    # Ряды делятся посередине промежутков между ними, первый ряд начинается у верхнего края доски
+    fig.row_edges = [total_height + margin] + \
+                    [row_top - row_height - spacing / 2
+                     for row_top, row_height in zip(row_tops[:-1], row_heights[:-1])] + [0]
+
+    # Настраиваем границы
+    total_width = (column_width + margin) * len(status_groups) + margin
+    ax.set_xlim(0, total_width)
+    ax.set_ylim(0, total_height + margin)
+    plt.tight_layout()
+    return plt, fig
+
+
+# Функция построения и отступ при сохранении для каждого вида диаграммы
+chart_builders = {
+    "full": (create_diagram_full, 0.5),
+    "month": (create_diagram_month, 0.5),
+    "week": (create_diagram_week, 0.5),
+    "kanban": (create_kanban, 0.2),
+}
+
+
+def output_pixels(fig, dpi, pad_inches):
+    """
+    Число пикселей изображения, которое сохранит savefig с bbox_inches='tight'.
+    """
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(pad_inches)
+    return math.ceil(bbox.width * dpi) * math.ceil(bbox.height * dpi)
+
+
+def iter_pages(fig, max_pixels, dpi, pad_inches):
+    """
+    Делит высокую диаграмму на страницы не больше max_pixels пикселей, сдвигая видимую область оси Y сверху вниз.
+    Высота страницы подбирается так, чтобы масштаб строк совпадал с масштабом исходной диаграммы.
+    Диаграмма задает границы строк fig.row_edges (значения оси Y сверху вниз) и функцию fig.draw_rows(first, last),
+    оставляющую на оси только строки с first по last - 1. Страница заканчивается на границе строки, и на ней
+    рисуются только ее строки, поэтому время построения страницы не зависит от размера всей диаграммы.
+    """
+    width, height = fig.get_size_inches()
+    ax = fig.axes[0]
+    edges = fig.row_edges
+    direction = 1 if edges[-1] > edges[0] else -1
+    # Расстояние каждой границы от верхнего края диаграммы в единицах оси
+    offsets = [abs(edge - edges[0]) for edge in edges]
+    units_per_inch = offsets[-1] / height
+
+    def set_page(page_top, page_bottom):
+        first = max(bisect.bisect_right(offsets, page_top) - 1, 0)
+        last = min(max(bisect.bisect_left(offsets, page_bottom), first + 1), len(offsets) - 1)
+        fig.draw_rows(first, last)
+        ax.set_ylim(edges[0] + page_bottom * direction, edges[0] + page_top * direction)
+        fig.set_size_inches(width, (page_bottom - page_top) / units_per_inch)
+        return output_pixels(fig, dpi, pad_inches) <= max_pixels
+
+    # Оценка высоты страницы по размеру фигуры, отступы сохраняемого изображения проверяются при построении страницы
+    estimate = max_pixels / (width * dpi * dpi) * units_per_inch
+    page_top = 0
+    while page_top < offsets[-1]:
+        # Самая дальняя граница строки, до которой страница помещается в ограничение, ищется бинарным поиском
+        low = bisect.bisect_right(offsets, page_top)
+        high = max(bisect.bisect_right(offsets, page_top + estimate) - 1, low)
+        fitting = high if set_page(page_top, offsets[high]) else None
+        checked = high
+        if fitting is None:
+            high -= 1
+            while low <= high:
+                middle = (low + high + 1) // 2
+                checked = middle
+                if set_page(page_top, offsets[middle]):
+                    fitting, low = middle, middle + 1
+                else:
+                    high = middle - 1
+        if fitting is not None:
+            page_bottom = offsets[fitting]
+            if checked != fitting:
+                set_page(page_top, page_bottom)
+        else:
+            # Даже одна строка не помещается в ограничение: страница обрезается внутри строки
+            page_units = min(estimate, offsets[low] - page_top)
+            while not set_page(page_top, page_top + page_units):
+                page_units *= 0.9
+            page_bottom = page_top + page_units
+        yield
+        page_top = page_bottom
+
+
+def render_png(kind, *args, max_pixels, dpi=100):
+    """
+    Строит диаграмму и возвращает список страниц в PNG или None, если отображать нечего.
+    Вызывается в процессе пула отрисовки, аргументы и результат передаются через pickle.
+    """
+    builder, pad_inches = chart_builders[kind]
+    result = builder(*args)
+    if result is None:
+        return None
+    plt, fig = result
+    pages = []
+    for _ in iter_pages(fig, max_pixels, dpi, pad_inches):
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight', pad_inches=pad_inches)
+        pages.append(buf.getvalue())
+    plt.close(fig)
+    return pages
+
+
+def render_pdf(pages):
+    """
+    Собирает диаграммы в один многостраничный векторный PDF. pages - список пар (вид диаграммы, аргументы).
+    Пустые диаграммы пропускаются, если не построено ни одной страницы, возвращает None.
+    """
+    buf = io.BytesIO()
+    page_count = 0
+    with PdfPages(buf) as pdf:
+        for kind, args in pages:
+            builder, pad_inches = chart_builders[kind]
+            result = builder(*args)
+            if result is None:
+                continue
+            plt, fig = result
+            fig.draw_rows(0, len(fig.row_edges) - 1)
+            pdf.savefig(fig, bbox_inches='tight', pad_inches=pad_inches)
+            plt.close(fig)
+            page_count += 1
+    if page_count == 0:
+        return None
+    return buf.getvalue()
+
+
+def render(kind, *args, max_pixels):
+    """
+    Возвращает список страниц диаграммы: PNG для обычных диаграмм и один PDF для kind pdf.
+    """
+    if kind == "pdf":
+        pdf = render_pdf(*args)
+        return [pdf] if pdf is not None else None
+    return render_png(kind, *args, max_pixels=max_pixels)
@@ -0,0 +1,29 @@
+"""
+Названия дисциплин для подписей в списках заданий и занятий.
+Список показывается по страницам, поэтому у API запрашиваются только дисциплины текущей страницы,
+которых еще нет в disciplines_dict состояния
+"""
+from aiogram.fsm.context import FSMContext
+
+from bot.src.api_client import api_client, ApiResponse
+from .settings import settings
+
+
+async def load_discipline_names(state: FSMContext, discipline_ids) -> ApiResponse | None:
+    """
+    Добавляет в disciplines_dict названия дисциплин discipline_ids.
+    Возвращает ответ сервера или None, если все названия уже были в состоянии.
+    """
+    state_data = await state.get_data()
+    disciplines_dict = state_data.get("disciplines_dict") or {}
+    missing_ids = sorted(set(discipline_ids) - set(disciplines_dict))
+    if not missing_ids:
+        return None
+    url_req = f"{settings.API_URL}/get_disciplines"
+    response = await api_client.get(url_req, json={"user_id": state_data.get("user_id"),
+                                                   "discipline_ids": missing_ids})
+    if response.status_code == 200:
+        for discipline in response.json().get("disciplines", []):
+            disciplines_dict[discipline["discipline_id"]] = discipline["name"]
+        await state.update_data(disciplines_dict=disciplines_dict)
+    return response
@@ -0,0 +1,30 @@
+"""
+Хранилище состояний FSM в Redis или совместимом с ним сервере
+"""
+from typing import Any, Mapping
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+
+from .fsm_storage import encode_state_data, decode_state_data
+
+
+class CompactRedisStorage(RedisStorage):
+    """
+    RedisStorage, хранящий данные состояния в том же компактном формате, что и SQLiteStorage.
+    Клиент передается снаружи, поэтому вместо сервера можно подставить совместимую реализацию, например fakeredis.
+    """
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        redis_key = self.key_builder.build(key, "data")
+        if not data:
+            await self.redis.delete(redis_key)
+            return
+        await self.redis.set(redis_key, encode_state_data(data), ex=self.data_ttl)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        redis_key = self.key_builder.build(key, "data")
+        value = await self.redis.get(redis_key)
+        if value is None:
+            return {}
+        return decode_state_data(value)
@@ -0,0 +1,125 @@
+"""
+Хранилища состояний FSM, переживающие перезапуск бота и общие для нескольких процессов
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import zlib
+from typing import Any, Mapping
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType, DefaultKeyBuilder
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from .settings import settings
+
+# Маркер словаря с целочисленными ключами (disciplines_dict, lecturers_dict):
+# JSON допускает только строковые ключи, без маркера они вернулись бы строками
+INT_KEYS_MARKER = "__int_keys__"
+
+# Данные меньше этого размера не сжимаются: для коротких значений заголовок zlib больше выигрыша
+COMPRESS_THRESHOLD = 512
+RAW_PREFIX = b"j"
+COMPRESSED_PREFIX = b"z"
+
+
+def _pack(value: Any) -> Any:
+    if isinstance(value, dict):
+        packed = {str(k): _pack(v) for k, v in value.items()}
+        if value and all(isinstance(k, int) and not isinstance(k, bool) for k in value):
+            return {INT_KEYS_MARKER: packed}
+        return packed
+    if isinstance(value, (list, tuple)):
+        return [_pack(v) for v in value]
+    return value
+
+
+def _unpack_hook(value: dict) -> Any:
+    if len(value) == 1 and INT_KEYS_MARKER in value:
+        return {int(k): v for k, v in value[INT_KEYS_MARKER].items()}
+    return value
+
+
+def encode_state_data(data: Mapping[str, Any]) -> bytes:
+    """
+    Сериализует данные состояния в компактный JSON, большие значения (списки заданий, расписание) сжимаются.
+    """
+    raw = json.dumps(_pack(dict(data)), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if len(raw) < COMPRESS_THRESHOLD:
+        return RAW_PREFIX + raw
+    return COMPRESSED_PREFIX + zlib.compress(raw)
+
+
+def decode_state_data(value: bytes) -> dict[str, Any]:
+    prefix, payload = value[:1], value[1:]
+    if prefix == COMPRESSED_PREFIX:
+        payload = zlib.decompress(payload)
+    return json.loads(payload, object_hook=_unpack_hook)
+
+
+def state_to_str(state: StateType) -> str | None:
+    return state.state if isinstance(state, State) else state
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    Хранилище в локальном файле SQLite. Подходит для одного или нескольких процессов на одной машине.
+    """
+
+    def __init__(self, path: str):
+        self._key_builder = DefaultKeyBuilder(with_destiny=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS fsm (key TEXT PRIMARY KEY, state TEXT, data BLOB)")
+        self._connection.commit()
+
+    def _execute(self, query: str, params: tuple) -> list[tuple]:
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+            self._connection.commit()
+            return rows
+
+    async def _run(self, query: str, params: tuple) -> list[tuple]:
+        return await asyncio.to_thread(self._execute, query, params)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self._run("INSERT INTO fsm (key, state) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET state = excluded.state",
+                        (self._key_builder.build(key), state_to_str(state)))
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        rows = await self._run("SELECT state FROM fsm WHERE key = ?", (self._key_builder.build(key),))
+        return rows[0][0] if rows else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self._run("INSERT INTO fsm (key, data) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET data = excluded.data",
+                        (self._key_builder.build(key), encode_state_data(data) if data else None))
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        rows = await self._run("SELECT data FROM fsm WHERE key = ?", (self._key_builder.build(key),))
+        if not rows or rows[0][0] is None:
+            return {}
+        return decode_state_data(rows[0][0])
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._connection.close)
+
+
+def create_storage() -> BaseStorage:
+    """
+    Создает хранилище состояний, выбранное в настройке FSM_STORAGE: memory, sqlite или redis.
+    """
+    if settings.FSM_STORAGE == "memory":
+        return MemoryStorage()
+    if settings.FSM_STORAGE == "sqlite":
+        return SQLiteStorage(settings.FSM_SQLITE_PATH)
+    if settings.FSM_STORAGE == "redis":
+        # Модуль требует пакет redis (aiogram[redis]), поэтому импортируется только при выборе этого хранилища
+        from .fsm_redis_storage import CompactRedisStorage
+        return CompactRedisStorage.from_url(settings.FSM_REDIS_URL, state_ttl=settings.FSM_STATE_TTL,
+                                            data_ttl=settings.FSM_STATE_TTL)
+    raise ValueError(f"Неизвестное хранилище состояний {settings.FSM_STORAGE}")
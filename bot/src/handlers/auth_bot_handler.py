@@ -1,4 +1,6 @@
-import requests
+from bot.src.api_client import api_client
+from bot.src.identity_cache import identity_cache
+from bot.src.schedule_service import schedule_service
 
 from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
@@ -25,9 +27,11 @@ async def add_user_to_db(state):
     is_petrsu_student = user_data.get("is_petrsu_student")
     group = user_data.get("group")
     url_req = f"{settings.API_URL}/add_user"
-    response = requests.post(url_req, json={"telegram_id": tg_id,
-                                            "is_petrsu_student": is_petrsu_student,
-                                            "group": group})
+    response = await api_client.post(url_req, json={"telegram_id": tg_id,
+                                                    "is_petrsu_student": is_petrsu_student,
+                                                    "group": group})
+    if response.status_code == 200:
+        identity_cache.invalidate(tg_id)
     return response.status_code
 
 
@@ -59,14 +63,15 @@ async def is_petrsu(callback_query: CallbackQuery, state: FSMContext):
 @router.message(AuthStates.waiting_for_group)
 async def get_group(message: Message, state: FSMContext):
     group = message.text
-    url_req = "https://petrsu.egipti.com/api/v2/groups"
-    response = requests.get(url_req)
+    response = await schedule_service.groups()
     if response.status_code == 200:
         petrsu_groups = response.json()
         if group in petrsu_groups.keys():
             await state.update_data(group=group)
             response_status = await add_user_to_db(state)
             if response_status == 200:
+                # Расписание новой группы загружается заранее, до первого открытия меню
+                schedule_service.refresh(schedule_service.schedule_path(group))
                 await message.answer(
                     _("Добро пожаловать! Ваша группа {group}.").format(group=group)
                 )
@@ -1,6 +1,9 @@
 import re
 import json
-import requests
+from bot.src.api_client import api_client
+from bot.src.identity_cache import identity_cache
+from bot.src.schedule_service import schedule_service
+from bot.src.picker import open_picker, load_picker_page, picker_keyboard, picker_is_empty, picker_item
 
 from aiogram import Router, F
 from aiogram.filters import or_f
@@ -22,6 +25,18 @@ def format_value(value):
     return "-" if value is None else value
 
 
+async def open_lecturers_picker(state: FSMContext, schedule_title: str | None = None):
+    """
+    Открывает список преподавателей пользователя. Для дисциплины из расписания в нем только преподаватели,
+    которые ведут ее по расписанию группы.
+    """
+    state_data = await state.get_data()
+    params = {"user_id": state_data.get("user_id")}
+    if schedule_title is not None:
+        params["schedule_title"] = schedule_title
+    return await open_picker(state, "/get_teachers", params, "teachers", "name")
+
+
 class AddDisciplineStates(StatesGroup):
     adding_discipline = State()
     waiting_for_name = State()
@@ -84,24 +99,17 @@ async def show_confirmation(message: Message, state: FSMContext):
 async def add_discipline_start(message: Message, state: FSMContext):
     await state.set_state(AddDisciplineStates.adding_discipline)
     state_data = await state.get_data()
-    url_req = f"{settings.API_URL}/get_user_id"
-    response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
+    response = await identity_cache.get(state_data.get("telegram_id"))
     if response.status_code == 200:
         await state.update_data(user_id=response.json().get("user_id"))
 
-        url_req = f"{settings.API_URL}/check_is_petrsu_student"
-        response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
-
-        if response.status_code == 200:
-            if response.json().get("is_petrsu_student", True):
-                await message.answer(_("Выбрать дисциплину из расписания или добавить вручную?"),
-                                     reply_markup=kb.add_option())
-            else:
-                await state.update_data(is_from_api=False)
-                await message.answer(_("Введите название дисциплины."))
-                await state.set_state(AddDisciplineStates.waiting_for_name)
+        if response.json().get("is_petrsu_student", True):
+            await message.answer(_("Выбрать дисциплину из расписания или добавить вручную?"),
+                                 reply_markup=kb.add_option())
         else:
-            await message.answer(json.loads(response.text).get('detail'))
+            await state.update_data(is_from_api=False)
+            await message.answer(_("Введите название дисциплины."))
+            await state.set_state(AddDisciplineStates.waiting_for_name)
     else:
         await message.answer(json.loads(response.text).get('detail'))
 
@@ -110,48 +118,44 @@ async def add_discipline_start(message: Message, state: FSMContext):
 async def add_discipline_name(message: Message, state: FSMContext):
     name = message.text
     await state.update_data(name=name)
-    state_data = await state.get_data()
-    url_req = f"{settings.API_URL}/get_teachers"
-    response = requests.get(url_req, json={"user_id": state_data.get("user_id")})
+    response = await open_lecturers_picker(state)
     if response.status_code == 200:
-        response_data = response.json()
-        if len(response_data.get("teachers")) == 0:
+        if await picker_is_empty(state):
             await message.answer(
                 _("Выберите преподавателя, ведущего дисциплину.\n\nПреподавателей не найдено. Пожалуйста, если необходимо, добавьте преподавателя в меню преподавателей."),
                 reply_markup=kb.lecturers_list([], page=0,
                                                state=str(await state.get_state())))
         else:
-            sorted_teachers = sorted(response_data.get("teachers"), key=lambda x: x["name"])
-            lecturers_dict = {teacher["teacher_id"]: teacher["name"] for teacher in sorted_teachers}
-            await state.update_data(lecturers_dict=lecturers_dict)
-            await state.update_data(lecturers=list(lecturers_dict.values()))
-            await state.update_data(lecturers_id=list(lecturers_dict.keys()))
             await message.answer(
                 _("Выберите преподавателя, ведущего дисциплину.\n"),
-                reply_markup=kb.lecturers_list(list(lecturers_dict.values()), page=0, state=str(await state.get_state())))
+                reply_markup=await picker_keyboard(state, kb.lecturers_list, state=str(await state.get_state())))
     await state.set_state(AddDisciplineStates.waiting_for_teacher)
 
 
 @router.callback_query(F.data.startswith("disciplines_lecturers_page_"))
-async def handle_pagination(callback_query: CallbackQuery, state: FSMContext):
+async def handle_lecturers_pagination(callback_query: CallbackQuery, state: FSMContext):
+    response = await load_picker_page(state, int(callback_query.data.split("_")[-1]))
+    if response is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
     await callback_query.answer()
-    state_data = await state.get_data()
-    lecturers = state_data.get("lecturers", [])
-
-    page = int(callback_query.data.split("_")[-1])
-    await state.update_data(current_page=page)
-
-    await callback_query.message.edit_reply_markup(
-        reply_markup=kb.lecturers_list(lecturers, page=page, state=str(await state.get_state()))
-    )
+    if response.status_code == 200:
+        await callback_query.message.edit_reply_markup(
+            reply_markup=await picker_keyboard(state, kb.lecturers_list, state=str(await state.get_state()))
+        )
+    else:
+        await callback_query.message.answer(json.loads(response.text).get('detail'))
 
 
 @router.callback_query(F.data.startswith("disciplines_lecturer_index_"),
                        or_f(AddDisciplineStates.waiting_for_teacher, AddDisciplineStates.waiting_for_new_teacher, EditDisciplineStates.editing_teacher))
 async def get_discipline_teacher(callback_query: CallbackQuery, state: FSMContext):
-    state_data = await state.get_data()
-    await state.update_data(teacher_id=state_data.get("lecturers_id")[int(callback_query.data.split("_")[-1])])
-    await state.update_data(teacher_name=state_data.get("lecturers")[int(callback_query.data.split("_")[-1])])
+    teacher = await picker_item(state, int(callback_query.data.split("_")[-1]))
+    if teacher is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
+    await state.update_data(teacher_id=teacher["teacher_id"])
+    await state.update_data(teacher_name=teacher["name"])
     if await state.get_state() in [AddDisciplineStates.waiting_for_teacher,  AddDisciplineStates.waiting_for_new_teacher]:
         await show_confirmation(callback_query.message, state)
     else:
@@ -164,7 +168,7 @@ async def get_discipline_teacher(callback_query: CallbackQuery, state: FSMContex
         state_data = await state.get_data()
         await state.update_data(editing_value=state_data.get("teacher_id"))
         url_req = f"{settings.API_URL}/edit_discipline"
-        response = requests.post(url_req, json={
+        response = await api_client.post(url_req, json={
             "discipline_id": state_data.get("chosen_discipline_id"),
             "editing_attribute": "teacher_id",
             "editing_value": str(state_data.get("teacher_id"))})
@@ -200,10 +204,10 @@ async def add_discipline_end(callback_query: CallbackQuery, state: FSMContext):
     await callback_query.answer()
     state_data = await state.get_data()
     url_req = f"{settings.API_URL}/add_discipline"
-    response = requests.post(url_req, json={"user_id": state_data.get("user_id"),
-                                            "teacher_id": state_data.get("teacher_id"),
-                                            "name": state_data.get("name"),
-                                            "is_from_API": state_data.get("is_from_api")})
+    response = await api_client.post(url_req, json={"user_id": state_data.get("user_id"),
+                                                    "teacher_id": state_data.get("teacher_id"),
+                                                    "name": state_data.get("name"),
+                                                    "is_from_API": state_data.get("is_from_api")})
     if response.status_code == 200:
         await callback_query.message.edit_text(
             str(__("Дисциплина {name} добавлена.\n\n"
@@ -245,44 +249,12 @@ async def edit_discipline_data(callback_query: CallbackQuery, state: FSMContext)
             await callback_query.message.answer(_("Введите новое название дисциплины."))
             await state.set_state(AddDisciplineStates.waiting_for_new_name)
         case "teacher":
-            url_req = f"{settings.API_URL}/get_teachers"
-            response = requests.get(url_req, json={"user_id": state_data.get("user_id")})
+            schedule_title = state_data.get("name") if state_data.get("is_from_api") else None
+            response = await open_lecturers_picker(state, schedule_title)
             if response.status_code == 200:
-                response_data = response.json()
-                sorted_teachers = sorted(response_data.get("teachers"), key=lambda x: x["name"])
-                lecturers_dict = {teacher["teacher_id"]: teacher["name"] for teacher in sorted_teachers}
-                await state.update_data(lecturers_dict=lecturers_dict)
-                await state.update_data(lecturers=list(lecturers_dict.values()))
-                await state.update_data(lecturers_id=list(lecturers_dict.keys()))
-                if state_data.get("is_from_api"):
-                    schedule_data = state_data.get("schedule_data")
-                    api_lecturers = set()
-                    for day in schedule_data['denominator']:
-                        for lesson in day:
-                            if lesson['title'] == state_data.get("name"):
-                                api_lecturers.add(lesson['lecturer'])
-
-                    for day in schedule_data['numerator']:
-                        for lesson in day:
-                            if lesson['title'] == state_data.get("name"):
-                                api_lecturers.add(lesson['lecturer'])
-                    available_lecturers = [lecturer for lecturer in list(lecturers_dict.values()) if
-                                           lecturer in api_lecturers]
-                    available_lecturers_full = {
-                        teacher_id: name for teacher_id, name in lecturers_dict.items()
-                        if name in api_lecturers
-                    }
-                    await state.update_data(lecturers_dict=available_lecturers_full)
-                    await state.update_data(lecturers=available_lecturers)
-                    await state.update_data(lecturers_id=list(available_lecturers_full.keys()))
-                    await callback_query.message.answer(
-                        _("Выберите преподавателя, ведущего дисциплину."),
-                        reply_markup=kb.lecturers_list(available_lecturers, page=0, state=str(await state.get_state())))
-                    await state.set_state(AddDisciplineStates.waiting_for_new_teacher)
-                else:
-                    await callback_query.message.answer(
-                        _("Выберите преподавателя, ведущего дисциплину."),
-                        reply_markup=kb.lecturers_list(list(lecturers_dict.values()), page=0, state=str(await state.get_state())))
+                await callback_query.message.answer(
+                    _("Выберите преподавателя, ведущего дисциплину."),
+                    reply_markup=await picker_keyboard(state, kb.lecturers_list, state=str(await state.get_state())))
                 await state.set_state(AddDisciplineStates.waiting_for_new_teacher)
             else:
                 await callback_query.message.answer(json.loads(response.text).get('detail'))
@@ -300,7 +272,7 @@ async def request_new_name(message: Message, state: FSMContext):
         prev_val = state_data.get("name")
         await state.update_data(editing_value=name)
         url_req = f"{settings.API_URL}/edit_discipline"
-        response = requests.post(url_req, json={
+        response = await api_client.post(url_req, json={
             "discipline_id": state_data.get("chosen_discipline_id"),
             "editing_attribute": "name",
             "editing_value": name})
@@ -336,102 +308,66 @@ async def show_discipline_api_list(callback_query: CallbackQuery, state: FSMCont
     await callback_query.answer()
 
     state_data = await state.get_data()
-    schedule_data = state_data.get("schedule_data")
-    disciplines = set()
-    for day in schedule_data['denominator']:
-        for lesson in day:
-            disciplines.add(lesson['title'])
-
-    for day in schedule_data['numerator']:
-        for lesson in day:
-            disciplines.add(lesson['title'])
-
-    disciplines_list = sorted(disciplines)
-
-    url_req = f"{settings.API_URL}/get_disciplines"
-    response = requests.get(url_req, json={"user_id": state_data.get("user_id")})
+    # Дисциплины берутся из пар расписания, сохраненных в API
+    await schedule_service.stored_schedule(state_data.get("schedule_group"))
+    response = await open_picker(state, "/get_new_schedule_disciplines", {"user_id": state_data.get("user_id")},
+                                 "disciplines")
     if response.status_code == 200:
-        response_data = response.json()
-        disciplines_names = {discipline["name"] for discipline in response_data.get("disciplines", [])}
-        unique_disciplines = [discipline for discipline in disciplines_list if discipline not in disciplines_names]
-        await state.update_data(disciplines=unique_disciplines)
         await callback_query.message.edit_text(
             _("Список дисциплин"),
-            reply_markup=kb.disciplines_list(unique_disciplines, page=0)
+            reply_markup=await picker_keyboard(state, kb.disciplines_list)
         )
     else:
         await callback_query.message.answer(json.loads(response.text).get('detail'))
 
 
 @router.callback_query(F.data.startswith("disciplines_page_"))
-async def handle_pagination(callback_query: CallbackQuery, state: FSMContext):
+async def handle_disciplines_pagination(callback_query: CallbackQuery, state: FSMContext):
+    response = await load_picker_page(state, int(callback_query.data.split("_")[-1]))
+    if response is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
     await callback_query.answer()
-    state_data = await state.get_data()
-    disciplines = state_data.get("disciplines", [])
-
-    page = int(callback_query.data.split("_")[-1])
-    await state.update_data(current_page=page)
-
-    await callback_query.message.edit_reply_markup(
-        reply_markup=kb.disciplines_list(disciplines, page=page)
-    )
+    if response.status_code == 200:
+        await callback_query.message.edit_reply_markup(
+            reply_markup=await picker_keyboard(state, kb.disciplines_list)
+        )
+    else:
+        await callback_query.message.answer(json.loads(response.text).get('detail'))
 
 
 @router.callback_query(F.data.startswith("discipline_index_"))
 async def add_discipline_by_api_phone(callback_query: CallbackQuery, state: FSMContext):
+    selected_discipline = await picker_item(state, int(callback_query.data.split("_")[-1]))
+    if selected_discipline is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
     await callback_query.answer()
-    state_data = await state.get_data()
-    disciplines = state_data.get("disciplines", [])
-
-    discipline_index = int(callback_query.data.split("_")[-1])
-    selected_discipline = disciplines[discipline_index]
-
-    await state.update_data(name=selected_discipline)
-    await state.update_data(is_from_api=True)
 
     if await state.get_state() != ShowDisciplineStates.showing_list:
-        url_req = f"{settings.API_URL}/get_teachers"
-        response = requests.get(url_req, json={"user_id": state_data.get("user_id")})
+        # В списке из расписания элемент - название дисциплины
+        await state.update_data(name=selected_discipline)
+        await state.update_data(is_from_api=True)
+        response = await open_lecturers_picker(state, selected_discipline)
         if response.status_code == 200:
-            response_data = response.json()
-            sorted_teachers = sorted(response_data.get("teachers"), key=lambda x: x["name"])
-            lecturers_dict = {teacher["teacher_id"]: teacher["name"] for teacher in sorted_teachers}
-            schedule_data = state_data.get("schedule_data")
-            api_lecturers = set()
-            for day in schedule_data['denominator']:
-                for lesson in day:
-                    if lesson['title'] == selected_discipline:
-                        api_lecturers.add(lesson['lecturer'])
-
-            for day in schedule_data['numerator']:
-                for lesson in day:
-                    if lesson['title'] == selected_discipline:
-                        api_lecturers.add(lesson['lecturer'])
-            available_lecturers = [lecturer for lecturer in list(lecturers_dict.values()) if lecturer in api_lecturers]
-            available_lecturers_full = {
-                teacher_id: name for teacher_id, name in lecturers_dict.items()
-                if name in api_lecturers
-            }
-            await state.update_data(lecturers_dict=available_lecturers_full)
-            await state.update_data(lecturers=available_lecturers)
-            await state.update_data(lecturers_id=list(available_lecturers_full.keys()))
             await callback_query.message.edit_text(
                 _("Выберите преподавателя, ведущего дисциплину.\n"),
-                reply_markup=kb.lecturers_list(available_lecturers, page=0, state=str(await state.get_state())))
+                reply_markup=await picker_keyboard(state, kb.lecturers_list, state=str(await state.get_state())))
         await state.set_state(AddDisciplineStates.waiting_for_teacher)
 
     elif await state.get_state() == ShowDisciplineStates.showing_list:
+        await state.update_data(name=selected_discipline["name"])
+        await state.update_data(is_from_api=True)
         url_req = f"{settings.API_URL}/get_discipline"
-        response = requests.get(url_req,
-                                json={"discipline_id": state_data.get("disciplines_id")[int(discipline_index)]})
+        response = await api_client.get(url_req, json={"discipline_id": selected_discipline["discipline_id"]})
         if response.status_code == 200:
             discipline_data = response.json()
-            await state.update_data(chosen_discipline_id=state_data.get("disciplines_id")[int(discipline_index)])
+            await state.update_data(chosen_discipline_id=selected_discipline["discipline_id"])
             await state.update_data(chosen_discipline_name=discipline_data.get("name"))
             url_req = f"{settings.API_URL}/get_teacher_name"
             if discipline_data.get("teacher_id") is not None:
-                response = requests.get(url_req,
-                                        json={"teacher_id": discipline_data.get("teacher_id")})
+                response = await api_client.get(url_req,
+                                                json={"teacher_id": discipline_data.get("teacher_id")})
                 if response.status_code == 200:
                     teacher_data = response.json()
                     await state.update_data(chosen_discipline_teacher=teacher_data.get("name"))
@@ -466,24 +402,16 @@ async def show_discipline_list(message: Message, state: FSMContext):
     await state.set_state(ShowDisciplineStates.showing_list)
 
     state_data = await state.get_data()
-    url_req = f"{settings.API_URL}/get_user_id"
-    response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
+    response = await identity_cache.get(state_data.get("telegram_id"))
 
     if response.status_code == 200:
         user_id = response.json().get("user_id")
         await state.update_data(user_id=user_id)
-        url_req = f"{settings.API_URL}/get_disciplines"
-        response = requests.get(url_req, json={"user_id": user_id})
+        response = await open_picker(state, "/get_disciplines", {"user_id": user_id}, "disciplines", "name")
         if response.status_code == 200:
-            response_data = response.json()
-            sorted_disciplines = sorted(response_data.get("disciplines"), key=lambda x: x["name"])
-            disciplines_dict = {discipline["discipline_id"]: discipline["name"] for discipline in sorted_disciplines}
-            await state.update_data(disciplines_dict=disciplines_dict)
-            await state.update_data(disciplines=list(disciplines_dict.values()))
-            await state.update_data(disciplines_id=list(disciplines_dict.keys()))
             await message.answer(
                 _("Список дисциплин"),
-                reply_markup=kb.disciplines_list(list(disciplines_dict.values()), page=0)
+                reply_markup=await picker_keyboard(state, kb.disciplines_list)
             )
         else:
             await message.answer(json.loads(response.text).get('detail'))
@@ -501,7 +429,7 @@ async def edit_discipline(callback_query: CallbackQuery, state: FSMContext):
     )
     state_data = await state.get_data()
     url_req = f"{settings.API_URL}/get_discipline_api_status"
-    response = requests.get(url_req, json={"discipline_id": state_data.get("chosen_discipline_id")})
+    response = await api_client.get(url_req, json={"discipline_id": state_data.get("chosen_discipline_id")})
     if response.status_code == 200:
         response_data = response.json()
         api_status = response_data.get("is_from_API")
@@ -536,48 +464,13 @@ async def edit_discipline_data(callback_query: CallbackQuery, state: FSMContext)
                                                 reply_markup=kb.cancel_editing_attr())
             await state.set_state(EditDisciplineStates.editing_name)
         case "teacher":
-            url_req = f"{settings.API_URL}/get_teachers"
-            response = requests.get(url_req, json={"user_id": state_data.get("user_id")})
+            schedule_title = state_data.get("name") if state_data.get("chosen_discipline_api_status") else None
+            response = await open_lecturers_picker(state, schedule_title)
             await state.set_state(EditDisciplineStates.editing_teacher)
             if response.status_code == 200:
-                response_data = response.json()
-                sorted_teachers = sorted(response_data.get("teachers"), key=lambda x: x["name"])
-                lecturers_dict = {teacher["teacher_id"]: teacher["name"] for teacher in sorted_teachers}
-                await state.update_data(lecturers_dict=lecturers_dict)
-                await state.update_data(lecturers=list(lecturers_dict.values()))
-                await state.update_data(lecturers_id=list(lecturers_dict.keys()))
-
-                if state_data.get("chosen_discipline_api_status"):
-                    schedule_data = state_data.get("schedule_data")
-                    api_lecturers = set()
-                    for day in schedule_data['denominator']:
-                        for lesson in day:
-                            if lesson['title'] == state_data.get("name"):
-                                api_lecturers.add(lesson['lecturer'])
-
-                    for day in schedule_data['numerator']:
-                        for lesson in day:
-                            if lesson['title'] == state_data.get("name"):
-                                api_lecturers.add(lesson['lecturer'])
-                    available_lecturers = [lecturer for lecturer in list(lecturers_dict.values()) if
-                                           lecturer in api_lecturers]
-                    available_lecturers_full = {
-                        teacher_id: name for teacher_id, name in lecturers_dict.items()
-                        if name in api_lecturers
-                    }
-                    await state.update_data(lecturers_dict=available_lecturers_full)
-                    await state.update_data(lecturers=available_lecturers)
-                    await state.update_data(lecturers_id=list(available_lecturers_full.keys()))
-                    await state.set_state(EditDisciplineStates.editing_teacher)
-                    await callback_query.message.answer(
-                        _("Выберите другого преподавателя, ведущего дисциплину."),
-                        reply_markup=kb.lecturers_list(available_lecturers, page=0, state=str(await state.get_state())))
-                else:
-                    await state.set_state(EditDisciplineStates.editing_teacher)
-                    await callback_query.message.answer(
-                        _("Выберите другого преподавателя, ведущего дисциплину."),
-                        reply_markup=kb.lecturers_list(list(lecturers_dict.values()),
-                                                       page=0, state=str(await state.get_state())))
+                await callback_query.message.answer(
+                    _("Выберите другого преподавателя, ведущего дисциплину."),
+                    reply_markup=await picker_keyboard(state, kb.lecturers_list, state=str(await state.get_state())))
             else:
                 await callback_query.message.answer(json.loads(response.text).get('detail'))
 
@@ -645,7 +538,7 @@ async def confirm_deleting(callback_query: CallbackQuery, state: FSMContext):
     await callback_query.answer()
     state_data = await state.get_data()
     url_req = f"{settings.API_URL}/delete_discipline"
-    response = requests.delete(url_req, json={"discipline_id": state_data.get("chosen_discipline_id")})
+    response = await api_client.delete(url_req, json={"discipline_id": state_data.get("chosen_discipline_id")})
     if response.status_code == 200:
         await callback_query.message.bot.delete_message(
             chat_id=callback_query.message.chat.id,
@@ -1,15 +1,21 @@
-import base64
+import os
 import re
 import json
+import tempfile
 
-import requests
-from datetime import datetime, timedelta
+from bot.src.api_client import api_client
+from bot.src.identity_cache import identity_cache
+from bot.src.discipline_names import load_discipline_names
+from bot.src.upload_spool import upload_spool
+from bot.src.picker import open_picker, load_picker_page, picker_keyboard, picker_is_empty, picker_item
+from datetime import date, datetime, timedelta
 
 from aiogram import Router, F, Bot
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import or_f
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
-from aiogram.types import Message, CallbackQuery, BufferedInputFile
+from aiogram.types import Message, CallbackQuery, FSInputFile
 
 from aiogram.utils.i18n import gettext as _
 from aiogram.utils.i18n import lazy_gettext as __
@@ -24,11 +30,125 @@ from bot.src.deepseek import create_answer
 
 router = Router()
 
+LABS_PAGE_SIZE = 5
+
 
 def format_value(value):
     return "-" if value is None else value
 
 
+def format_date(value):
+    return date.fromisoformat(value).strftime("%d.%m.%Y")
+
+
+async def fetch_labs(user_id, **filters):
+    """
+    Запрашивает задания пользователя, отобранные и отсортированные по сроку сдачи на стороне API.
+    Возвращает страницу (задания и курсор следующей страницы) и ответ сервера, при ошибке страница равна None.
+    """
+    url_req = f"{settings.API_URL}/get_labs"
+    response = await api_client.get(url_req, json={"user_id": user_id, **filters})
+    if response.status_code != 200:
+        return None, response
+    return response.json(), response
+
+
+def lab_list_text(lab_list, labs, disciplines_dict, page):
+    match lab_list["view"]:
+        case "discipline":
+            discipline_name = disciplines_dict[lab_list["discipline_id"]]
+            if not labs:
+                return f"Заданий по дисциплине {discipline_name} не найдено.\n\n"
+            info_string = f"Задания по дисциплине {discipline_name}\n\n"
+            for lab in labs:
+                info_string += __(f'{lab["name"]}\n' +
+                                  __(f'Дата начала: {format_date(lab["start_date"])}\n') +
+                                  __(f'Срок сдачи: {format_date(lab["end_date"])}\n') +
+                                  __(f'Статус: <b>{lab["status"]}</b>\n\n'))
+            return info_string
+        case "status":
+            status_value = Status[lab_list["status"]].value
+            if not labs:
+                return f"Заданий со статусом {status_value} не найдено.\n\n"
+            info_string = f"Задания со статусом: {status_value}\n\n"
+            for lab in labs:
+                info_string += __(f'Дисциплина: {disciplines_dict[lab["discipline_id"]]}\n' +
+                                  __(f'{lab["name"]}\n') +
+                                  __(f'Дата начала: {format_date(lab["start_date"])}\n') +
+                                  __(f'Срок сдачи: {format_date(lab["end_date"])}\n\n'))
+            return info_string
+        case "week":
+            if not labs:
+                return __(f"Заданий не найдено.\n\n")
+            today = datetime.now().date()
+            filtered_lab_list_undone = [lab for lab in labs
+                                        if lab["status"] != 'Сдано' and date.fromisoformat(lab["end_date"]) < today]
+            filtered_lab_list_process = [lab for lab in labs if lab not in filtered_lab_list_undone]
+            info_string_undone = ""
+            info_string_process = ""
+            if filtered_lab_list_undone:
+                info_string_undone = __(f"<b>Просроченные задания:</b>\n\n")
+                for lab in filtered_lab_list_undone:
+                    info_string_undone += __(f'Дисциплина: {disciplines_dict[lab["discipline_id"]]}\n' +
+                                             __(f'{lab["name"]}\n') +
+                                             __(f'Дата начала: {format_date(lab["start_date"])}\n') +
+                                             __(f'Срок сдачи: {format_date(lab["end_date"])}\n') +
+                                             __(f'Статус: <b>{lab["status"]}</b>\n\n'))
+            elif page == 0:
+                info_string_undone = __(f"<b>Просроченных заданий не найдено.</b>\n\n")
+            if filtered_lab_list_process:
+                info_string_process = __(f"<b>Предстоящие задания на следующие 7 дней:</b>\n\n")
+                for lab in filtered_lab_list_process:
+                    info_string_process += __(f'Дисциплина: {disciplines_dict[lab["discipline_id"]]}\n' +
+                                              __(f'{lab["name"]}\n') +
+                                              __(f'Дата начала: {format_date(lab["start_date"])}\n') +
+                                              __(f'Срок сдачи: {format_date(lab["end_date"])}\n') +
+                                              __(f'Статус: <b>{lab["status"]}</b>\n\n'))
+            elif page == 0:
+                info_string_process = __(f"<b>Заданий на ближайшие 7 дней не найдено.</b>\n\n")
+            return info_string_undone + info_string_process
+
+
+async def show_labs_page(message: Message, state: FSMContext, page, edit):
+    """
+    Запрашивает у API одну страницу списка заданий и показывает ее. Параметры списка и курсоры
+    уже открытых страниц хранятся в состоянии в lab_list, в labs - только задания текущей страницы.
+    """
+    state_data = await state.get_data()
+    lab_list = state_data.get("lab_list")
+    cursors = lab_list["cursors"]
+
+    labs_page, response = await fetch_labs(state_data.get("user_id"), **lab_list["filters"],
+                                           limit=LABS_PAGE_SIZE, cursor=cursors[page])
+    if labs_page is None:
+        await message.answer(json.loads(response.text).get('detail'))
+        return
+    next_cursor = labs_page["next_cursor"]
+    if next_cursor is not None and len(cursors) == page + 1:
+        cursors.append(next_cursor)
+    labs = labs_page["labs"]
+    await state.update_data(labs=labs, lab_list=lab_list, current_page=page)
+
+    response = await load_discipline_names(state, [lab["discipline_id"] for lab in labs])
+    if response is not None and response.status_code != 200:
+        await message.answer(json.loads(response.text).get('detail'))
+        return
+    disciplines_dict = (await state.get_data()).get("disciplines_dict")
+    info_string = lab_list_text(lab_list, labs, disciplines_dict, page)
+    reply_markup = kb.labs_list(labs, disciplines_dict, lab_list["view"] != "discipline", page=page,
+                                has_next=next_cursor is not None)
+    if edit:
+        await message.edit_text(info_string, reply_markup=reply_markup)
+    else:
+        await message.answer(info_string, reply_markup=reply_markup)
+
+
+async def start_lab_list(message: Message, state: FSMContext, lab_list):
+    lab_list["cursors"] = [None]
+    await state.update_data(lab_list=lab_list)
+    await show_labs_page(message, state, 0, False)
+
+
 class AddLabStates(StatesGroup):
     adding_lab = State()
     waiting_for_discipline = State()
@@ -115,64 +235,40 @@ async def show_lab_confirmation(message: Message, state: FSMContext, bot: Bot =
     if state_data.get("files"):
         for file_info in state_data["files"]:
             try:
-                file_id = file_info['file_id']
-                if file_info['file_type'] == 'document':
-                    await bot.send_document(
-                        chat_id=message.chat.id,
-                        document=file_id
-                    )
-                elif file_info['file_type'] == 'photo':
-                    await bot.send_photo(
-                        chat_id=message.chat.id,
-                        photo=file_id
-                    )
-                elif file_info['file_type'] == 'video':
-                    await bot.send_video(
-                        chat_id=message.chat.id,
-                        video=file_id,
-                        supports_streaming=True
-                    )
-                elif file_info['file_type'] == 'audio':
-                    await bot.send_audio(
-                        chat_id=message.chat.id,
-                        audio=file_id,
-                    )
+                await send_lab_file(message.chat.id, file_info['file_type'], file_info['file_id'])
             except Exception as e:
                 await message.answer(
                     _("Не удалось отправить файл.").format(error=str(e))
                 )
 
 
+async def open_disciplines_picker(state: FSMContext):
+    state_data = await state.get_data()
+    return await open_picker(state, "/get_disciplines", {"user_id": state_data.get("user_id")}, "disciplines", "name")
+
+
 @router.message(F.text == __("Добавить задание"))
 async def add_lab_start(message: Message, state: FSMContext):
     await state.set_state(AddLabStates.adding_lab)
     state_data = await state.get_data()
 
-    url_req = f"{settings.API_URL}/get_user_id"
-    response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
+    response = await identity_cache.get(state_data.get("telegram_id"))
 
     if response.status_code == 200:
         user_id = response.json().get("user_id")
         await state.update_data(user_id=user_id)
 
-        url_req = f"{settings.API_URL}/get_disciplines"
-        response = requests.get(url_req, json={"user_id": user_id})
+        response = await open_disciplines_picker(state)
 
         if response.status_code == 200:
-            disciplines = response.json().get("disciplines", [])
-            if len(disciplines) == 0:
+            if await picker_is_empty(state):
                 await message.answer(
                     _("Дисциплин не найдено. Пожалуйста, добавьте дисциплины в меню дисциплин."))
                 return
-            sorted_disciplines = sorted(disciplines, key=lambda x: x["name"])
-            disciplines_dict = {d["discipline_id"]: d["name"] for d in sorted_disciplines}
-            await state.update_data(disciplines_dict=disciplines_dict)
-            await state.update_data(disciplines=list(disciplines_dict.values()))
-            await state.update_data(disciplines_id=list(disciplines_dict.keys()))
 
             await message.answer(
                 _("Выберите дисциплину для задания."),
-                reply_markup=kb.disciplines_list(list(disciplines_dict.values()), page=0))
+                reply_markup=await picker_keyboard(state, kb.disciplines_list))
             await state.set_state(AddLabStates.waiting_for_discipline)
         else:
             await message.answer(json.loads(response.text).get('detail'))
@@ -184,31 +280,39 @@ async def add_lab_start(message: Message, state: FSMContext):
                        or_f(AddLabStates.waiting_for_discipline, AddLabStates.waiting_for_new_discipline,
                             ShowLabStates.showing_list, EditLabStates.editing_discipline))
 async def handle_disciplines_pagination(callback_query: CallbackQuery, state: FSMContext):
+    response = await load_picker_page(state, int(callback_query.data.split("_")[-1]))
+    if response is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
     await callback_query.answer()
-    state_data = await state.get_data()
-    disciplines = state_data.get("disciplines", [])
-
-    page = int(callback_query.data.split("_")[-1])
-    await state.update_data(current_page=page)
-
-    await callback_query.message.edit_reply_markup(
-        reply_markup=kb.disciplines_list(disciplines, page=page)
-    )
+    if response.status_code == 200:
+        await callback_query.message.edit_reply_markup(
+            reply_markup=await picker_keyboard(state, kb.disciplines_list)
+        )
+    else:
+        await callback_query.message.answer(json.loads(response.text).get('detail'))
 
 
 @router.callback_query(F.data.startswith("lab_discipline_index_"),
                        or_f(AddLabStates.waiting_for_discipline, AddLabStates.waiting_for_new_discipline,
                             ShowLabStates.showing_list, EditLabStates.editing_discipline))
 async def select_discipline(callback_query: CallbackQuery, state: FSMContext):
+    discipline = await picker_item(state, int(callback_query.data.split("_")[-1]))
+    if discipline is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
     await callback_query.answer()
     state_data = await state.get_data()
-    discipline_index = int(callback_query.data.split("_")[-1])
 
-    discipline_id = state_data.get("disciplines_id")[discipline_index]
-    discipline_name = state_data.get("disciplines")[discipline_index]
+    discipline_id = discipline["discipline_id"]
+    discipline_name = discipline["name"]
+    # Название выбранной дисциплины нужно для подписи задания в меню и списке
+    disciplines_dict = state_data.get("disciplines_dict") or {}
+    disciplines_dict[discipline_id] = discipline_name
 
     await state.update_data(discipline_id=discipline_id)
     await state.update_data(discipline_name=discipline_name)
+    await state.update_data(disciplines_dict=disciplines_dict)
 
     await callback_query.message.edit_reply_markup(
         reply_markup=None
@@ -221,34 +325,15 @@ async def select_discipline(callback_query: CallbackQuery, state: FSMContext):
     elif await state.get_state() == AddLabStates.waiting_for_new_discipline:
         await show_lab_confirmation(callback_query.message, state)
     elif await state.get_state() == ShowLabStates.showing_list:
-        labs_data = state_data.get("labs_response")
-        disciplines_dict = state_data.get("disciplines_dict")
-        await state.update_data(show_abb=False)
-        filtered_lab_list = []
-        for lab in labs_data["labs"]:
-            if lab["discipline_id"] == discipline_id:
-                filtered_lab_list.append(lab)
-        filtered_lab_list.sort(key=lambda x: datetime.strptime(x["end_date"], "%Y-%m-%d"))
-        await state.update_data(labs=filtered_lab_list)
-
-        if filtered_lab_list:
-            info_string = f"Задания по дисциплине {disciplines_dict[discipline_id]}\n\n"
-            for lab in filtered_lab_list:
-                info_string += __(f'{lab["name"]}\n' +
-                                  __(f'Дата начала: {datetime.strptime(lab["start_date"], "%Y-%m-%d").strftime("%d.%m.%Y")}\n') +
-                                  __(f'Срок сдачи: {datetime.strptime(lab["end_date"], "%Y-%m-%d").strftime("%d.%m.%Y")}\n') +
-                                  __(f'Статус: <b>{lab["status"]}</b>\n\n'))
-        else:
-            info_string = f"Заданий по дисциплине {disciplines_dict[discipline_id]} не найдено.\n\n"
-        await callback_query.message.answer(
-            info_string,
-            reply_markup=kb.labs_list(filtered_lab_list, disciplines_dict, False, page=0))
+        await start_lab_list(callback_query.message, state,
+                             {"view": "discipline", "discipline_id": discipline_id,
+                              "filters": {"discipline_id": discipline_id}})
     elif await state.get_state() == EditLabStates.editing_discipline:
         chosen_lab = state_data.get("chosen_lab")
         url_req = f"{settings.API_URL}/edit_lab"
-        response = requests.post(url_req, json={"task_id": chosen_lab["task_id"],
-                                                "editing_attribute": "discipline_id",
-                                                "editing_value": str(discipline_id)})
+        response = await api_client.post(url_req, json={"task_id": chosen_lab["task_id"],
+                                                        "editing_attribute": "discipline_id",
+                                                        "editing_value": str(discipline_id)})
         if response.status_code == 200:
             await callback_query.message.answer(
                 _("Дисциплина успешно изменена на {discipline_name}.").format(discipline_name=discipline_name))
@@ -274,9 +359,9 @@ async def get_lab_name(message: Message, state: FSMContext):
     elif await state.get_state() == EditLabStates.editing_name:
         chosen_lab = state_data.get("chosen_lab")
         url_req = f"{settings.API_URL}/edit_lab"
-        response = requests.post(url_req, json={"task_id": chosen_lab["task_id"],
-                                                "editing_attribute": "name",
-                                                "editing_value": name})
+        response = await api_client.post(url_req, json={"task_id": chosen_lab["task_id"],
+                                                        "editing_attribute": "name",
+                                                        "editing_value": name})
         if response.status_code == 200:
             await message.answer(
                 _("Название успешно изменено на {name}.").format(name=name))
@@ -303,9 +388,9 @@ async def get_lab_description(message: Message, state: FSMContext):
     elif await state.get_state() == EditLabStates.editing_description:
         chosen_lab = state_data.get("chosen_lab")
         url_req = f"{settings.API_URL}/edit_lab"
-        response = requests.post(url_req, json={"task_id": chosen_lab["task_id"],
-                                                "editing_attribute": "task_text",
-                                                "editing_value": description})
+        response = await api_client.post(url_req, json={"task_id": chosen_lab["task_id"],
+                                                        "editing_attribute": "task_text",
+                                                        "editing_value": description})
         if response.status_code == 200:
             await message.answer(
                 _("Текст задания успешно изменен."))
@@ -343,6 +428,7 @@ async def get_lab_file(message: Message, state: FSMContext, bot: Bot = bot_unit)
             await state.get_state() == AddLabStates.waiting_for_new_files or await state.get_state() == EditLabStates.editing_files) and \
             (state_data.get("is_editing_files") is False or state_data.get("is_editing_files") is None):
         await state.update_data(is_editing_files=True)
+        upload_spool.discard([file_info["file_handle"] for file_info in state_data.get("files") or []])
         await state.update_data(files=[])
 
     max_file_size = 50 * 1024 * 1024
@@ -357,13 +443,13 @@ async def get_lab_file(message: Message, state: FSMContext, bot: Bot = bot_unit)
 
         file_type = 'document'
         file = await bot.get_file(document.file_id)
-        file_data = await bot.download_file(file.file_path)
-        file_bytes = file_data.read()
+        file_handle = await upload_spool.save(bot, file.file_path)
 
         file_info = {
             'file_id': document.file_id,
+            'file_unique_id': document.file_unique_id,
             'file_name': document.file_name or "Без названия",
-            'file_data': file_bytes,
+            'file_handle': file_handle,
             'file_type': file_type,
             'mime_type': document.mime_type
         }
@@ -381,13 +467,13 @@ async def get_lab_file(message: Message, state: FSMContext, bot: Bot = bot_unit)
             return
 
         file = await bot.get_file(photo.file_id)
-        file_data = await bot.download_file(file.file_path)
-        file_bytes = file_data.read()
+        file_handle = await upload_spool.save(bot, file.file_path)
 
         file_info = {
             'file_id': photo.file_id,
+            'file_unique_id': photo.file_unique_id,
             'file_name': f"photo_{message.message_id}.jpg" or "Без названия",
-            'file_data': file_bytes,
+            'file_handle': file_handle,
             'file_type': 'photo',
             'mime_type': 'image/jpeg'
         }
@@ -405,13 +491,13 @@ async def get_lab_file(message: Message, state: FSMContext, bot: Bot = bot_unit)
             return
 
         file = await bot.get_file(audio.file_id)
-        file_data = await bot.download_file(file.file_path)
-        file_bytes = file_data.read()
+        file_handle = await upload_spool.save(bot, file.file_path)
 
         file_info = {
             'file_id': audio.file_id,
+            'file_unique_id': audio.file_unique_id,
             'file_name': audio.file_name or f"audio_{audio.file_id}.mp3",
-            'file_data': file_bytes,
+            'file_handle': file_handle,
             'file_type': 'audio',
             'mime_type': audio.mime_type or 'audio/mpeg'
         }
@@ -427,13 +513,13 @@ async def get_lab_file(message: Message, state: FSMContext, bot: Bot = bot_unit)
             await message.answer(_("Файл слишком большой. Максимальный размер - 50 МБ."))
             return
         file = await bot.get_file(video.file_id)
-        file_data = await bot.download_file(file.file_path)
-        file_bytes = file_data.read()
+        file_handle = await upload_spool.save(bot, file.file_path)
 
         file_info = {
             'file_id': video.file_id,
+            'file_unique_id': video.file_unique_id,
             'file_name': video.file_name or f"video_{message.message_id}.mp4",
-            'file_data': file_bytes,
+            'file_handle': file_handle,
             'file_type': 'video',
             'mime_type': video.mime_type or 'video/mp4'
         }
@@ -455,6 +541,54 @@ async def get_lab_file(message: Message, state: FSMContext, bot: Bot = bot_unit)
             await message.answer(_("Произошла ошибка при загрузке файла: {error}").format(error=str(e)))
 
 
+async def send_lab_file(chat_id, file_type, file, bot: Bot = bot_unit):
+    """
+    Отправляет файл задания методом, соответствующим его типу. file - идентификатор Telegram или InputFile.
+    """
+    if file_type == 'document':
+        return await bot.send_document(
+            chat_id=chat_id,
+            document=file
+        )
+    elif file_type == 'photo':
+        return await bot.send_photo(
+            chat_id=chat_id,
+            photo=file
+        )
+    elif file_type == 'video':
+        return await bot.send_video(
+            chat_id=chat_id,
+            video=file,
+            supports_streaming=True
+        )
+    elif file_type == 'audio':
+        return await bot.send_audio(
+            chat_id=chat_id,
+            audio=file,
+        )
+
+
+def get_message_file(sent_message: Message, file_type):
+    if file_type == 'photo':
+        return sent_message.photo[-1]
+    return getattr(sent_message, file_type)
+
+
+async def upload_lab_file(task_id, file_info):
+    """
+    Передает содержимое файла из временного хранилища в API телом запроса, без кодирования в base64.
+    """
+    url_req = f"{settings.API_URL}/upload_file"
+    with upload_spool.open(file_info["file_handle"]) as file_data:
+        return await api_client.post(url_req,
+                                     params={"task_id": task_id,
+                                             "file_name": file_info["file_name"],
+                                             "file_type": file_info["file_type"],
+                                             "telegram_file_id": file_info["file_id"],
+                                             "telegram_file_unique_id": file_info["file_unique_id"]},
+                                     data=file_data)
+
+
 @router.callback_query(F.data == "finish_files",
                        or_f(AddLabStates.waiting_for_files, AddLabStates.waiting_for_new_files,
                             EditLabStates.editing_files))
@@ -476,19 +610,12 @@ async def finish_files(callback_query: CallbackQuery, state: FSMContext):
     elif await state.get_state() == EditLabStates.editing_files:
         chosen_lab = state_data.get("chosen_lab")
         url_req = f"{settings.API_URL}/delete_files"
-        response = requests.delete(url_req, json={"task_id": chosen_lab["task_id"]})
+        response = await api_client.delete(url_req, json={"task_id": chosen_lab["task_id"]})
         if response.status_code == 200:
             flag = True
             if state_data.get("files"):
                 for file_info in state_data["files"]:
-                    url_req = f"{settings.API_URL}/add_file"
-                    file_data = {
-                        "task_id": chosen_lab["task_id"],
-                        "file_name": file_info["file_name"],
-                        "file_data": base64.b64encode(file_info["file_data"]).decode('utf-8'),
-                        "file_type": file_info["file_type"],
-                    }
-                    response = requests.post(url_req, json=file_data)
+                    response = await upload_lab_file(chosen_lab["task_id"], file_info)
                     if response.status_code != 200:
                         flag = False
                         response_data = response.json()
@@ -500,11 +627,12 @@ async def finish_files(callback_query: CallbackQuery, state: FSMContext):
                         #         "file_data": base64.b64encode(file_info["file_data"]).decode('utf-8'),
                         #         "file_type": file_info["file_type"],
                         #     }
-                        #     response = requests.post(url_req, json=file_data)
+                        #     response = await api_client.post(url_req, json=file_data)
             if flag:
                 await callback_query.message.answer(
                     _("Файлы успешно заменены."))
                 await state.set_state(ShowLabStates.showing_chosen_lab)
+                upload_spool.discard([file_info["file_handle"] for file_info in state_data.get("files") or []])
                 await state.update_data(files=[])
                 await show_chosen_lab_menu(callback_query.message, state, True)
             else:
@@ -532,9 +660,9 @@ async def get_lab_link(message: Message, state: FSMContext):
     elif await state.get_state() == EditLabStates.editing_link:
         chosen_lab = state_data.get("chosen_lab")
         url_req = f"{settings.API_URL}/edit_lab"
-        response = requests.post(url_req, json={"task_id": chosen_lab["task_id"],
-                                                "editing_attribute": "task_link",
-                                                "editing_value": link})
+        response = await api_client.post(url_req, json={"task_id": chosen_lab["task_id"],
+                                                        "editing_attribute": "task_link",
+                                                        "editing_value": link})
         if response.status_code == 200:
             await message.answer(
                 _("Ссылка успешно изменена на {link}.").format(link=link))
@@ -641,9 +769,9 @@ async def select_start_date(callback: CallbackQuery, state: FSMContext):
     elif await state.get_state() == EditLabStates.editing_start_date:
         chosen_lab = state_data.get("chosen_lab")
         url_req = f"{settings.API_URL}/edit_lab"
-        response = requests.post(url_req, json={"task_id": chosen_lab["task_id"],
-                                                "editing_attribute": "start_date",
-                                                "editing_value": start_date.strftime("%Y-%m-%d")})
+        response = await api_client.post(url_req, json={"task_id": chosen_lab["task_id"],
+                                                        "editing_attribute": "start_date",
+                                                        "editing_value": start_date.strftime("%Y-%m-%d")})
         if response.status_code == 200:
             await callback.message.answer(
                 _("Дата начала успешно изменена на {start_date}.").format(start_date=start_date.strftime("%d.%m.%Y")))
@@ -698,9 +826,9 @@ async def select_end_date(callback: CallbackQuery, state: FSMContext):
     elif await state.get_state() == EditLabStates.editing_end_date:
         chosen_lab = state_data.get("chosen_lab")
         url_req = f"{settings.API_URL}/edit_lab"
-        response = requests.post(url_req, json={"task_id": chosen_lab["task_id"],
-                                                "editing_attribute": "end_date",
-                                                "editing_value": end_date.strftime("%Y-%m-%d")})
+        response = await api_client.post(url_req, json={"task_id": chosen_lab["task_id"],
+                                                        "editing_attribute": "end_date",
+                                                        "editing_value": end_date.strftime("%Y-%m-%d")})
         if response.status_code == 200:
             await callback.message.answer(
                 _("Дата сдачи успешно изменена на {end_date}").format(end_date=end_date.strftime("%d.%m.%Y")))
@@ -721,9 +849,9 @@ async def get_additional_info(message: Message, state: FSMContext):
     else:
         chosen_lab = state_data.get("chosen_lab")
         url_req = f"{settings.API_URL}/edit_lab"
-        response = requests.post(url_req, json={"task_id": chosen_lab["task_id"],
-                                                "editing_attribute": "extra_info",
-                                                "editing_value": additional_info})
+        response = await api_client.post(url_req, json={"task_id": chosen_lab["task_id"],
+                                                        "editing_attribute": "extra_info",
+                                                        "editing_value": additional_info})
         if response.status_code == 200:
             await message.answer(
                 _("Дополнительная информация успешно изменена."))
@@ -763,7 +891,7 @@ async def confirm_lab(callback_query: CallbackQuery, state: FSMContext):
         "status": "not_started"
     }
     url_req = f"{settings.API_URL}/add_lab"
-    response = requests.post(url_req, json=lab_data)
+    response = await api_client.post(url_req, json=lab_data)
 
     if response.status_code == 200:
         await state.update_data(task_id=str(response.json()["task_id"]))
@@ -771,16 +899,12 @@ async def confirm_lab(callback_query: CallbackQuery, state: FSMContext):
         flag = True
         if state_data.get("files"):
             for file_info in state_data["files"]:
-                url_req = f"{settings.API_URL}/add_file"
-                file_data = {
-                    "task_id": state_data.get("task_id"),
-                    "file_name": file_info["file_name"],
-                    "file_data": base64.b64encode(file_info["file_data"]).decode('utf-8'),
-                    "file_type": file_info["file_type"],
-                }
-                response = requests.post(url_req, json=file_data)
+                response = await upload_lab_file(state_data.get("task_id"), file_info)
                 if response.status_code != 200:
                     flag = False
+            # При ошибке файлы добавляются заново из меню задания, поэтому временные копии больше не нужны
+            upload_spool.discard([file_info["file_handle"] for file_info in state_data["files"]])
+            await state.update_data(files=[])
         if flag:
             await callback_query.message.answer(
                 _("Задание {name} со статусом 'Не начато' для дисциплины {discipline} успешно добавлено. Если необходимо, измените статус в меню заданий.").format(
@@ -826,12 +950,14 @@ async def edit_lab_data(callback_query: CallbackQuery, state: FSMContext):
 
     match field:
         case "discipline":
-            state_data = await state.get_data()
-            disciplines_dict = state_data.get("disciplines_dict")
-            await callback_query.message.answer(
-                _("Выберите новую дисциплину для задания."),
-                reply_markup=kb.disciplines_list(list(disciplines_dict.values()), page=0))
-            await state.set_state(AddLabStates.waiting_for_new_discipline)
+            response = await open_disciplines_picker(state)
+            if response.status_code == 200:
+                await callback_query.message.answer(
+                    _("Выберите новую дисциплину для задания."),
+                    reply_markup=await picker_keyboard(state, kb.disciplines_list))
+                await state.set_state(AddLabStates.waiting_for_new_discipline)
+            else:
+                await callback_query.message.answer(json.loads(response.text).get('detail'))
         case "name":
             await callback_query.message.answer(_("Введите новое название задания."))
             await state.set_state(AddLabStates.waiting_for_new_name)
@@ -870,34 +996,15 @@ async def show_lab_list(message: Message, state: FSMContext):
     await state.set_state(ShowLabStates.showing_list)
 
     state_data = await state.get_data()
-    url_req = f"{settings.API_URL}/get_user_id"
-    response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
+    response = await identity_cache.get(state_data.get("telegram_id"))
 
     if response.status_code == 200:
-        user_id = response.json().get("user_id")
-        await state.update_data(user_id=user_id)
-        url_req = f"{settings.API_URL}/get_labs"
-        response = requests.get(url_req, json={"user_id": user_id})
-        if response.status_code == 200:
-            response_data = response.json()
-            await state.update_data(labs_response=response_data)
-
-            url_req = f"{settings.API_URL}/get_disciplines"
-            response = requests.get(url_req, json={"user_id": user_id})
-
-            if response.status_code == 200:
-                disciplines = response.json().get("disciplines", [])
-                sorted_disciplines = sorted(disciplines, key=lambda x: x["name"])
-                disciplines_dict = {d["discipline_id"]: d["name"] for d in sorted_disciplines}
-                await state.update_data(disciplines_dict=disciplines_dict)
-                await state.update_data(disciplines=list(disciplines_dict.values()))
-                await state.update_data(disciplines_id=list(disciplines_dict.keys()))
-                await message.answer(
-                    _("Выберите вид отображения списка."),
-                    reply_markup=kb.list_show_option()
-                )
-        else:
-            await message.answer(json.loads(response.text).get('detail'))
+        # Названия дисциплин загружаются вместе со страницами списка, задания - только в fetch_labs
+        await state.update_data(user_id=response.json().get("user_id"), disciplines_dict={})
+        await message.answer(
+            _("Выберите вид отображения списка."),
+            reply_markup=kb.list_show_option()
+        )
     else:
         await message.answer(json.loads(response.text).get('detail'))
 
@@ -915,61 +1022,18 @@ async def show_lab_list_option(callback_query: CallbackQuery, state: FSMContext)
                 _("Выберите статус."),
                 reply_markup=kb.status_option())
         case "discipline":
-            state_data = await state.get_data()
-            disciplines_dict = state_data.get("disciplines_dict")
-            await callback_query.message.answer(
-                _("Выберите дисциплину."),
-                reply_markup=kb.disciplines_list(list(disciplines_dict.values()), page=0))
-        case "week":
-            state_data = await state.get_data()
-            labs_data = state_data.get("labs_response")
-            disciplines_dict = state_data.get("disciplines_dict")
-            await state.update_data(show_abb=True)
-            filtered_lab_list_undone = []
-            filtered_lab_list_process = []
-
-            today = datetime.now().date()
-            date_mark = today + timedelta(days=7)
-
-            for lab in labs_data["labs"]:
-                if datetime.strptime(lab["end_date"], "%Y-%m-%d").date() < date_mark:
-                    if lab["status"] != 'Сдано' and datetime.strptime(lab["end_date"], "%Y-%m-%d").date() < today:
-                        filtered_lab_list_undone.append(lab)
-                    else:
-                        filtered_lab_list_process.append(lab)
-            filtered_lab_list_undone.sort(key=lambda x: datetime.strptime(x["end_date"], "%Y-%m-%d"))
-            filtered_lab_list_process.sort(key=lambda x: datetime.strptime(x["end_date"], "%Y-%m-%d"))
-            filtered_lab_list = filtered_lab_list_undone + filtered_lab_list_process
-            await state.update_data(labs=filtered_lab_list)
-
-            if filtered_lab_list_undone or filtered_lab_list_process:
-                if filtered_lab_list_undone:
-                    info_string_undone = __(f"<b>Просроченные задания:</b>\n\n")
-                    for lab in filtered_lab_list_undone:
-                        info_string_undone += __(f'Дисциплина: {disciplines_dict[lab["discipline_id"]]}\n' +
-                                                 __(f'{lab["name"]}\n') +
-                                                 __(f'Дата начала: {datetime.strptime(lab["start_date"], "%Y-%m-%d").strftime("%d.%m.%Y")}\n') +
-                                                 __(f'Срок сдачи: {datetime.strptime(lab["end_date"], "%Y-%m-%d").strftime("%d.%m.%Y")}\n') +
-                                                 __(f'Статус: <b>{lab["status"]}</b>\n\n'))
-                else:
-                    info_string_undone = __(f"<b>Просроченных заданий не найдено.</b>\n\n")
-                if filtered_lab_list_process:
-                    info_string_process = __(f"<b>Предстоящие задания на следующие 7 дней:</b>\n\n")
-                    for lab in filtered_lab_list_process:
-                        info_string_process += __(f'Дисциплина: {disciplines_dict[lab["discipline_id"]]}\n' +
-                                                  __(f'{lab["name"]}\n') +
-                                                  __(f'Дата начала: {datetime.strptime(lab["start_date"], "%Y-%m-%d").strftime("%d.%m.%Y")}\n') +
-                                                  __(f'Срок сдачи: {datetime.strptime(lab["end_date"], "%Y-%m-%d").strftime("%d.%m.%Y")}\n') +
-                                                  __(f'Статус: <b>{lab["status"]}</b>\n\n'))
-                else:
-                    info_string_process = __(f"<b>Заданий на ближайшие 7 дней не найдено.</b>\n\n")
-                info_string = info_string_undone + info_string_process
+            response = await open_disciplines_picker(state)
+            if response.status_code == 200:
+                await callback_query.message.answer(
+                    _("Выберите дисциплину."),
+                    reply_markup=await picker_keyboard(state, kb.disciplines_list))
             else:
-                info_string = __(f"Заданий не найдено.\n\n")
-            await callback_query.message.answer(
-                info_string,
-                reply_markup=kb.labs_list(filtered_lab_list, disciplines_dict, True, page=0),
-                parse_mode="HTML")
+                await callback_query.message.answer(json.loads(response.text).get('detail'))
+        case "week":
+            date_mark = datetime.now().date() + timedelta(days=7)
+            # Просроченные задания имеют срок раньше сегодняшнего, поэтому тоже попадают в выборку
+            await start_lab_list(callback_query.message, state,
+                                 {"view": "week", "filters": {"end_date_before": date_mark.isoformat()}})
 
 
 @router.callback_query(F.data == "back_to_options")
@@ -995,34 +1059,14 @@ async def show_lab_list_status(callback_query: CallbackQuery, state: FSMContext)
     selected_status = Status[status_name]
 
     if await state.get_state() == ShowLabStates.showing_list:
-        labs_data = state_data.get("labs_response")
-        disciplines_dict = state_data.get("disciplines_dict")
-        await state.update_data(show_abb=True)
-        filtered_lab_list = []
-        for lab in labs_data["labs"]:
-            if lab["status"] == selected_status.value:
-                filtered_lab_list.append(lab)
-        filtered_lab_list.sort(key=lambda x: datetime.strptime(x["end_date"], "%Y-%m-%d"))
-        await state.update_data(labs=filtered_lab_list)
-
-        if filtered_lab_list:
-            info_string = f"Задания со статусом: {selected_status.value}\n\n"
-            for lab in filtered_lab_list:
-                info_string += __(f'Дисциплина: {disciplines_dict[lab["discipline_id"]]}\n' +
-                                  __(f'{lab["name"]}\n') +
-                                  __(f'Дата начала: {datetime.strptime(lab["start_date"], "%Y-%m-%d").strftime("%d.%m.%Y")}\n') +
-                                  __(f'Срок сдачи: {datetime.strptime(lab["end_date"], "%Y-%m-%d").strftime("%d.%m.%Y")}\n\n'))
-        else:
-            info_string = f"Заданий со статусом {selected_status.value} не найдено.\n\n"
-        await callback_query.message.answer(
-            info_string,
-            reply_markup=kb.labs_list(filtered_lab_list, disciplines_dict, True, page=0))
+        await start_lab_list(callback_query.message, state,
+                             {"view": "status", "status": status_name, "filters": {"status": status_name}})
     elif await state.get_state() == ShowLabStates.showing_chosen_lab:
         chosen_lab = state_data.get("chosen_lab")
         url_req = f"{settings.API_URL}/edit_lab"
-        response = requests.post(url_req, json={"task_id": chosen_lab["task_id"],
-                                                "editing_attribute": "status",
-                                                "editing_value": status_name})
+        response = await api_client.post(url_req, json={"task_id": chosen_lab["task_id"],
+                                                        "editing_attribute": "status",
+                                                        "editing_value": status_name})
         if response.status_code == 200:
             await callback_query.message.answer(
                 _("Статус успешно изменен на {new_status}.").format(new_status=selected_status.value))
@@ -1038,7 +1082,7 @@ async def show_chosen_lab_menu(message: Message, state: FSMContext, after_edit,
     chosen_lab = state_data.get("chosen_lab")
 
     url_req = f"{settings.API_URL}/get_lab_files"
-    response = requests.get(url_req, json={"task_id": chosen_lab["task_id"]})
+    response = await api_client.get(url_req, json={"task_id": chosen_lab["task_id"]})
     if response.status_code == 200:
         response_data = response.json()
         file_names = [file['file_name'] for file in response_data.get("files", [])]
@@ -1086,50 +1130,52 @@ async def show_chosen_lab_menu(message: Message, state: FSMContext, after_edit,
             )
 
         for file_info in response_data["files"]:
+            # Файл, уже загруженный в Telegram, отправляется по идентификатору без передачи содержимого
+            if settings.REUSE_TELEGRAM_FILE_ID and file_info.get("telegram_file_id"):
+                try:
+                    await send_lab_file(message.chat.id, file_info['file_type'], file_info["telegram_file_id"])
+                    continue
+                except TelegramBadRequest:
+                    pass
+
+            # Содержимое скачивается во временный файл по частям и отправляется из него
+            fd, tmp_path = tempfile.mkstemp()
             try:
-                file_bytes = base64.b64decode(file_info['file_data'])
-                file_data = BufferedInputFile(file_bytes, filename=file_info["file_name"])
-                if file_info['file_type'] == 'document':
-                    await bot.send_document(
-                        chat_id=message.chat.id,
-                        document=file_data
-                    )
-                elif file_info['file_type'] == 'photo':
-                    await bot.send_photo(
-                        chat_id=message.chat.id,
-                        photo=file_data
-                    )
-                elif file_info['file_type'] == 'video':
-                    await bot.send_video(
-                        chat_id=message.chat.id,
-                        video=file_data,
-                        supports_streaming=True
-                    )
-                elif file_info['file_type'] == 'audio':
-                    await bot.send_audio(
-                        chat_id=message.chat.id,
-                        audio=file_data,
-                    )
+                url_req = f"{settings.API_URL}/get_file_data"
+                with os.fdopen(fd, "wb") as tmp_file:
+                    response = await api_client.download(url_req, tmp_file, json={"file_id": file_info["file_id"]})
+                if response.status_code != 200:
+                    raise ValueError(json.loads(response.text).get('detail'))
+                file_data = FSInputFile(tmp_path, filename=file_info["file_name"])
+                sent_message = await send_lab_file(message.chat.id, file_info['file_type'], file_data)
+                if settings.REUSE_TELEGRAM_FILE_ID and sent_message:
+                    telegram_file = get_message_file(sent_message, file_info['file_type'])
+                    url_req = f"{settings.API_URL}/edit_file_telegram_id"
+                    await api_client.post(url_req, json={"file_id": file_info["file_id"],
+                                                         "telegram_file_id": telegram_file.file_id,
+                                                         "telegram_file_unique_id": telegram_file.file_unique_id})
             except Exception as e:
                 await message.answer(
                     _("Не удалось отправить файл.").format(error=str(e))
                 )
+            finally:
+                os.remove(tmp_path)
 
 
 @router.callback_query(F.data.startswith("lab_page_"), ShowLabStates.showing_list)
 async def handle_lab_pagination(callback_query: CallbackQuery, state: FSMContext):
-    await callback_query.answer()
-    state_data = await state.get_data()
-    show_abb = state_data.get("show_abb")
-    labs = state_data.get("labs", [])
-    disciplines_dict = state_data.get("disciplines_dict")
-
     page = int(callback_query.data.split("_")[-1])
-    await state.update_data(current_page=page)
-
-    await callback_query.message.edit_reply_markup(
-        reply_markup=kb.labs_list(labs, disciplines_dict, show_abb, page=page)
-    )
+    lab_list = (await state.get_data()).get("lab_list")
+    if not lab_list:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
+    if page >= len(lab_list["cursors"]):
+        # Кнопка из сообщения со списком, открытым до последнего обновления списка: курсора этой страницы нет
+        await callback_query.answer(_("Список устарел, показана первая страница."))
+        page = 0
+    else:
+        await callback_query.answer()
+    await show_labs_page(callback_query.message, state, page, True)
 
 
 @router.callback_query(F.data.startswith("lab_index_"))
@@ -1187,12 +1233,14 @@ async def edit_lab_status(callback_query: CallbackQuery, state: FSMContext):
 
     match field:
         case "discipline":
-            state_data = await state.get_data()
-            disciplines_dict = state_data.get("disciplines_dict")
-            await callback_query.message.answer(
-                _("Выберите новую дисциплину для задания."),
-                reply_markup=kb.disciplines_list(list(disciplines_dict.values()), page=0))
-            await state.set_state(EditLabStates.editing_discipline)
+            response = await open_disciplines_picker(state)
+            if response.status_code == 200:
+                await callback_query.message.answer(
+                    _("Выберите новую дисциплину для задания."),
+                    reply_markup=await picker_keyboard(state, kb.disciplines_list))
+                await state.set_state(EditLabStates.editing_discipline)
+            else:
+                await callback_query.message.answer(json.loads(response.text).get('detail'))
         case "name":
             await callback_query.message.answer(_("Введите новое название задания."))
             await state.set_state(EditLabStates.editing_name)
@@ -1247,7 +1295,7 @@ async def confirm_deleting(callback_query: CallbackQuery, state: FSMContext):
     state_data = await state.get_data()
     chosen_lab = state_data.get("chosen_lab")
     url_req = f"{settings.API_URL}/delete_lab"
-    response = requests.delete(url_req, json={"task_id": chosen_lab["task_id"]})
+    response = await api_client.delete(url_req, json={"task_id": chosen_lab["task_id"]})
     if response.status_code == 200:
         await callback_query.message.bot.delete_message(
             chat_id=callback_query.message.chat.id,
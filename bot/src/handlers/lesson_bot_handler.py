@@ -4,7 +4,10 @@ import json
 from io import BytesIO
 import io
 
-import requests
+from bot.src.api_client import api_client
+from bot.src.identity_cache import identity_cache
+from bot.src.discipline_names import load_discipline_names
+from bot.src.picker import open_picker, load_picker_page, picker_keyboard, picker_is_empty, picker_item
 from datetime import datetime, timedelta
 
 from aiogram import Router, F, Bot
@@ -26,6 +29,8 @@ from bot.src.bot_unit import bot as bot_unit
 
 router = Router()
 
+LESSONS_PAGE_SIZE = 5
+
 
 def format_value(value):
     return "-" if value is None else value
@@ -115,36 +120,33 @@ async def show_lesson_confirmation(message: Message, state: FSMContext, bot: Bot
     )
 
 
+async def open_disciplines_picker(state: FSMContext):
+    state_data = await state.get_data()
+    return await open_picker(state, "/get_disciplines", {"user_id": state_data.get("user_id")}, "disciplines", "name")
+
+
 @router.message(F.text == __("Добавить занятие"))
 async def add_lesson_start(message: Message, state: FSMContext):
     await state.set_state(AddLessonStates.adding_lab)
     state_data = await state.get_data()
 
-    url_req = f"{settings.API_URL}/get_user_id"
-    response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
+    response = await identity_cache.get(state_data.get("telegram_id"))
 
     if response.status_code == 200:
         user_id = response.json().get("user_id")
         await state.update_data(user_id=user_id)
 
-        url_req = f"{settings.API_URL}/get_disciplines"
-        response = requests.get(url_req, json={"user_id": user_id})
+        response = await open_disciplines_picker(state)
 
         if response.status_code == 200:
-            disciplines = response.json().get("disciplines", [])
-            if len(disciplines) == 0:
+            if await picker_is_empty(state):
                 await message.answer(
                     _("Дисциплин не найдено. Пожалуйста, добавьте дисциплины в меню дисциплин."))
                 return
-            sorted_disciplines = sorted(disciplines, key=lambda x: x["name"])
-            disciplines_dict = {d["discipline_id"]: d["name"] for d in sorted_disciplines}
-            await state.update_data(disciplines_dict=disciplines_dict)
-            await state.update_data(disciplines=list(disciplines_dict.values()))
-            await state.update_data(disciplines_id=list(disciplines_dict.keys()))
 
             await message.answer(
                 _("Выберите дисциплину для проведения занятия."),
-                reply_markup=kb.disciplines_list(list(disciplines_dict.values()), page=0))
+                reply_markup=await picker_keyboard(state, kb.disciplines_list))
             await state.set_state(AddLessonStates.waiting_for_discipline)
         else:
             await message.answer(json.loads(response.text).get('detail'))
@@ -156,31 +158,39 @@ async def add_lesson_start(message: Message, state: FSMContext):
                        or_f(AddLessonStates.waiting_for_discipline, AddLessonStates.waiting_for_new_discipline,
                             ShowLessonStates.showing_list, EditLessonStates.editing_discipline))
 async def handle_disciplines_pagination(callback_query: CallbackQuery, state: FSMContext):
+    response = await load_picker_page(state, int(callback_query.data.split("_")[-1]))
+    if response is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
     await callback_query.answer()
-    state_data = await state.get_data()
-    disciplines = state_data.get("disciplines", [])
-
-    page = int(callback_query.data.split("_")[-1])
-    await state.update_data(current_page=page)
-
-    await callback_query.message.edit_reply_markup(
-        reply_markup=kb.disciplines_list(disciplines, page=page)
-    )
+    if response.status_code == 200:
+        await callback_query.message.edit_reply_markup(
+            reply_markup=await picker_keyboard(state, kb.disciplines_list)
+        )
+    else:
+        await callback_query.message.answer(json.loads(response.text).get('detail'))
 
 
 @router.callback_query(F.data.startswith("lesson_discipline_index_"),
                        or_f(AddLessonStates.waiting_for_discipline, AddLessonStates.waiting_for_new_discipline,
                             ShowLessonStates.showing_list, EditLessonStates.editing_discipline))
 async def select_discipline(callback_query: CallbackQuery, state: FSMContext):
+    discipline = await picker_item(state, int(callback_query.data.split("_")[-1]))
+    if discipline is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
     await callback_query.answer()
     state_data = await state.get_data()
-    discipline_index = int(callback_query.data.split("_")[-1])
 
-    discipline_id = state_data.get("disciplines_id")[discipline_index]
-    discipline_name = state_data.get("disciplines")[discipline_index]
+    discipline_id = discipline["discipline_id"]
+    discipline_name = discipline["name"]
+    # Название выбранной дисциплины нужно для подписи занятия в меню и списке
+    disciplines_dict = state_data.get("disciplines_dict") or {}
+    disciplines_dict[discipline_id] = discipline_name
 
     await state.update_data(discipline_id=discipline_id)
     await state.update_data(discipline_name=discipline_name)
+    await state.update_data(disciplines_dict=disciplines_dict)
 
     await callback_query.message.edit_reply_markup(
         reply_markup=None
@@ -195,9 +205,9 @@ async def select_discipline(callback_query: CallbackQuery, state: FSMContext):
     elif await state.get_state() == EditLessonStates.editing_discipline:
         chosen_lesson = state_data.get("chosen_lesson")
         url_req = f"{settings.API_URL}/edit_lesson"
-        response = requests.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
-                                                "editing_attribute": "discipline_id",
-                                                "editing_value": str(discipline_id)})
+        response = await api_client.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
+                                                        "editing_attribute": "discipline_id",
+                                                        "editing_value": str(discipline_id)})
         if response.status_code == 200:
             await callback_query.message.answer(
                 _("Дисциплина успешно изменена на {discipline_name}.").format(discipline_name=discipline_name))
@@ -226,9 +236,9 @@ async def get_lesson_name(message: Message, state: FSMContext):
     elif await state.get_state() == EditLessonStates.editing_classroom:
         chosen_lesson = state_data.get("chosen_lesson")
         url_req = f"{settings.API_URL}/edit_lesson"
-        response = requests.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
-                                                "editing_attribute": "classroom",
-                                                "editing_value": classroom})
+        response = await api_client.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
+                                                        "editing_attribute": "classroom",
+                                                        "editing_value": classroom})
         if response.status_code == 200:
             await message.answer(
                 _("Аудитория успешно изменена на {classroom}.").format(classroom=classroom))
@@ -306,9 +316,9 @@ async def select_start_date(callback: CallbackQuery, state: FSMContext):
         state_data = await state.get_data()
         chosen_lesson = state_data.get("chosen_lesson")
         url_req = f"{settings.API_URL}/edit_lesson"
-        response = requests.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
-                                                "editing_attribute": "start_date",
-                                                "editing_value": start_date.strftime("%Y-%m-%d")})
+        response = await api_client.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
+                                                        "editing_attribute": "start_date",
+                                                        "editing_value": start_date.strftime("%Y-%m-%d")})
         if response.status_code == 200:
             await callback.message.answer(
                 _("Дата начала успешно изменена на {start_date}.").format(start_date=start_date))
@@ -388,9 +398,9 @@ async def add_start_minutes(callback_query: CallbackQuery, state: FSMContext):
         state_data = await state.get_data()
         chosen_lesson = state_data.get("chosen_lesson")
         url_req = f"{settings.API_URL}/edit_lesson"
-        response = requests.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
-                                                "editing_attribute": "start_time",
-                                                "editing_value": f'{state_data["start_hour"]}:{state_data["start_minutes"]}:00'})
+        response = await api_client.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
+                                                        "editing_attribute": "start_time",
+                                                        "editing_value": f'{state_data["start_hour"]}:{state_data["start_minutes"]}:00'})
         if response.status_code == 200:
             await callback_query.message.answer(
                 _("Время начала успешно изменено на {start_time}.").format(start_time=f'{state_data["start_hour"]}:{state_data["start_minutes"]}:00'))
@@ -430,9 +440,9 @@ async def add_another_start_minutes(msg: Message, state: FSMContext):
             state_data = await state.get_data()
             chosen_lesson = state_data.get("chosen_lesson")
             url_req = f"{settings.API_URL}/edit_lesson"
-            response = requests.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
-                                                    "editing_attribute": "start_time",
-                                                    "editing_value": f'{state_data["start_hour"]}:{state_data["start_minutes"]}:00'})
+            response = await api_client.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
+                                                            "editing_attribute": "start_time",
+                                                            "editing_value": f'{state_data["start_hour"]}:{state_data["start_minutes"]}:00'})
             if response.status_code == 200:
                 await msg.answer(
                     _("Время начала успешно изменено на {start_time}.").format(
@@ -509,9 +519,9 @@ async def add_end_minutes(callback_query: CallbackQuery, state: FSMContext):
             state_data = await state.get_data()
             chosen_lesson = state_data.get("chosen_lesson")
             url_req = f"{settings.API_URL}/edit_lesson"
-            response = requests.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
-                                                    "editing_attribute": "end_time",
-                                                    "editing_value": f'{state_data["end_hour"]}:{state_data["end_minutes"]}:00'})
+            response = await api_client.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
+                                                            "editing_attribute": "end_time",
+                                                            "editing_value": f'{state_data["end_hour"]}:{state_data["end_minutes"]}:00'})
             if response.status_code == 200:
                 await callback_query.message.answer(
                     _("Время окончания успешно изменено на {end_time}.").format(
@@ -548,9 +558,9 @@ async def add_another_end_minutes(msg: Message, state: FSMContext):
             state_data = await state.get_data()
             chosen_lesson = state_data.get("chosen_lesson")
             url_req = f"{settings.API_URL}/edit_lesson"
-            response = requests.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
-                                                    "editing_attribute": "end_time",
-                                                    "editing_value": f'{state_data["end_hour"]}:{state_data["end_minutes"]}:00'})
+            response = await api_client.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
+                                                            "editing_attribute": "end_time",
+                                                            "editing_value": f'{state_data["end_hour"]}:{state_data["end_minutes"]}:00'})
             if response.status_code == 200:
                 await msg.answer(
                     _("Время начала успешно изменено на {end_time}.").format(
@@ -596,9 +606,9 @@ async def add_end_minutes(callback_query: CallbackQuery, state: FSMContext):
         state_data = await state.get_data()
         chosen_lesson = state_data.get("chosen_lesson")
         url_req = f"{settings.API_URL}/edit_lesson"
-        response = requests.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
-                                                "editing_attribute": "periodicity_days",
-                                                "editing_value": '0'})
+        response = await api_client.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
+                                                        "editing_attribute": "periodicity_days",
+                                                        "editing_value": '0'})
         if response.status_code == 200:
             await callback_query.message.answer(
                 _("Периодичность в днях успешно изменена на {days}.").format(
@@ -635,9 +645,9 @@ async def get_additional_info(message: Message, state: FSMContext):
         state_data = await state.get_data()
         chosen_lesson = state_data.get("chosen_lesson")
         url_req = f"{settings.API_URL}/edit_lesson"
-        response = requests.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
-                                                "editing_attribute": "periodicity_days",
-                                                "editing_value": str(periodicity)})
+        response = await api_client.post(url_req, json={"lesson_id": chosen_lesson["lesson_id"],
+                                                        "editing_attribute": "periodicity_days",
+                                                        "editing_value": str(periodicity)})
         if response.status_code == 200:
             await message.answer(
                 _("Периодичность в днях успешно изменена на {days}.").format(
@@ -671,7 +681,7 @@ async def confirm_lab(callback_query: CallbackQuery, state: FSMContext):
     }
 
     url_req = f"{settings.API_URL}/add_lesson"
-    response = requests.post(url_req, json=lesson_data)
+    response = await api_client.post(url_req, json=lesson_data)
 
     if response.status_code == 200:
         await callback_query.message.answer(
@@ -712,12 +722,14 @@ async def edit_lab_data(callback_query: CallbackQuery, state: FSMContext):
 
     match field:
         case "discipline":
-            state_data = await state.get_data()
-            disciplines_dict = state_data.get("disciplines_dict")
-            await callback_query.message.answer(
-                _("Выберите новую дисциплину для занятия."),
-                reply_markup=kb.disciplines_list(list(disciplines_dict.values()), page=0))
-            await state.set_state(AddLessonStates.waiting_for_new_discipline)
+            response = await open_disciplines_picker(state)
+            if response.status_code == 200:
+                await callback_query.message.answer(
+                    _("Выберите новую дисциплину для занятия."),
+                    reply_markup=await picker_keyboard(state, kb.disciplines_list))
+                await state.set_state(AddLessonStates.waiting_for_new_discipline)
+            else:
+                await callback_query.message.answer(json.loads(response.text).get('detail'))
         case "classroom":
             await callback_query.message.answer(_("Введите новую аудиторию для занятия."))
             await state.set_state(AddLessonStates.waiting_for_new_classroom)
@@ -752,40 +764,53 @@ async def show_lesson_list(message: Message, state: FSMContext):
     await state.set_state(ShowLessonStates.showing_list)
 
     state_data = await state.get_data()
-    url_req = f"{settings.API_URL}/get_user_id"
-    response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
+    response = await identity_cache.get(state_data.get("telegram_id"))
 
     if response.status_code == 200:
         user_id = response.json().get("user_id")
-        await state.update_data(user_id=user_id)
-        url_req = f"{settings.API_URL}/get_lessons"
-        response = requests.get(url_req, json={"user_id": user_id})
-        if response.status_code == 200:
-            response_data = response.json()
-            lessons_response = response_data
-            await state.update_data(lessons_response=response_data)
+        # Названия дисциплин загружаются вместе со страницами списка
+        await state.update_data(user_id=user_id, disciplines_dict={}, lesson_cursors=[None])
+        await show_lessons_page(message, state, 0, False)
+    else:
+        await message.answer(json.loads(response.text).get('detail'))
 
-            url_req = f"{settings.API_URL}/get_disciplines"
-            response = requests.get(url_req, json={"user_id": user_id})
 
-            if response.status_code == 200:
-                disciplines = response.json().get("disciplines", [])
-                sorted_disciplines = sorted(disciplines, key=lambda x: x["name"])
-                disciplines_dict = {d["discipline_id"]: d["name"] for d in sorted_disciplines}
-                await state.update_data(disciplines_dict=disciplines_dict)
-                await state.update_data(disciplines=list(disciplines_dict.values()))
-                await state.update_data(disciplines_id=list(disciplines_dict.keys()))
-                filtered_lessons_list = lessons_response["lessons"]
-                filtered_lessons_list.sort(key=lambda x: datetime.strptime(x["start_date"], "%Y-%m-%d"))
-                await state.update_data(lessons=filtered_lessons_list)
-                await message.answer(
-                    _("Список занятий."),
-                    reply_markup=kb.lessons_list(filtered_lessons_list, disciplines_dict, page=0)
-                )
-        else:
-            await message.answer(json.loads(response.text).get('detail'))
-    else:
+async def show_lessons_page(message: Message, state: FSMContext, page, edit):
+    """
+    Запрашивает у API одну страницу занятий, отсортированных по дате первого занятия.
+    Курсоры уже открытых страниц хранятся в состоянии в lesson_cursors.
+    """
+    state_data = await state.get_data()
+    cursors = state_data.get("lesson_cursors")
+
+    url_req = f"{settings.API_URL}/get_lessons"
+    response = await api_client.get(url_req, json={"user_id": state_data.get("user_id"),
+                                                   "limit": LESSONS_PAGE_SIZE,
+                                                   "cursor": cursors[page]})
+    if response.status_code != 200:
+        await message.answer(json.loads(response.text).get('detail'))
+        return
+    lessons_page = response.json()
+    next_cursor = lessons_page["next_cursor"]
+    if next_cursor is not None and len(cursors) == page + 1:
+        cursors.append(next_cursor)
+    lessons = lessons_page["lessons"]
+    await state.update_data(lessons=lessons, lesson_cursors=cursors, current_page=page)
+
+    response = await load_discipline_names(state, [lesson["discipline_id"] for lesson in lessons])
+    if response is not None and response.status_code != 200:
         await message.answer(json.loads(response.text).get('detail'))
+        return
+    disciplines_dict = (await state.get_data()).get("disciplines_dict")
+
+    reply_markup = kb.lessons_list(lessons, disciplines_dict, page=page, has_next=next_cursor is not None)
+    if edit:
+        await message.edit_reply_markup(reply_markup=reply_markup)
+    else:
+        await message.answer(
+            _("Список занятий."),
+            reply_markup=reply_markup
+        )
 
 
 async def show_chosen_lesson_menu(message: Message, state: FSMContext, bot: Bot = bot_unit):
@@ -822,18 +847,19 @@ async def show_chosen_lesson_menu(message: Message, state: FSMContext, bot: Bot
 
 
 @router.callback_query(F.data.startswith("lesson_page_"), ShowLessonStates.showing_list)
-async def handle_lab_pagination(callback_query: CallbackQuery, state: FSMContext):
-    await callback_query.answer()
-    state_data = await state.get_data()
-    lessons = state_data.get("lessons", [])
-    disciplines_dict = state_data.get("disciplines_dict")
-
+async def handle_lesson_pagination(callback_query: CallbackQuery, state: FSMContext):
     page = int(callback_query.data.split("_")[-1])
-    await state.update_data(current_page=page)
-
-    await callback_query.message.edit_reply_markup(
-        reply_markup=kb.lessons_list(lessons, disciplines_dict, page=page)
-    )
+    cursors = (await state.get_data()).get("lesson_cursors")
+    if not cursors:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
+    if page >= len(cursors):
+        # Кнопка из сообщения со списком, открытым до последнего обновления списка: курсора этой страницы нет
+        await callback_query.answer(_("Список устарел, показана первая страница."))
+        page = 0
+    else:
+        await callback_query.answer()
+    await show_lessons_page(callback_query.message, state, page, True)
 
 
 @router.callback_query(F.data.startswith("lesson_index_"))
@@ -878,12 +904,14 @@ async def edit_lab_status(callback_query: CallbackQuery, state: FSMContext):
 
     match field:
         case "discipline":
-            state_data = await state.get_data()
-            disciplines_dict = state_data.get("disciplines_dict")
-            await callback_query.message.answer(
-                _("Выберите новую дисциплину для занятия."),
-                reply_markup=kb.disciplines_list(list(disciplines_dict.values()), page=0))
-            await state.set_state(EditLessonStates.editing_discipline)
+            response = await open_disciplines_picker(state)
+            if response.status_code == 200:
+                await callback_query.message.answer(
+                    _("Выберите новую дисциплину для занятия."),
+                    reply_markup=await picker_keyboard(state, kb.disciplines_list))
+                await state.set_state(EditLessonStates.editing_discipline)
+            else:
+                await callback_query.message.answer(json.loads(response.text).get('detail'))
         case "classroom":
             await callback_query.message.answer(_("Введите новую аудиторию для занятия."))
             await state.set_state(EditLessonStates.editing_classroom)
@@ -940,7 +968,7 @@ async def confirm_deleting(callback_query: CallbackQuery, state: FSMContext):
     chosen_lesson = state_data.get("chosen_lesson")
     disciplines_dict = state_data.get("disciplines_dict")
     url_req = f"{settings.API_URL}/delete_lesson"
-    response = requests.delete(url_req, json={"lesson_id": chosen_lesson["lesson_id"]})
+    response = await api_client.delete(url_req, json={"lesson_id": chosen_lesson["lesson_id"]})
     if response.status_code == 200:
         await callback_query.message.bot.delete_message(
             chat_id=callback_query.message.chat.id,
@@ -1,13 +1,14 @@
-import io
-
 from aiogram import Router, F, types, Bot
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import CommandStart
-from aiogram.types import Message, BufferedInputFile
+from aiogram.types import Message
 from aiogram.utils import i18n
 
 from ..settings import settings
-import requests
+from bot.src.api_client import api_client
+from bot.src.dashboard import load_dashboard
+from bot.src.identity_cache import identity_cache
+from bot.src.schedule_service import schedule_service
 import json
 
 from aiogram.utils.i18n import gettext as _
@@ -17,7 +18,7 @@ import bot.src.keyboards.menu_keyboard as kb
 import bot.src.keyboards.auth_keyboard as kb_auth
 import bot.src.keyboards.diagrams_keyboard as kb_diag
 import bot.src.keyboards.settings_keyboard as kb_settings
-from bot.src.handlers.diagrams_bot_handler import create_kanban
+from bot.src.handlers.diagrams_bot_handler import render_chart, send_chart
 
 from bot.src.bot_unit import bot as bot_unit
 
@@ -33,11 +34,10 @@ async def start_dialog(message: Message, state: FSMContext, telegram_id: int = N
         current_user_tg_id = message.from_user.id
 
     url_req = f"{settings.API_URL}/check_user"
-    response = requests.get(url_req, json={"telegram_id": str(current_user_tg_id)})
+    response = await api_client.get(url_req, json={"telegram_id": str(current_user_tg_id)})
     response_data = response.json()
     if response_data.get("exists", True):
-        url_req = f"{settings.API_URL}/check_is_petrsu_student"
-        response = requests.get(url_req, json={"telegram_id": str(current_user_tg_id)})
+        response = await identity_cache.get(current_user_tg_id)
         response_data = response.json()
         if response_data.get("is_petrsu_student", True):
             if telegram_id is None:
@@ -101,26 +101,18 @@ async def open_gant_menu(message: Message, state: FSMContext, telegram_id: int =
     if telegram_id is None:
         telegram_id = str(message.from_user.id)
     await state.update_data(telegram_id=telegram_id)
-    url_req = f"{settings.API_URL}/check_is_petrsu_student"
-    response = requests.get(url_req, json={"telegram_id": str(telegram_id)})
+    response = await identity_cache.get(telegram_id)
     response_data = response.json()
     if response.status_code == 200:
         if response_data.get("is_petrsu_student", True):
-            url_req = f"{settings.API_URL}/get_user_group"
-            response = requests.get(url_req, json={"telegram_id": telegram_id})
+            group = response_data.get("group")
+            response = await schedule_service.schedule(group)
             if response.status_code == 200:
-                group = response.json().get("group")
-                url_req = "https://petrsu.egipti.com/api/v2/schedule/{group}".format(group=group)
-                response = requests.get(url_req)
-                if response.status_code == 200:
-                    response_data = response.json()
-                    await state.update_data(schedule_data=response_data)
-                    await message.answer(
-                        _("Выберите период для диаграммы Ганта."),
-                        reply_markup=kb_diag.choose_gant_diagram(),
-                    )
-                else:
-                    await message.answer(json.loads(response.text).get('detail'))
+                await state.update_data(schedule_group=group)
+                await message.answer(
+                    _("Выберите период для диаграммы Ганта."),
+                    reply_markup=kb_diag.choose_gant_diagram(),
+                )
             else:
                 await message.answer(json.loads(response.text).get('detail'))
         else:
@@ -139,47 +131,17 @@ async def open_gant_menu(message: Message, state: FSMContext, telegram_id: int =
     if telegram_id is None:
         telegram_id = str(message.from_user.id)
     await state.update_data(telegram_id=telegram_id)
-    url_req = f"{settings.API_URL}/get_user_id"
-    response = requests.get(url_req, json={"telegram_id": telegram_id})
+    response = await load_dashboard(state, telegram_id)
     if response.status_code == 200:
-        user_id = response.json().get("user_id")
-        await state.update_data(user_id=user_id)
-        url_req = f"{settings.API_URL}/get_labs"
-        response = requests.get(url_req, json={"user_id": user_id})
-        if response.status_code == 200:
-            response_data = response.json()
-            await state.update_data(labs_response=response_data)
-
-            url_req = f"{settings.API_URL}/get_disciplines"
-            response = requests.get(url_req, json={"user_id": user_id})
-
-            if response.status_code == 200:
-                disciplines = response.json().get("disciplines", [])
-                sorted_disciplines = sorted(disciplines, key=lambda x: x["name"])
-                disciplines_dict = {d["discipline_id"]: d["name"] for d in sorted_disciplines}
-                await state.update_data(disciplines_dict=disciplines_dict)
-                await state.update_data(disciplines=list(disciplines_dict.values()))
-                await state.update_data(disciplines_id=list(disciplines_dict.keys()))
-                state_data = await state.get_data()
-                # await create_kanban(state_data)
-                try:
-                    plt, fig = await create_kanban(state_data)
-
-                    buf = io.BytesIO()
-                    fig.savefig(buf, format='png', dpi=100, bbox_inches='tight', pad_inches=0.2)
-                    plt.close(fig)
-
-                    photo = BufferedInputFile(
-                        file=buf.getvalue(),
-                        filename="kanban_desk.png"
-                    )
-                    await bot.send_document(chat_id=message.chat.id, document=photo)
-                    buf.close()
-                except Exception as e:
-                    print(e)
-                    await message.answer(
-                        _("У Вас не добавлено ни одного задания.")
-                    )
+        state_data = await state.get_data()
+        chart = await render_chart(message, "kanban",
+                                   {"labs_response": state_data["labs_response"],
+                                    "disciplines_dict": state_data["disciplines_dict"]},
+                                   file_types=("document",))
+        if chart:
+            await send_chart(message.chat.id, *chart, "kanban_desk.png", file_types=("document",))
+    else:
+        await message.answer(json.loads(response.text).get('detail'))
 
 
 @router.message(F.text == __("Дисциплины"))
@@ -188,26 +150,18 @@ async def open_discipline_menu(message: Message, state: FSMContext, telegram_id:
     if telegram_id is None:
         telegram_id = str(message.from_user.id)
     await state.update_data(telegram_id=telegram_id)
-    url_req = f"{settings.API_URL}/check_is_petrsu_student"
-    response = requests.get(url_req, json={"telegram_id": str(telegram_id)})
+    response = await identity_cache.get(telegram_id)
     response_data = response.json()
     if response.status_code == 200:
         if response_data.get("is_petrsu_student", True):
-            url_req = f"{settings.API_URL}/get_user_group"
-            response = requests.get(url_req, json={"telegram_id": telegram_id})
+            group = response_data.get("group")
+            response = await schedule_service.schedule(group)
             if response.status_code == 200:
-                group = response.json().get("group")
-                url_req = "https://petrsu.egipti.com/api/v2/schedule/{group}".format(group=group)
-                response = requests.get(url_req)
-                if response.status_code == 200:
-                    response_data = response.json()
-                    await state.update_data(schedule_data=response_data)
-                    await message.answer(
-                        _("Вы находитесь в меню дисциплин."),
-                        reply_markup=kb.discipline_menu_keyboard(),
-                    )
-                else:
-                    await message.answer(json.loads(response.text).get('detail'))
+                await state.update_data(schedule_group=group)
+                await message.answer(
+                    _("Вы находитесь в меню дисциплин."),
+                    reply_markup=kb.discipline_menu_keyboard(),
+                )
             else:
                 await message.answer(json.loads(response.text).get('detail'))
         else:
@@ -249,8 +203,7 @@ async def open_settings_menu(message: Message, state: FSMContext,  telegram_id:
     if telegram_id is None:
         telegram_id = str(message.from_user.id)
     await state.update_data(telegram_id=telegram_id)
-    url_req = f"{settings.API_URL}/check_is_petrsu_student"
-    response = requests.get(url_req, json={"telegram_id": telegram_id})
+    response = await identity_cache.get(telegram_id)
     response_data = response.json()
     if response_data.get("is_petrsu_student", True):
         await message.answer(
@@ -1,4 +1,6 @@
-import requests
+from bot.src.api_client import api_client
+from bot.src.identity_cache import identity_cache
+from bot.src.schedule_service import schedule_service
 
 from aiogram import Router, F
 from aiogram.filters import StateFilter, or_f
@@ -38,17 +40,18 @@ async def change_group(message: Message, state: FSMContext):
     user_data = await state.get_data()
     telegram_id = user_data.get("telegram_id")
     group = message.text
-    url_req = "https://petrsu.egipti.com/api/v2/groups"
-    response = requests.get(url_req)
+    response = await schedule_service.groups()
     if response.status_code == 200:
         petrsu_groups = response.json()
         if group in petrsu_groups.keys():
             await state.update_data(group=group)
             if await state.get_state() == SettingsStates.waiting_for_group:
                 url_req = f"{settings.API_URL}/change_user_group"
-                response = requests.post(url_req, json={"telegram_id": telegram_id,
-                                                        "group": group})
+                response = await api_client.post(url_req, json={"telegram_id": telegram_id,
+                                                                "group": group})
                 if response.status_code == 200:
+                    identity_cache.update(telegram_id, group=group)
+                    schedule_service.refresh(schedule_service.schedule_path(group))
                     await message.answer(
                         _("Вы успешно изменили группу на {group}.").format(group=group)
                     )
@@ -60,9 +63,11 @@ async def change_group(message: Message, state: FSMContext):
                     )
             elif await state.get_state() == SettingsStates.waiting_for_new_group:
                 url_req = f"{settings.API_URL}/change_user_status"
-                response = requests.post(url_req,
-                                         json={"is_petrsu_student": True, "telegram_id": telegram_id, "group": group})
+                response = await api_client.post(url_req,
+                                                 json={"is_petrsu_student": True, "telegram_id": telegram_id, "group": group})
                 if response.status_code == 200:
+                    identity_cache.update(telegram_id, is_petrsu_student=True, group=group)
+                    schedule_service.refresh(schedule_service.schedule_path(group))
                     await message.answer(
                         _("Ваша группа: {group}").format(group=group)
                     )
@@ -83,13 +88,13 @@ async def change_group(message: Message, state: FSMContext):
 async def is_petrsu(callback_query: CallbackQuery, state: FSMContext):
     user_data = await state.get_data()
     telegram_id = user_data.get("telegram_id")
-    url_req = f"{settings.API_URL}/check_is_petrsu_student"
-    response = requests.get(url_req, json={"telegram_id": telegram_id})
+    response = await identity_cache.get(telegram_id)
     response_data = response.json()
     if response_data.get("is_petrsu_student", True):
         url_req = f"{settings.API_URL}/change_user_status"
-        response = requests.post(url_req, json={"is_petrsu_student": False, "telegram_id": telegram_id, "group": ""})
+        response = await api_client.post(url_req, json={"is_petrsu_student": False, "telegram_id": telegram_id, "group": ""})
         if response.status_code == 200:
+            identity_cache.update(telegram_id, is_petrsu_student=False, group="")
             await callback_query.message.edit_reply_markup(
                 reply_markup=None
             )
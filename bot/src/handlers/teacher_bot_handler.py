@@ -1,6 +1,9 @@
 import re
 import json
-import requests
+from bot.src.api_client import api_client
+from bot.src.identity_cache import identity_cache
+from bot.src.schedule_service import schedule_service
+from bot.src.picker import open_picker, load_picker_page, picker_keyboard, picker_is_empty, picker_item
 
 from aiogram import Router, F
 from aiogram.filters import or_f
@@ -96,24 +99,17 @@ async def show_confirmation(message: Message, state: FSMContext):
 async def add_teacher_start(message: Message, state: FSMContext):
     await state.set_state(AddTeacherStates.adding_teacher)
     state_data = await state.get_data()
-    url_req = f"{settings.API_URL}/get_user_id"
-    response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
+    response = await identity_cache.get(state_data.get("telegram_id"))
     if response.status_code == 200:
         await state.update_data(user_id=response.json().get("user_id"))
 
-        url_req = f"{settings.API_URL}/check_is_petrsu_student"
-        response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
-
-        if response.status_code == 200:
-            if response.json().get("is_petrsu_student", True):
-                await message.answer(_("Выбрать преподавателя из списка или добавить вручную?"),
-                                     reply_markup=kb.add_option())
-            else:
-                await state.update_data(is_from_api=False)
-                await message.answer(_("Введите ФИО преподавателя."))
-                await state.set_state(AddTeacherStates.waiting_for_FIO)
+        if response.json().get("is_petrsu_student", True):
+            await message.answer(_("Выбрать преподавателя из списка или добавить вручную?"),
+                                 reply_markup=kb.add_option())
         else:
-            await message.answer(json.loads(response.text).get('detail'))
+            await state.update_data(is_from_api=False)
+            await message.answer(_("Введите ФИО преподавателя."))
+            await state.set_state(AddTeacherStates.waiting_for_FIO)
     else:
         await message.answer(json.loads(response.text).get('detail'))
 
@@ -258,13 +254,13 @@ async def add_teacher_end(callback_query: CallbackQuery, state: FSMContext):
     await callback_query.answer()
     state_data = await state.get_data()
     url_req = f"{settings.API_URL}/add_teacher"
-    response = requests.post(url_req, json={"user_id": state_data.get("user_id"),
-                                            "name": state_data.get("name"),
-                                            "phone_number": state_data.get("phone_number"),
-                                            "email": state_data.get("email"),
-                                            "social_page_link": state_data.get("social_page_link"),
-                                            "classroom": state_data.get("classroom"),
-                                            "is_from_API": state_data.get("is_from_api")})
+    response = await api_client.post(url_req, json={"user_id": state_data.get("user_id"),
+                                                    "name": state_data.get("name"),
+                                                    "phone_number": state_data.get("phone_number"),
+                                                    "email": state_data.get("email"),
+                                                    "social_page_link": state_data.get("social_page_link"),
+                                                    "classroom": state_data.get("classroom"),
+                                                    "is_from_API": state_data.get("is_from_api")})
     if response.status_code == 200:
         await callback_query.message.edit_text(
             str(__("Преподаватель {name} добавлен.\n\n"
@@ -357,7 +353,7 @@ async def request_new_fio(message: Message, state: FSMContext):
             prev_val = state_data.get("name")
             await state.update_data(editing_value=fio)
             url_req = f"{settings.API_URL}/edit_teacher"
-            response = requests.post(url_req, json={
+            response = await api_client.post(url_req, json={
                 "teacher_id": state_data.get("chosen_lecturer_id"),
                 "editing_attribute": state_data.get("editing_attribute"),
                 "editing_value": fio})
@@ -415,7 +411,7 @@ async def request_new_phone_number(message: Message, state: FSMContext):
             prev_val = state_data.get("phone_number")
             await state.update_data(editing_value=phone_number)
             url_req = f"{settings.API_URL}/edit_teacher"
-            response = requests.post(url_req, json={
+            response = await api_client.post(url_req, json={
                 "teacher_id": state_data.get("chosen_lecturer_id"),
                 "editing_attribute": state_data.get("editing_attribute"),
                 "editing_value": phone_number})
@@ -473,7 +469,7 @@ async def request_new_email(message: Message, state: FSMContext):
             prev_val = state_data.get("email")
             await state.update_data(editing_value=email)
             url_req = f"{settings.API_URL}/edit_teacher"
-            response = requests.post(url_req, json={
+            response = await api_client.post(url_req, json={
                 "teacher_id": state_data.get("chosen_lecturer_id"),
                 "editing_attribute": state_data.get("editing_attribute"),
                 "editing_value": email})
@@ -518,7 +514,7 @@ async def request_new_link(message: Message, state: FSMContext):
         prev_val = state_data.get("social_page_link")
         await state.update_data(editing_value=social_page_link)
         url_req = f"{settings.API_URL}/edit_teacher"
-        response = requests.post(url_req, json={
+        response = await api_client.post(url_req, json={
             "teacher_id": state_data.get("chosen_lecturer_id"),
             "editing_attribute": state_data.get("editing_attribute"),
             "editing_value": social_page_link})
@@ -563,7 +559,7 @@ async def request_new_classroom(message: Message, state: FSMContext):
         prev_val = state_data.get("classroom")
         await state.update_data(editing_value=classroom)
         url_req = f"{settings.API_URL}/edit_teacher"
-        response = requests.post(url_req, json={
+        response = await api_client.post(url_req, json={
             "teacher_id": state_data.get("chosen_lecturer_id"),
             "editing_attribute": state_data.get("editing_attribute"),
             "editing_value": classroom})
@@ -605,47 +601,25 @@ async def add_teacher_by_api(callback_query: CallbackQuery, state: FSMContext):
     await callback_query.answer()
 
     state_data = await state.get_data()
-    url_req = f"{settings.API_URL}/get_user_group"
-    response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
+    response = await identity_cache.get(state_data.get("telegram_id"))
     if response.status_code == 200:
         group = response.json().get("group")
-        url_req = "https://petrsu.egipti.com/api/v2/schedule/{group}".format(group=group)
-        response = requests.get(url_req)
+        # Преподаватели берутся из пар расписания, сохраненных в API
+        response = await schedule_service.stored_schedule(group)
         if response.status_code == 200:
-            response_data = response.json()
-
-            lecturers = set()
-            for day in response_data['denominator']:
-                for lesson in day:
-                    if 'lecturer' in lesson:
-                        lecturers.add(lesson['lecturer'])
-
-            for day in response_data['numerator']:
-                for lesson in day:
-                    if 'lecturer' in lesson:
-                        lecturers.add(lesson['lecturer'])
-
-            lecturers_list = sorted(lecturers)
-
-            url_req = f"{settings.API_URL}/get_teachers"
-            response = requests.get(url_req, json={"user_id": state_data.get("user_id")})
-            if response.status_code == 200:
-                response_data = response.json()
-                teachers_names = {teacher["name"] for teacher in response_data.get("teachers", [])}
-                unique_lecturers = [lecturer for lecturer in lecturers_list if lecturer not in teachers_names]
-                if teachers_names:
-                    await state.update_data(lecturers=unique_lecturers)
-                    await callback_query.message.edit_text(
-                        _("Список преподавателей:"),
-                        reply_markup=kb.lecturers_list(unique_lecturers, page=0)
-                    )
-                else:
-                    await callback_query.message.edit_text(
-                        _("Преподавателей в расписании не найдено. Введите ФИО преподавателя вручную.")
-                    )
-                    await state.set_state(AddTeacherStates.waiting_for_FIO)
+            response = await open_picker(state, "/get_new_schedule_lecturers", {"user_id": state_data.get("user_id")},
+                                         "lecturers")
+        if response.status_code == 200:
+            if not await picker_is_empty(state):
+                await callback_query.message.edit_text(
+                    _("Список преподавателей:"),
+                    reply_markup=await picker_keyboard(state, kb.lecturers_list)
+                )
             else:
-                await callback_query.message.answer(json.loads(response.text).get('detail'))
+                await callback_query.message.edit_text(
+                    _("Преподавателей в расписании не найдено. Введите ФИО преподавателя вручную.")
+                )
+                await state.set_state(AddTeacherStates.waiting_for_FIO)
         else:
             await callback_query.message.answer(json.loads(response.text).get('detail'))
     else:
@@ -654,28 +628,32 @@ async def add_teacher_by_api(callback_query: CallbackQuery, state: FSMContext):
 
 @router.callback_query(F.data.startswith("lecturers_page_"))
 async def handle_pagination(callback_query: CallbackQuery, state: FSMContext):
+    response = await load_picker_page(state, int(callback_query.data.split("_")[-1]))
+    if response is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
     await callback_query.answer()
-    state_data = await state.get_data()
-    lecturers = state_data.get("lecturers", [])
-
-    page = int(callback_query.data.split("_")[-1])
-    await state.update_data(current_page=page)
-
-    await callback_query.message.edit_reply_markup(
-        reply_markup=kb.lecturers_list(lecturers, page=page)
-    )
+    if response.status_code == 200:
+        await callback_query.message.edit_reply_markup(
+            reply_markup=await picker_keyboard(state, kb.lecturers_list)
+        )
+    else:
+        await callback_query.message.answer(json.loads(response.text).get('detail'))
 
 
 @router.callback_query(F.data.startswith("lecturer_index_"))
 async def add_teacher_by_api_phone(callback_query: CallbackQuery, state: FSMContext):
+    selected_lecturer = await picker_item(state, int(callback_query.data.split("_")[-1]))
+    if selected_lecturer is None:
+        await callback_query.answer(_("Список устарел, откройте его заново."), show_alert=True)
+        return
     await callback_query.answer()
-    state_data = await state.get_data()
-    lecturers = state_data.get("lecturers", [])
 
-    lecturer_index = int(callback_query.data.split("_")[-1])
-    selected_lecturer = lecturers[lecturer_index]
-
-    await state.update_data(name=selected_lecturer)
+    # В списке преподавателей пользователя элемент - преподаватель, в списке из расписания - его ФИО
+    if await state.get_state() == ShowTeacherStates.showing_list:
+        await state.update_data(name=selected_lecturer["name"])
+    else:
+        await state.update_data(name=selected_lecturer)
     await state.update_data(is_from_api=True)
 
     if await state.get_state() != ShowTeacherStates.showing_list:
@@ -686,12 +664,11 @@ async def add_teacher_by_api_phone(callback_query: CallbackQuery, state: FSMCont
         await state.set_state(AddTeacherStates.waiting_for_phone_number)
 
     elif await state.get_state() == ShowTeacherStates.showing_list:
-        lecturers_id = state_data.get("lecturers_id")
         url_req = f"{settings.API_URL}/get_teacher"
-        response = requests.get(url_req, json={"teacher_id": lecturers_id[int(lecturer_index)]})
+        response = await api_client.get(url_req, json={"teacher_id": selected_lecturer["teacher_id"]})
         if response.status_code == 200:
             response_data = response.json()
-            await state.update_data(chosen_lecturer_id=lecturers_id[int(lecturer_index)])
+            await state.update_data(chosen_lecturer_id=selected_lecturer["teacher_id"])
             await state.update_data(chosen_lecturer_name=response_data.get("name"))
             await state.update_data(chosen_lecturer_phone=response_data.get("phone_number"))
             await state.update_data(chosen_lecturer_email=response_data.get("email"))
@@ -721,23 +698,16 @@ async def add_teacher_start(message: Message, state: FSMContext):
     await state.set_state(ShowTeacherStates.showing_list)
 
     state_data = await state.get_data()
-    url_req = f"{settings.API_URL}/get_user_id"
-    response = requests.get(url_req, json={"telegram_id": state_data.get("telegram_id")})
+    response = await identity_cache.get(state_data.get("telegram_id"))
 
     if response.status_code == 200:
         user_id = response.json().get("user_id")
-        url_req = f"{settings.API_URL}/get_teachers"
-        response = requests.get(url_req, json={"user_id": user_id})
         await state.update_data(user_id=user_id)
+        response = await open_picker(state, "/get_teachers", {"user_id": user_id}, "teachers", "name")
         if response.status_code == 200:
-            response_data = response.json()
-            sorted_teachers = sorted(response_data.get("teachers"), key=lambda x: x["name"])
-            lecturers_dict = {teacher["teacher_id"]: teacher["name"] for teacher in sorted_teachers}
-            await state.update_data(lecturers=list(lecturers_dict.values()))
-            await state.update_data(lecturers_id=list(lecturers_dict.keys()))
             await message.answer(
                 _("Список преподавателей:"),
-                reply_markup=kb.lecturers_list(list(lecturers_dict.values()), page=0)
+                reply_markup=await picker_keyboard(state, kb.lecturers_list)
             )
         else:
             await message.answer(json.loads(response.text).get('detail'))
@@ -755,7 +725,7 @@ async def edit_teacher(callback_query: CallbackQuery, state: FSMContext):
     )
     state_data = await state.get_data()
     url_req = f"{settings.API_URL}/get_teacher_api_status"
-    response = requests.get(url_req, json={"teacher_id": state_data.get("chosen_lecturer_id")})
+    response = await api_client.get(url_req, json={"teacher_id": state_data.get("chosen_lecturer_id")})
     if response.status_code == 200:
         response_data = response.json()
         api_status = response_data.get("is_from_API")
@@ -874,7 +844,7 @@ async def confirm_deleting(callback_query: CallbackQuery, state: FSMContext):
     await callback_query.answer()
     state_data = await state.get_data()
     url_req = f"{settings.API_URL}/delete_teacher"
-    response = requests.delete(url_req, json={"teacher_id": state_data.get("chosen_lecturer_id")})
+    response = await api_client.delete(url_req, json={"teacher_id": state_data.get("chosen_lecturer_id")})
     if response.status_code == 200:
         await callback_query.message.bot.delete_message(
             chat_id=callback_query.message.chat.id,
@@ -0,0 +1,62 @@
+"""
+Кэш данных пользователя по Telegram ID: user_id, статус студента ПетрГУ и группа.
+user_id не меняется после регистрации, поэтому обработчикам не нужно запрашивать его у API при каждом действии.
+Статус и группа обновляются в кэше при их изменении в настройках
+"""
+import json
+import time
+from collections import OrderedDict
+
+from bot.src.api_client import api_client, ApiResponse
+from .settings import settings
+
+
+class IdentityCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._identities: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    async def get(self, telegram_id) -> ApiResponse:
+        """
+        Возвращает ответ в том же виде, что и /get_user_identity: user_id, is_petrsu_student и group.
+        Запрос к API выполняется, только если данных нет в кэше или срок их хранения истек.
+        Ответы с ошибкой не кэшируются.
+        """
+        telegram_id = str(telegram_id)
+        entry = self._identities.get(telegram_id)
+        if entry is not None:
+            expires_at, identity = entry
+            if expires_at > time.monotonic():
+                self._identities.move_to_end(telegram_id)
+                return ApiResponse(200, json.dumps(identity))
+            del self._identities[telegram_id]
+
+        url_req = f"{settings.API_URL}/get_user_identity"
+        response = await api_client.get(url_req, json={"telegram_id": telegram_id})
+        if response.status_code == 200:
+            self._remember(telegram_id, response.json())
+        return response
+
+    def update(self, telegram_id, **fields):
+        """
+        Изменяет сохраненные поля после успешного изменения данных пользователя через API.
+        """
+        entry = self._identities.get(str(telegram_id))
+        if entry is not None:
+            entry[1].update(fields)
+
+    def invalidate(self, telegram_id):
+        self._identities.pop(str(telegram_id), None)
+
+    def _remember(self, telegram_id: str, identity: dict):
+        self._identities[telegram_id] = (time.monotonic() + self.ttl, identity)
+        self._identities.move_to_end(telegram_id)
+        while len(self._identities) > self.max_entries:
+            self._identities.popitem(last=False)
+
+
+identity_cache = IdentityCache(
+    ttl=settings.IDENTITY_CACHE_TTL,
+    max_entries=settings.IDENTITY_CACHE_MAX_ENTRIES,
+)
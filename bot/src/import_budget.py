@@ -0,0 +1,59 @@
+"""
+Проверка времени запуска бота: импорт модулей бота должен укладываться в IMPORT_TIME_BUDGET
+и не загружать тяжелые пакеты, которые нужны только диаграммам и ИИ-помощнику.
+
+Запуск проверки в отдельном интерпретаторе: python -m bot.src.import_budget
+"""
+import json
+import logging
+import subprocess
+import sys
+
+from .settings import settings
+
+# Пакеты, которые загружаются только в процессах пула отрисовки или при первом запросе к ИИ-помощнику
+DEFERRED_MODULES = ("matplotlib", "numpy", "openai")
+
+
+def loaded_deferred_modules() -> list[str]:
+    return [name for name in DEFERRED_MODULES if name in sys.modules]
+
+
+def check_import_budget(import_time: float) -> bool:
+    """
+    Пишет предупреждение в лог, если импорт длился дольше бюджета или загрузил отложенные пакеты.
+    """
+    loaded = loaded_deferred_modules()
+    if loaded:
+        logging.warning("При запуске бота загружены пакеты, импорт которых должен быть отложен: %s",
+                        ", ".join(loaded))
+    if import_time > settings.IMPORT_TIME_BUDGET:
+        logging.warning("Импорт модулей бота занял %.2f с при бюджете %.2f с",
+                        import_time, settings.IMPORT_TIME_BUDGET)
+    return not loaded and import_time <= settings.IMPORT_TIME_BUDGET
+
+
+def measure_import() -> dict:
+    """
+    Импортирует bot.src.main в чистом интерпретаторе, чтобы на результат не влияли уже загруженные модули.
+    """
+    code = (
+        "import json, sys, time\n"
+        "started_at = time.perf_counter()\n"
+        "import bot.src.main\n"
+        "import_time = time.perf_counter() - started_at\n"
+        "from bot.src.import_budget import loaded_deferred_modules\n"
+        "print(json.dumps({'import_time': import_time, 'loaded': loaded_deferred_modules()}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    result = measure_import()
+    print(f"Импорт bot.src.main: {result['import_time']:.2f} с (бюджет {settings.IMPORT_TIME_BUDGET:.2f} с)")
+    if result["loaded"]:
+        print("Загружены отложенные пакеты: " + ", ".join(result["loaded"]))
+    ok = not result["loaded"] and result["import_time"] <= settings.IMPORT_TIME_BUDGET
+    sys.exit(0 if ok else 1)
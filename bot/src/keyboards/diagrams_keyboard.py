@@ -10,6 +10,7 @@ def choose_gant_diagram():
     builder.button(text=_("Общая"), callback_data="gant_full")
     builder.button(text=_("Месяц"), callback_data="gant_month")
     builder.button(text=_("Три недели"), callback_data="gant_three_weeks")
+    builder.button(text=_("Все диаграммы в PDF"), callback_data="gant_pdf")
     builder.adjust(1)
     return builder.as_markup()
 
@@ -26,15 +26,14 @@ def add_option():
     return builder.as_markup()
 
 
-def disciplines_list(disciplines, page: int = 0, items_per_page: int = 5):
+def disciplines_list(disciplines, page: int = 0, has_next: bool = False):
+    """
+    Клавиатура одной страницы списка дисциплин, disciplines содержит только названия дисциплин этой страницы.
+    """
     builder = InlineKeyboardBuilder()
 
-    start_idx = page * items_per_page
-    end_idx = start_idx + items_per_page
-    current_page_disciplines = disciplines[start_idx:end_idx]
-
-    for i, discipline in enumerate(current_page_disciplines, start=start_idx):
-        builder.button(text=_("{discipline}".format(discipline=disciplines[i])), callback_data=f"discipline_index_{i}"
+    for i, discipline in enumerate(disciplines):
+        builder.button(text=_("{discipline}".format(discipline=discipline)), callback_data=f"discipline_index_{i}"
     )
 
     navigation_buttons = []
@@ -44,7 +43,7 @@ def disciplines_list(disciplines, page: int = 0, items_per_page: int = 5):
             back_d_list(page)
         )
 
-    if end_idx < len(disciplines):
+    if has_next:
         navigation_buttons.append(
             continue_d_list(page)
         )
@@ -93,20 +92,18 @@ def confirm_delete_discipline():
     return builder.as_markup()
 
 
-def lecturers_list(lecturers, page: int = 0, items_per_page: int = 5, state: str = None):
+def lecturers_list(lecturers, page: int = 0, has_next: bool = False, state: str = None):
+    """
+    Клавиатура одной страницы списка преподавателей, lecturers содержит только ФИО преподавателей этой страницы.
+    """
     builder = InlineKeyboardBuilder()
 
-    start_idx = page * items_per_page
-    end_idx = start_idx + items_per_page
-    current_page_lecturers = lecturers[start_idx:end_idx]
-
-    print("keyboard", state)
     if str(state) == "EditDisciplineStates:editing_teacher":
         builder.button(text=_("Отмена"), callback_data="cancel_editing_attr_discipline")
     else:
         builder.button(text=_("Пропустить"), callback_data="skip_disciplines_lecturer")
-    for i, lecturer in enumerate(current_page_lecturers, start=start_idx):
-        builder.button(text=_("{lecturer}".format(lecturer=lecturers[i])), callback_data=f"disciplines_lecturer_index_{i}"
+    for i, lecturer in enumerate(lecturers):
+        builder.button(text=_("{lecturer}".format(lecturer=lecturer)), callback_data=f"disciplines_lecturer_index_{i}"
     )
 
     navigation_buttons = []
@@ -116,7 +113,7 @@ def lecturers_list(lecturers, page: int = 0, items_per_page: int = 5, state: str
             back_t_list(page)
         )
 
-    if end_idx < len(lecturers):
+    if has_next:
         navigation_buttons.append(
             continue_t_list(page)
         )
@@ -117,15 +117,14 @@ def status_option():
     return builder.as_markup()
 
 
-def disciplines_list(disciplines, page: int = 0, items_per_page: int = 5):
+def disciplines_list(disciplines, page: int = 0, has_next: bool = False):
+    """
+    Клавиатура одной страницы списка дисциплин, disciplines содержит только названия дисциплин этой страницы.
+    """
     builder = InlineKeyboardBuilder()
 
-    start_idx = page * items_per_page
-    end_idx = start_idx + items_per_page
-    current_page_disciplines = disciplines[start_idx:end_idx]
-
-    for i, discipline in enumerate(current_page_disciplines, start=start_idx):
-        builder.button(text=_("{discipline}".format(discipline=disciplines[i])),
+    for i, discipline in enumerate(disciplines):
+        builder.button(text=_("{discipline}".format(discipline=discipline)),
                        callback_data=f"lab_discipline_index_{i}"
                        )
 
@@ -136,7 +135,7 @@ def disciplines_list(disciplines, page: int = 0, items_per_page: int = 5):
             back_d_list(page)
         )
 
-    if end_idx < len(disciplines):
+    if has_next:
         navigation_buttons.append(
             continue_d_list(page)
         )
@@ -243,26 +242,25 @@ def generate_abbreviation(full_name):
 #     return builder.as_markup()
 
 
-def labs_list(labs, disciplines_dict, show_abb, page: int = 0, items_per_page: int = 5):
+def labs_list(labs, disciplines_dict, show_abb, page: int = 0, has_next: bool = False):
+    """
+    Клавиатура одной страницы списка заданий. Страница запрашивается у API, поэтому labs содержит только ее задания.
+    """
     builder = InlineKeyboardBuilder()
 
-    start_idx = page * items_per_page
-    end_idx = start_idx + items_per_page
-    current_page_labs = labs[start_idx:end_idx]
-
     builder.button(text=_("Назад"), callback_data="back_to_options")
 
-    for i, lab in enumerate(current_page_labs, start=start_idx):
+    for lab in labs:
         if show_abb:
             builder.button(text=_("{abb} - {date} - {lab}"
                                   .format(abb=generate_abbreviation(disciplines_dict[lab["discipline_id"]]),
                                           date=datetime.strptime(lab["end_date"], "%Y-%m-%d").strftime("%d.%m.%Y"),
-                                          lab=labs[i]["name"])),
+                                          lab=lab["name"])),
                            callback_data=f'lab_index_{lab["task_id"]}'
                            )
         else:
             builder.button(text=_("{date} - {lab}".format(
-                lab=labs[i]["name"],
+                lab=lab["name"],
                 date=datetime.strptime(lab["end_date"], "%Y-%m-%d").strftime("%d.%m.%Y"),
             )),
                 callback_data=f'lab_index_{lab["task_id"]}'
@@ -275,7 +273,7 @@ def labs_list(labs, disciplines_dict, show_abb, page: int = 0, items_per_page: i
             back_l_list(page)
         )
 
-    if end_idx < len(labs):
+    if has_next:
         navigation_buttons.append(
             continue_l_list(page)
         )
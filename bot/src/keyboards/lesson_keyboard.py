@@ -8,6 +8,7 @@ from aiogram.utils.i18n import lazy_gettext as __
 from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
 
 from api.src.models import Status
+from bot.src.recurrence import next_occurrence
 
 
 def add_lesson_confirm():
@@ -92,15 +93,14 @@ def lesson_edit_menu():
     return builder.as_markup()
 
 
-def disciplines_list(disciplines, page: int = 0, items_per_page: int = 5):
+def disciplines_list(disciplines, page: int = 0, has_next: bool = False):
+    """
+    Клавиатура одной страницы списка дисциплин, disciplines содержит только названия дисциплин этой страницы.
+    """
     builder = InlineKeyboardBuilder()
 
-    start_idx = page * items_per_page
-    end_idx = start_idx + items_per_page
-    current_page_disciplines = disciplines[start_idx:end_idx]
-
-    for i, discipline in enumerate(current_page_disciplines, start=start_idx):
-        builder.button(text=_("{discipline}".format(discipline=disciplines[i])),
+    for i, discipline in enumerate(disciplines):
+        builder.button(text=_("{discipline}".format(discipline=discipline)),
                        callback_data=f"lesson_discipline_index_{i}"
                        )
 
@@ -111,7 +111,7 @@ def disciplines_list(disciplines, page: int = 0, items_per_page: int = 5):
             back_d_list(page)
         )
 
-    if end_idx < len(disciplines):
+    if has_next:
         navigation_buttons.append(
             continue_d_list(page)
         )
@@ -216,24 +216,26 @@ def generate_abbreviation(full_name):
     return abbreviation
 
 
-def lessons_list(lessons, disciplines_dict, page: int = 0, items_per_page: int = 5):
+def lessons_list(lessons, disciplines_dict, page: int = 0, has_next: bool = False):
+    """
+    Клавиатура одной страницы списка занятий. Страница запрашивается у API, поэтому lessons содержит только ее занятия.
+    """
     builder = InlineKeyboardBuilder()
+    today = date.today()
 
-    start_idx = page * items_per_page
-    end_idx = start_idx + items_per_page
-    current_page_lessons = lessons[start_idx:end_idx]
-
-    for i, lesson in enumerate(current_page_lessons, start=start_idx):
+    for lesson in lessons:
         abb = generate_abbreviation(disciplines_dict[lesson["discipline_id"]])
-        date = datetime.strptime(lesson["start_date"], "%Y-%m-%d").strftime("%d.%m.%Y")
-        time = f"{lessons[i]['start_time'][:-3]} - {lessons[i]['end_time'][:-3]}"
+        start_date = datetime.strptime(lesson["start_date"], "%Y-%m-%d").date()
+        time = f"{lesson['start_time'][:-3]} - {lesson['end_time'][:-3]}"
 
         # Формирование текста в зависимости от условия
         if int(lesson["periodicity_days"]) != 0:
+            # Для повторяющегося занятия показывается ближайшая дата
+            next_date = next_occurrence(start_date, int(lesson["periodicity_days"]), today)
             text = _("{abb} - {date}, раз в {days} дней, {time}").format(
-                abb=abb, date=date, days=lesson["periodicity_days"], time=time)
+                abb=abb, date=next_date.strftime("%d.%m.%Y"), days=lesson["periodicity_days"], time=time)
         else:
-            text = _("{abb} - {date}, {time}").format(abb=abb, date=date, time=time)
+            text = _("{abb} - {date}, {time}").format(abb=abb, date=start_date.strftime("%d.%m.%Y"), time=time)
 
         builder.button(
             text=text,
@@ -247,7 +249,7 @@ def lessons_list(lessons, disciplines_dict, page: int = 0, items_per_page: int =
             back_l_list(page)
         )
 
-    if end_idx < len(lessons):
+    if has_next:
         navigation_buttons.append(
             continue_l_list(page)
         )
@@ -36,15 +36,14 @@ def add_option():
     return builder.as_markup()
 
 
-def lecturers_list(lecturers, page: int = 0, items_per_page: int = 5):
+def lecturers_list(lecturers, page: int = 0, has_next: bool = False):
+    """
+    Клавиатура одной страницы списка преподавателей, lecturers содержит только ФИО преподавателей этой страницы.
+    """
     builder = InlineKeyboardBuilder()
 
-    start_idx = page * items_per_page
-    end_idx = start_idx + items_per_page
-    current_page_lecturers = lecturers[start_idx:end_idx]
-
-    for i, lecturer in enumerate(current_page_lecturers, start=start_idx):
-        builder.button(text=_("{lecturer}".format(lecturer=lecturers[i])), callback_data=f"lecturer_index_{i}"
+    for i, lecturer in enumerate(lecturers):
+        builder.button(text=_("{lecturer}".format(lecturer=lecturer)), callback_data=f"lecturer_index_{i}"
     )
 
     navigation_buttons = []
@@ -54,7 +53,7 @@ def lecturers_list(lecturers, page: int = 0, items_per_page: int = 5):
             back_list(page)
         )
 
-    if end_idx < len(lecturers):
+    if has_next:
         navigation_buttons.append(
             continue_list(page)
         )
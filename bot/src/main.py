@@ -1,3 +1,6 @@
+import time
+_import_started_at = time.perf_counter()
+
 import asyncio
 import logging
 import sys
@@ -15,6 +18,16 @@ from .handlers import main_bot_handler as main_handler, settings_bot_handler as
     lab_bot_handler as lab_handler, lesson_bot_handler as lesson_handler, diagrams_bot_handler as diagram_handler
 
 from bot.src.bot_unit import bot as bot_unit
+from bot.src.api_client import api_client
+from bot.src.upload_spool import upload_spool
+from bot.src.fsm_storage import create_storage
+from bot.src.webhook import run_webhook
+from bot.src.chart_renderer import chart_renderer
+from bot.src.schedule_prefetch import schedule_prefetcher
+from bot.src import deepseek
+from bot.src.import_budget import check_import_budget
+
+IMPORT_TIME = time.perf_counter() - _import_started_at
 
 TOKEN = settings.BOT_TOKEN
 
@@ -24,10 +37,31 @@ class BotI18nMiddleware(I18nMiddleware):
         return 'ru'
 
 
+warm_up_tasks = set()
+
+
+async def run_warm_up(warm_up):
+    try:
+        await warm_up()
+    except Exception as e:
+        logging.exception(e)
+
+
+async def start_warm_up():
+    """
+    Загружает модули диаграмм и ИИ-помощника в фоне, не задерживая начало обработки обновлений.
+    """
+    for warm_up in (chart_renderer.warm_up, deepseek.warm_up):
+        task = asyncio.create_task(run_warm_up(warm_up))
+        warm_up_tasks.add(task)
+        task.add_done_callback(warm_up_tasks.discard)
+
+
 async def main() -> None:
     bot = bot_unit
+    check_import_budget(IMPORT_TIME)
 
-    dp = Dispatcher()
+    dp = Dispatcher(storage=create_storage())
 
     # Настройка i18n
     i18n = I18n(path="locales", default_locale="ru", domain="messages")
@@ -48,8 +82,22 @@ async def main() -> None:
     dp.include_routers(lesson_handler.router)
     dp.include_routers(diagram_handler.router)
 
+    # Очистка брошенных загрузок, фоновая загрузка расписания, закрытие пула HTTP-соединений и пула отрисовки диаграмм
+    dp.startup.register(upload_spool.start)
+    if settings.STARTUP_WARM_UP:
+        dp.startup.register(start_warm_up)
+    if settings.SCHEDULE_PREFETCH:
+        dp.startup.register(schedule_prefetcher.start)
+    dp.shutdown.register(upload_spool.stop)
+    dp.shutdown.register(schedule_prefetcher.stop)
+    dp.shutdown.register(api_client.close)
+    dp.shutdown.register(chart_renderer.close)
+
     # logger.info("Запуск бота...")
-    await dp.start_polling(bot)
+    if settings.BOT_MODE == "webhook":
+        await run_webhook(dp, bot)
+    else:
+        await dp.start_polling(bot)
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, stream=sys.stdout)
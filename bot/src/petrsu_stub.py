@@ -0,0 +1,95 @@
+"""
+Локальная замена API расписания ПетрГУ для разработки и проверки кэша расписания без обращения к внешнему сервису.
+Отдает /groups и /schedule/{group} из каталога с данными (groups.json и schedule/<группа>.json)
+или сгенерированное расписание, если каталог не указан. /stats показывает число запросов расписания по группам.
+
+Запуск: python -m bot.src.petrsu_stub --port 8081 [--data каталог] [--delay секунды]
+и PETRSU_API_URL=http://localhost:8081 в .env бота
+"""
+import argparse
+import asyncio
+import json
+import os
+from collections import Counter
+from datetime import date, timedelta
+
+from aiohttp import web
+
+SAMPLE_GROUPS = ("22107", "22207", "22307")
+SAMPLE_PAIRS = (
+    ("Математический анализ", "Иванов Иван Иванович", "Лекция"),
+    ("Математический анализ", "Петров Петр Петрович", "Практическое занятие"),
+    ("Программирование", "Сидорова Анна Сергеевна", "Лабораторная работа"),
+)
+
+
+def sample_schedule(group: str, today: date) -> dict:
+    """
+    Расписание на две недели от понедельника текущей недели: по одной паре каждого вида в будние дни.
+    """
+    monday = today - timedelta(days=today.weekday())
+    weeks = {}
+    for week_name, week_start in (("numerator", monday), ("denominator", monday + timedelta(weeks=1))):
+        days = []
+        for day in range(5):
+            day_date = week_start + timedelta(days=day)
+            title, lecturer, lesson_type = SAMPLE_PAIRS[day % len(SAMPLE_PAIRS)]
+            days.append([{"title": title, "lecturer": lecturer, "type": lesson_type,
+                          "date": day_date.strftime("%d.%m.%Y"), "start_time": "10:00", "end_time": "11:35",
+                          "classroom": "201", "group": group}])
+        weeks[week_name] = days
+    return weeks
+
+
+class PetrsuStub:
+    def __init__(self, data_path: str | None = None, delay: float = 0.0):
+        self.data_path = data_path
+        self.delay = delay
+        self.requests = Counter()
+
+    def _read(self, *parts: str):
+        try:
+            with open(os.path.join(self.data_path, *parts), "r", encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    async def groups(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(self.delay)
+        if self.data_path:
+            groups = self._read("groups.json") or {}
+        else:
+            groups = {group: {"name": group} for group in SAMPLE_GROUPS}
+        return web.json_response(groups)
+
+    async def schedule(self, request: web.Request) -> web.Response:
+        group = request.match_info["group"]
+        self.requests[group] += 1
+        await asyncio.sleep(self.delay)
+        if self.data_path:
+            schedule = self._read("schedule", f"{group}.json")
+        else:
+            schedule = sample_schedule(group, date.today()) if group in SAMPLE_GROUPS else None
+        if schedule is None:
+            return web.json_response({"detail": f"Группа {group} не найдена"}, status=404)
+        return web.json_response(schedule)
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.requests))
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/groups", self.groups)
+        app.router.add_get("/schedule/{group}", self.schedule)
+        app.router.add_get("/stats", self.stats)
+        return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальная замена API расписания ПетрГУ")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--data", default=None, help="каталог с groups.json и schedule/<группа>.json")
+    parser.add_argument("--delay", type=float, default=0.0, help="задержка ответа в секундах")
+    args = parser.parse_args()
+    web.run_app(PetrsuStub(args.data, args.delay).create_app(), host=args.host, port=args.port)
@@ -0,0 +1,71 @@
+"""
+Постраничный выбор дисциплины или преподавателя с клавиатуры.
+Страница списка запрашивается у API по курсору, поэтому в состоянии хранятся только параметры запроса,
+курсоры уже открытых страниц и элементы текущей страницы, а не весь список
+"""
+from aiogram.fsm.context import FSMContext
+
+from bot.src.api_client import api_client, ApiResponse
+from .settings import settings
+
+PICKER_PAGE_SIZE = 5
+
+
+async def open_picker(state: FSMContext, endpoint: str, params: dict, items_key: str,
+                      label_key: str | None = None) -> ApiResponse:
+    """
+    Начинает выбор из списка, который возвращает endpoint API (например, /get_disciplines), и загружает
+    его первую страницу. Элементы берутся из поля items_key ответа, текст кнопки - из поля label_key элемента
+    или сам элемент, если label_key не указан.
+    """
+    await state.update_data(picker={"endpoint": endpoint, "params": params, "items_key": items_key,
+                                    "label_key": label_key, "cursors": [None], "items": [], "page": 0,
+                                    "has_next": False})
+    return await load_picker_page(state, 0)
+
+
+async def load_picker_page(state: FSMContext, page: int) -> ApiResponse | None:
+    """
+    Загружает страницу page открытого списка.
+    None, если курсор страницы неизвестен: кнопка нажата в сообщении списка, который уже закрыт или открыт заново.
+    """
+    picker = (await state.get_data()).get("picker")
+    if not picker or page >= len(picker["cursors"]):
+        return None
+    cursors = picker["cursors"]
+    url_req = f"{settings.API_URL}{picker['endpoint']}"
+    response = await api_client.get(url_req, json={**picker["params"], "cursor": cursors[page],
+                                                   "limit": PICKER_PAGE_SIZE})
+    if response.status_code == 200:
+        response_data = response.json()
+        next_cursor = response_data["next_cursor"]
+        if next_cursor is not None and len(cursors) == page + 1:
+            cursors.append(next_cursor)
+        picker.update(cursors=cursors, items=response_data[picker["items_key"]], page=page,
+                      has_next=next_cursor is not None)
+        await state.update_data(picker=picker)
+    return response
+
+
+async def picker_keyboard(state: FSMContext, keyboard, **options):
+    """
+    Клавиатура keyboard (например, disciplines_list) с элементами текущей страницы открытого списка.
+    """
+    picker = (await state.get_data())["picker"]
+    labels = [item[picker["label_key"]] if picker["label_key"] else item for item in picker["items"]]
+    return keyboard(labels, page=picker["page"], has_next=picker["has_next"], **options)
+
+
+async def picker_is_empty(state: FSMContext) -> bool:
+    picker = (await state.get_data())["picker"]
+    return picker["page"] == 0 and not picker["items"]
+
+
+async def picker_item(state: FSMContext, index: int):
+    """
+    Элемент текущей страницы по номеру кнопки или None, если список уже закрыт.
+    """
+    picker = (await state.get_data()).get("picker")
+    if not picker or not 0 <= index < len(picker["items"]):
+        return None
+    return picker["items"][index]
@@ -0,0 +1,73 @@
+"""
+Даты повторяющихся занятий. Занятие проходит в start_date и затем каждые periodicity_days дней
+(periodicity_days = 0 - единичное занятие). Даты в окне вычисляются сразу, без перебора прошедших повторений.
+
+numpy импортируется только в occurrences_array, которая используется в процессах пула отрисовки,
+чтобы не загружать его при запуске бота
+"""
+from datetime import date, timedelta
+
+
+def week_window(today: date, weeks: int = 3) -> tuple[date, date]:
+    """
+    Окно недельной диаграммы Ганта: с понедельника прошлой недели на weeks недель, обе границы включительно.
+    """
+    start_monday = today - timedelta(days=today.weekday() + 7)
+    return start_monday, start_monday + timedelta(weeks=weeks)
+
+
+def first_index(start_date: date, periodicity_days: int, window_start: date) -> int:
+    """
+    Номер первого повторения не раньше window_start.
+    """
+    days_before = (window_start - start_date).days
+    if periodicity_days == 0 or days_before <= 0:
+        return 0
+    return -(-days_before // periodicity_days)
+
+
+def occurrences(start_date: date, periodicity_days: int, window_start: date, window_end: date) -> list[date]:
+    """
+    Даты занятия с window_start по window_end включительно.
+    """
+    if periodicity_days == 0:
+        return [start_date] if window_start <= start_date <= window_end else []
+    current_date = start_date + timedelta(days=first_index(start_date, periodicity_days, window_start)
+                                          * periodicity_days)
+    count = max((window_end - current_date).days // periodicity_days + 1, 0)
+    return [current_date + timedelta(days=i * periodicity_days) for i in range(count)]
+
+
+def next_occurrence(start_date: date, periodicity_days: int, today: date) -> date | None:
+    """
+    Ближайшая дата занятия не раньше today или None, если единичное занятие уже прошло.
+    """
+    if periodicity_days == 0:
+        return start_date if start_date >= today else None
+    return start_date + timedelta(days=first_index(start_date, periodicity_days, today) * periodicity_days)
+
+
+def occurrences_array(start_dates, periodicities, window_start: date, window_end: date):
+    """
+    Даты всех занятий в окне одним вычислением над массивами.
+    Возвращает массив номеров занятий и массив дат (datetime64[D]) одинаковой длины,
+    даты каждого занятия идут подряд по возрастанию.
+    """
+    import numpy as np
+
+    starts = np.asarray(start_dates, dtype="datetime64[D]")
+    periods = np.asarray(periodicities, dtype=np.int64)
+    window_start = np.datetime64(window_start, "D")
+    window_end = np.datetime64(window_end, "D")
+
+    periodic = periods > 0
+    # Шаг 1 для единичных занятий исключает деление на ноль, их число дат ограничивается одной ниже
+    steps = np.where(periodic, periods, 1)
+    days_before = (window_start - starts).astype(np.int64)
+    first = starts + np.where(periodic & (days_before > 0), -(-days_before // steps), 0) * steps
+    counts = np.where(first <= window_end, (window_end - first).astype(np.int64) // steps + 1, 0)
+    counts = np.where(periodic, counts, (starts >= window_start) & (starts <= window_end))
+
+    lesson_index = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return lesson_index, first[lesson_index] + offsets * steps[lesson_index]
@@ -0,0 +1,87 @@
+"""
+Фоновое обновление расписания всех групп студентов, зарегистрированных в боте.
+Расписание загружается в кэш schedule_service заранее, поэтому открытие меню не ждет ответа API ПетрГУ.
+
+Кроме запуска вместе с ботом возможен отдельный процесс: python -m bot.src.schedule_prefetch.
+Тогда бот и этот процесс должны использовать общий каталог SCHEDULE_CACHE_PATH
+"""
+import asyncio
+import logging
+import random
+import sys
+
+from bot.src.api_client import api_client
+from bot.src.schedule_service import schedule_service
+from .settings import settings
+
+
+class SchedulePrefetcher:
+    def __init__(self, interval: float, concurrency: int, jitter: float):
+        self.interval = interval
+        self.concurrency = concurrency
+        self.jitter = jitter
+        self._task: asyncio.Task | None = None
+
+    async def get_groups(self) -> list[str]:
+        url_req = f"{settings.API_URL}/get_student_groups"
+        response = await api_client.get(url_req)
+        if response.status_code != 200:
+            logging.warning("Не удалось получить список групп для загрузки расписания: %s", response.status_code)
+            return []
+        return response.json().get("groups", [])
+
+    async def _refresh_group(self, group: str, semaphore: asyncio.Semaphore) -> bool:
+        # Случайная задержка распределяет запросы к API ПетрГУ во времени
+        await asyncio.sleep(random.uniform(0, self.jitter))
+        async with semaphore:
+            response = await schedule_service.refresh(schedule_service.schedule_path(group))
+        return response.status_code == 200
+
+    async def prefetch(self) -> int:
+        """
+        Загружает расписание всех групп, не более concurrency запросов одновременно. Возвращает число обновленных групп.
+        """
+        groups = await self.get_groups()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._refresh_group(group, semaphore) for group in groups),
+                                       return_exceptions=True)
+        refreshed = sum(result is True for result in results)
+        if refreshed < len(groups):
+            logging.warning("Расписание обновлено для %d из %d групп", refreshed, len(groups))
+        return refreshed
+
+    async def run(self):
+        while True:
+            try:
+                await self.prefetch()
+            except Exception as e:
+                logging.exception(e)
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+schedule_prefetcher = SchedulePrefetcher(
+    interval=settings.SCHEDULE_PREFETCH_INTERVAL,
+    concurrency=settings.SCHEDULE_PREFETCH_CONCURRENCY,
+    jitter=settings.SCHEDULE_PREFETCH_JITTER,
+)
+
+
+async def main():
+    try:
+        await schedule_prefetcher.run()
+    finally:
+        await api_client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout)
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+"""
+Общий для всех пользователей кэш ответов API расписания ПетрГУ (список групп и расписание группы).
+Расписание одной группы запрашивается один раз для всех ее студентов: одновременные запросы ждут одну загрузку,
+а после истечения SCHEDULE_CACHE_TTL устаревший ответ отдается сразу, пока новый загружается в фоне.
+Загруженное расписание группы сохраняется в таблицу пар API, откуда обработчики получают пары и преподавателей
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from urllib.parse import quote, unquote
+
+import aiohttp
+
+from bot.src.api_client import api_client, ApiResponse
+from .settings import settings
+
+SCHEDULE_PREFIX = "/schedule/"
+# Расписание без пар: используется, когда расписание группы недоступно и в кэше его нет
+EMPTY_SCHEDULE = {"numerator": [], "denominator": []}
+
+
+class ScheduleService:
+    def __init__(self, base_url: str, ttl: float, stale_ttl: float, root: str | None = None):
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.root = root
+        self._responses: dict[str, tuple[float, str]] = {}
+        self._fetches: dict[str, asyncio.Task] = {}
+        # Хэши расписаний, уже сохраненных в API, по группам
+        self._ingested: dict[str, str] = {}
+        # Идущие в фоне сохранения расписания в API по группам, ссылки хранятся, чтобы задачи не удалил сборщик мусора
+        self._ingests: dict[str, asyncio.Task] = {}
+
+    async def get(self, path: str) -> ApiResponse:
+        """
+        Возвращает ответ API расписания для path.
+        Свежий ответ берется из кэша, устаревший не более чем на stale_ttl отдается сразу с обновлением в фоне.
+        Если сервис недоступен, возвращается последний сохраненный ответ любой давности.
+        """
+        entry = self._responses.get(path)
+        if entry is None or time.time() - entry[0] >= self.ttl:
+            # Ответ на диске может быть обновлен отдельным процессом фоновой загрузки
+            loaded = await asyncio.to_thread(self._load, path) if self.root else None
+            if loaded is not None and (entry is None or loaded[0] > entry[0]):
+                entry = self._responses[path] = loaded
+        if entry is not None:
+            fetched_at, text = entry
+            age = time.time() - fetched_at
+            if age < self.ttl:
+                return ApiResponse(200, text)
+            if age < self.stale_ttl:
+                self.refresh(path)
+                return ApiResponse(200, text)
+
+        # Ожидающий обработчик может быть отменен, общая загрузка при этом продолжается
+        response = await asyncio.shield(self.refresh(path))
+        if response.status_code != 200 and entry is not None:
+            return ApiResponse(200, entry[1])
+        return response
+
+    @staticmethod
+    def schedule_path(group: str) -> str:
+        return SCHEDULE_PREFIX + quote(str(group), safe="")
+
+    async def schedule(self, group: str) -> ApiResponse:
+        return await self.get(self.schedule_path(group))
+
+    async def groups(self) -> ApiResponse:
+        return await self.get("/groups")
+
+    async def get_schedule(self, group: str) -> dict:
+        """
+        Расписание группы в виде словаря или EMPTY_SCHEDULE, если его не удалось получить.
+        """
+        response = await self.schedule(group)
+        if response.status_code == 200:
+            return response.json()
+        return EMPTY_SCHEDULE
+
+    async def stored_schedule(self, group: str) -> ApiResponse:
+        """
+        Ответ расписания группы, после которого ее пары уже сохранены в API:
+        обработчики, читающие пары и преподавателей из API, ждут фоновое сохранение, если оно идет.
+        """
+        response = await self.schedule(group)
+        task = self._ingests.get(str(group))
+        if task is not None:
+            await asyncio.shield(task)
+        return response
+
+    def refresh(self, path: str) -> asyncio.Task:
+        """
+        Запускает загрузку path, если она еще не идет, и возвращает задачу загрузки.
+        """
+        task = self._fetches.get(path)
+        if task is None:
+            task = asyncio.create_task(self._fetch(path))
+            self._fetches[path] = task
+            task.add_done_callback(lambda _: self._fetches.pop(path, None))
+        return task
+
+    async def _fetch(self, path: str) -> ApiResponse:
+        try:
+            response = await api_client.get(self.base_url + path)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.warning("Сервис расписания ПетрГУ недоступен: %s", e)
+            return ApiResponse(503, json.dumps({"detail": "Сервис расписания ПетрГУ недоступен"},
+                                               ensure_ascii=False))
+        if response.status_code == 200:
+            self._responses[path] = (time.time(), response.text)
+            if self.root:
+                await asyncio.to_thread(self._store, path, response.text)
+            if path.startswith(SCHEDULE_PREFIX):
+                # Ответ отдается, не дожидаясь сохранения расписания в API
+                group = unquote(path[len(SCHEDULE_PREFIX):])
+                task = asyncio.create_task(self._ingest(group, response.text))
+                self._ingests[group] = task
+                task.add_done_callback(lambda _: self._forget_ingest(group, task))
+        return response
+
+    def _forget_ingest(self, group: str, task: asyncio.Task):
+        # Сохранение более нового ответа могло начаться раньше, чем завершилось это
+        if self._ingests.get(group) is task:
+            del self._ingests[group]
+
+    async def _ingest(self, group: str, text: str):
+        """
+        Сохраняет пары расписания группы в API, если расписание изменилось с прошлого сохранения.
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if self._ingested.get(group) == digest:
+            return
+        try:
+            schedule = json.loads(text)
+        except ValueError as e:
+            logging.warning("Сервис расписания ПетрГУ вернул не JSON для группы %s: %s", group, e)
+            return
+        url_req = f"{settings.API_URL}/update_schedule"
+        try:
+            response = await api_client.post(url_req, json={"group": group, "schedule": schedule})
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.warning("Не удалось сохранить расписание группы %s: %s", group, e)
+            return
+        if response.status_code == 200:
+            self._ingested[group] = digest
+        else:
+            logging.warning("Не удалось сохранить расписание группы %s: %s", group, response.status_code)
+
+    def _path(self, path: str) -> str:
+        return os.path.join(self.root, hashlib.sha256(path.encode("utf-8")).hexdigest() + ".json")
+
+    def _load(self, path: str) -> tuple[float, str] | None:
+        """
+        Читает ответ с диска. Время загрузки ответа - время изменения файла.
+        """
+        try:
+            with open(self._path(path), "r", encoding="utf-8") as file:
+                entry = (os.fstat(file.fileno()).st_mtime, file.read())
+        except FileNotFoundError:
+            return None
+        return entry
+
+    def _store(self, path: str, text: str):
+        os.makedirs(self.root, exist_ok=True)
+        file_path = self._path(path)
+        with open(file_path + ".tmp", "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(file_path + ".tmp", file_path)
+
+
+schedule_service = ScheduleService(
+    base_url=settings.PETRSU_API_URL,
+    ttl=settings.SCHEDULE_CACHE_TTL,
+    stale_ttl=settings.SCHEDULE_CACHE_STALE_TTL,
+    root=settings.SCHEDULE_CACHE_PATH,
+)
@@ -1,3 +1,4 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -8,6 +9,86 @@ class Settings(BaseSettings):
     API_URL: str
     openAI_API_KEY: str
 
+    # Параметры HTTP-клиента для запросов к API
+    API_TIMEOUT: float = 30.0
+    API_CONNECT_TIMEOUT: float = 5.0
+    API_POOL_SIZE: int = 100
+    API_POOL_SIZE_PER_HOST: int = 30
+    API_KEEPALIVE_TIMEOUT: float = 30.0
+    API_MAX_CONCURRENCY: int = 50
+
+    # Повторная отправка файлов заданий по идентификатору Telegram вместо загрузки содержимого
+    REUSE_TELEGRAM_FILE_ID: bool = True
+
+    # Временное хранилище прикрепленных файлов до сохранения задания (по умолчанию во временном каталоге системы)
+    UPLOAD_SPOOL_PATH: str | None = None
+    UPLOAD_SPOOL_TTL: float = 24 * 60 * 60
+    UPLOAD_SPOOL_CLEANUP_INTERVAL: float = 60 * 60
+
+    # Хранилище состояний FSM: memory (состояния теряются при перезапуске), sqlite (файл FSM_SQLITE_PATH
+    # относительно рабочего каталога) или redis (нужен пакет aiogram[redis])
+    FSM_STORAGE: str = "memory"
+    FSM_SQLITE_PATH: str = "fsm_storage.sqlite3"
+    FSM_REDIS_URL: str = "redis://localhost:6379/0"
+    FSM_STATE_TTL: int | None = None
+
+    # Способ получения обновлений: polling или webhook
+    BOT_MODE: str = "polling"
+    WEBHOOK_URL: str | None = None  # Внешний адрес сервера без пути, например https://example.com
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_SECRET: str | None = None
+    WEBHOOK_WORKERS: int = 32
+    WEBHOOK_QUEUE_SIZE: int = 1024
+    WEBHOOK_ENQUEUE_TIMEOUT: float = 5.0
+    WEBHOOK_SHUTDOWN_TIMEOUT: float = 30.0
+
+    # Пул процессов для отрисовки диаграмм
+    CHART_RENDER_WORKERS: int = 2
+    CHART_RENDER_QUEUE_LIMIT: int = 16
+    CHART_RENDER_TIMEOUT: float = 30.0
+    CHART_PDF_RENDER_TIMEOUT: float = 120.0
+    # Предельный размер одного изображения в пикселях, более высокие диаграммы делятся на страницы
+    CHART_MAX_IMAGE_PIXELS: int = 4_000_000
+    # Отправлять диаграмму Ганта дополнительно сжатым фото. Telegram не позволяет отправить фото по идентификатору
+    # документа, поэтому это вторая загрузка тех же данных
+    CHART_SEND_PHOTO_PREVIEW: bool = False
+
+    # Запуск бота: фоновая загрузка модулей диаграмм и ИИ-помощника и допустимое время импорта модулей бота
+    STARTUP_WARM_UP: bool = True
+    IMPORT_TIME_BUDGET: float = 1.5
+
+    # Кэш построенных диаграмм: объем в памяти и необязательный каталог на диске
+    CHART_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CHART_CACHE_MAX_FILE_IDS: int = 10000
+    CHART_CACHE_PATH: str | None = None
+    CHART_CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Кэш user_id, статуса студента и группы по Telegram ID
+    IDENTITY_CACHE_TTL: float = 60 * 60
+    IDENTITY_CACHE_MAX_ENTRIES: int = 100000
+
+    # API расписания ПетрГУ и общий кэш его ответов. В течение SCHEDULE_CACHE_STALE_TTL устаревший ответ
+    # отдается сразу и обновляется в фоне. SCHEDULE_CACHE_PATH - необязательный каталог для хранения ответов на диске
+    PETRSU_API_URL: str = "https://petrsu.egipti.com/api/v2"
+    SCHEDULE_CACHE_TTL: float = 60 * 60
+    SCHEDULE_CACHE_STALE_TTL: float = 7 * 24 * 60 * 60
+    SCHEDULE_CACHE_PATH: str | None = None
+    # Фоновая загрузка расписания всех групп пользователей: период, число одновременных запросов
+    # и наибольшая случайная задержка запроса в секундах. Период должен быть меньше SCHEDULE_CACHE_TTL
+    SCHEDULE_PREFETCH: bool = True
+    SCHEDULE_PREFETCH_INTERVAL: float = 30 * 60
+    SCHEDULE_PREFETCH_CONCURRENCY: int = 4
+    SCHEDULE_PREFETCH_JITTER: float = 60.0
+
+    @model_validator(mode="after")
+    def check_webhook_url(self):
+        # Без внешнего адреса бот не может зарегистрировать вебхук, поэтому ошибка выдается при запуске
+        if self.BOT_MODE == "webhook" and not self.WEBHOOK_URL:
+            raise ValueError("Для BOT_MODE=webhook необходимо указать WEBHOOK_URL")
+        return self
+
     class Config:
         env_file = ".env"  # Путь к .env файлу относительно этого сервиса
         env_file_encoding = 'utf-8'
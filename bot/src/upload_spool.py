@@ -0,0 +1,84 @@
+"""
+Временное хранилище файлов, прикрепляемых к заданию до его сохранения.
+В состоянии FSM хранится только имя файла в хранилище, содержимое лежит на диске
+"""
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import uuid
+from typing import BinaryIO
+
+from aiogram import Bot
+
+from .settings import settings
+
+
+class UploadSpool:
+    def __init__(self, root: str, ttl: float, cleanup_interval: float):
+        self.root = root
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        self._cleanup_task: asyncio.Task | None = None
+
+    def _path(self, handle: str) -> str:
+        # Имя проверяется, чтобы значение из состояния не могло указывать за пределы хранилища
+        return os.path.join(self.root, uuid.UUID(hex=handle).hex)
+
+    async def save(self, bot: Bot, file_path: str) -> str:
+        """
+        Скачивает файл из Telegram сразу на диск и возвращает его имя в хранилище.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        handle = uuid.uuid4().hex
+        await bot.download_file(file_path, destination=self._path(handle))
+        return handle
+
+    def open(self, handle: str) -> BinaryIO:
+        return open(self._path(handle), "rb")
+
+    def discard(self, handles: list[str]):
+        for handle in handles:
+            try:
+                os.remove(self._path(handle))
+            except (FileNotFoundError, ValueError):
+                pass
+
+    def cleanup_expired(self):
+        """
+        Удаляет файлы брошенных сценариев добавления задания, пролежавшие дольше ttl.
+        """
+        if not os.path.isdir(self.root):
+            return
+        expire_before = time.time() - self.ttl
+        for entry in os.scandir(self.root):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < expire_before:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    async def _run_cleanup(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.cleanup_expired)
+            except Exception as e:
+                logging.exception(e)
+            await asyncio.sleep(self.cleanup_interval)
+
+    async def start(self):
+        if self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._run_cleanup())
+
+    async def stop(self):
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+
+
+upload_spool = UploadSpool(
+    root=settings.UPLOAD_SPOOL_PATH or os.path.join(tempfile.gettempdir(), "labs-tg-bot-uploads"),
+    ttl=settings.UPLOAD_SPOOL_TTL,
+    cleanup_interval=settings.UPLOAD_SPOOL_CLEANUP_INTERVAL,
+)
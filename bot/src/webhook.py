@@ -0,0 +1,127 @@
+"""
+Прием обновлений через вебхук с ограниченным пулом обработчиков.
+Обновления разных чатов обрабатываются параллельно, обновления одного чата - строго по порядку
+"""
+import asyncio
+import logging
+from collections import deque
+
+from aiogram import Bot, Dispatcher
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.types import Update
+from aiohttp import web
+
+from .settings import settings
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class UpdatePipeline:
+    """
+    Обработка обновлений с сохранением порядка внутри чата. У каждого чата с необработанными обновлениями
+    своя очередь и своя задача, которая обрабатывает ее по порядку и завершается, когда очередь пуста.
+    Одновременно обрабатывается не больше workers обновлений, а ожидает обработки не больше queue_size,
+    поэтому медленный чат задерживает только свои обновления.
+    """
+
+    def __init__(self, dp: Dispatcher, bot: Bot, workers: int, queue_size: int, enqueue_timeout: float):
+        self.dp = dp
+        self.bot = bot
+        self.enqueue_timeout = enqueue_timeout
+        self._workers = asyncio.Semaphore(workers)
+        self._pending = asyncio.Semaphore(queue_size)
+        self._queues: dict[int, deque[Update]] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+
+    @staticmethod
+    def _chat_key(update: Update) -> int:
+        context = UserContextMiddleware.resolve_event_context(update)
+        if context.chat:
+            return context.chat.id
+        if context.user:
+            return context.user.id
+        return 0
+
+    async def _process_chat(self, key: int):
+        queue = self._queues[key]
+        try:
+            while queue:
+                update = queue.popleft()
+                try:
+                    async with self._workers:
+                        await self.dp.feed_update(self.bot, update)
+                except Exception as e:
+                    logging.exception(e)
+                finally:
+                    self._pending.release()
+        finally:
+            # Между проверкой пустой очереди и этим местом нет ожиданий, поэтому новое обновление чата
+            # не может попасть в очередь, которую уже никто не обработает
+            del self._queues[key]
+            del self._tasks[key]
+
+    async def submit(self, update: Update) -> bool:
+        """
+        Ставит обновление в очередь его чата. Возвращает False, если место в очереди не освободилось
+        за enqueue_timeout.
+        """
+        try:
+            await asyncio.wait_for(self._pending.acquire(), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        key = self._chat_key(update)
+        self._queues.setdefault(key, deque()).append(update)
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._process_chat(key))
+        return True
+
+    async def handle_request(self, request: web.Request) -> web.Response:
+        if settings.WEBHOOK_SECRET and request.headers.get(SECRET_HEADER) != settings.WEBHOOK_SECRET:
+            return web.Response(status=401)
+        try:
+            update = Update.model_validate(await request.json(), context={"bot": self.bot})
+        except ValueError:
+            # Тело запроса не JSON или не обновление Telegram (ValidationError тоже наследует ValueError)
+            return web.Response(status=400)
+        if not await self.submit(update):
+            # Telegram повторит доставку позже, так нагрузка сдерживается на его стороне
+            return web.Response(status=503)
+        return web.Response()
+
+    async def stop(self, timeout: float):
+        """
+        Дожидается уже принятых обновлений, чтобы не потерять их при остановке, но не дольше timeout секунд.
+        """
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            logging.warning("Обработка %d чатов не завершилась при остановке", len(pending))
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot):
+    pipeline = UpdatePipeline(dp, bot, workers=settings.WEBHOOK_WORKERS, queue_size=settings.WEBHOOK_QUEUE_SIZE,
+                              enqueue_timeout=settings.WEBHOOK_ENQUEUE_TIMEOUT)
+    app = web.Application()
+    app.router.add_post(settings.WEBHOOK_PATH, pipeline.handle_request)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT)
+
+    await dp.emit_startup(bot=bot, dispatcher=dp)
+    await site.start()
+    await bot.set_webhook(url=f"{settings.WEBHOOK_URL}{settings.WEBHOOK_PATH}",
+                          secret_token=settings.WEBHOOK_SECRET,
+                          allowed_updates=dp.resolve_used_update_types())
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+        await pipeline.stop(settings.WEBHOOK_SHUTDOWN_TIMEOUT)
+        await dp.emit_shutdown(bot=bot, dispatcher=dp)
+        await bot.session.close()
@@ -0,0 +1,6 @@
+import os
+
+# Модули бота читают настройки при импорте, для тестов достаточно заглушек обязательных значений
+os.environ.setdefault("BOT_TOKEN", "123456:test")
+os.environ.setdefault("API_URL", "http://localhost:8000")
+os.environ.setdefault("openAI_API_KEY", "test")
@@ -0,0 +1,44 @@
+import asyncio
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.src.api_client import api_client
+from bot.src.discipline_names import load_discipline_names
+from bot.src.settings import settings
+
+DISCIPLINES = {i: f"Дисциплина {i}" for i in range(1, 101)}
+
+
+def test_only_missing_names_are_requested(monkeypatch):
+    async def run():
+        requests = []
+
+        async def get_disciplines(request):
+            body = await request.json()
+            requests.append(body)
+            return web.json_response({"disciplines": [{"discipline_id": i, "name": DISCIPLINES[i]}
+                                                      for i in body["discipline_ids"]],
+                                      "next_cursor": None})
+
+        app = web.Application()
+        app.router.add_get("/get_disciplines", get_disciplines)
+        server = TestServer(app)
+        await server.start_server()
+        monkeypatch.setattr(settings, "API_URL", str(server.make_url("")).rstrip("/"))
+        state = FSMContext(MemoryStorage(), StorageKey(bot_id=1, chat_id=1, user_id=1))
+        await state.update_data(user_id=7, disciplines_dict={})
+        try:
+            assert (await load_discipline_names(state, [3, 1, 3])).status_code == 200
+            assert (await state.get_data())["disciplines_dict"] == {1: "Дисциплина 1", 3: "Дисциплина 3"}
+            assert await load_discipline_names(state, [1, 3]) is None
+            assert (await load_discipline_names(state, [3, 5])).status_code == 200
+            assert requests == [{"user_id": 7, "discipline_ids": [1, 3]}, {"user_id": 7, "discipline_ids": [5]}]
+        finally:
+            await api_client.close()
+            await server.close()
+
+    asyncio.run(run())
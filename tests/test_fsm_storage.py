@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import StorageKey
+from fakeredis.aioredis import FakeRedis
+
+from bot.src.fsm_storage import SQLiteStorage, COMPRESS_THRESHOLD, encode_state_data, COMPRESSED_PREFIX
+from bot.src.fsm_redis_storage import CompactRedisStorage
+
+KEY = StorageKey(bot_id=1, chat_id=100, user_id=100)
+OTHER_KEY = StorageKey(bot_id=1, chat_id=200, user_id=200)
+
+
+class ShowLabStates(StatesGroup):
+    showing_list = State()
+
+
+def large_state_data() -> dict:
+    labs = [{"task_id": i, "user_id": 7, "discipline_id": i % 5 + 1, "name": f"Лабораторная работа {i}",
+             "task_text": "Описание задания " * 10, "task_link": None, "start_date": "2026-09-01",
+             "end_date": "2026-10-01", "extra_info": None, "status": "В процессе"}
+            for i in range(300)]
+    return {
+        "user_id": 7,
+        "labs_response": {"labs": labs, "next_cursor": None},
+        "disciplines_dict": {i: f"Дисциплина {i}" for i in range(1, 6)},
+        "lab_list": {"filters": {"status": None}, "cursors": [None, "WzEsMl0="], "view": "all"},
+        "flags": {"True": True},
+        "empty": {},
+    }
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def storage(request, tmp_path):
+    if request.param == "sqlite":
+        storage = SQLiteStorage(str(tmp_path / "fsm.sqlite3"))
+    else:
+        storage = CompactRedisStorage(FakeRedis())
+    yield storage
+    asyncio.run(storage.close())
+
+
+def test_large_data_is_compressed():
+    assert encode_state_data(large_state_data()).startswith(COMPRESSED_PREFIX)
+    assert len(encode_state_data({"user_id": 7})) < COMPRESS_THRESHOLD
+
+
+def test_data_round_trip(storage):
+    async def run():
+        data = large_state_data()
+        await storage.set_data(KEY, data)
+        assert await storage.get_data(KEY) == data
+        assert list((await storage.get_data(KEY))["disciplines_dict"]) == [1, 2, 3, 4, 5]
+        assert await storage.get_data(OTHER_KEY) == {}
+
+        await storage.set_data(KEY, {"user_id": 8})
+        assert await storage.get_data(KEY) == {"user_id": 8}
+        await storage.set_data(KEY, {})
+        assert await storage.get_data(KEY) == {}
+
+    asyncio.run(run())
+
+
+def test_state_round_trip(storage):
+    async def run():
+        assert await storage.get_state(KEY) is None
+        await storage.set_state(KEY, ShowLabStates.showing_list)
+        assert await storage.get_state(KEY) == ShowLabStates.showing_list.state
+
+        # Данные и состояние хранятся независимо
+        await storage.set_data(KEY, {"user_id": 7})
+        assert await storage.get_state(KEY) == ShowLabStates.showing_list.state
+        await storage.set_state(KEY, "AddLabStates:waiting_for_name")
+        assert await storage.get_data(KEY) == {"user_id": 7}
+        assert await storage.get_state(KEY) == "AddLabStates:waiting_for_name"
+
+        await storage.set_state(KEY, None)
+        assert await storage.get_state(KEY) is None
+        assert await storage.get_state(OTHER_KEY) is None
+
+    asyncio.run(run())
+
+
+def test_sqlite_data_survives_reopen(tmp_path):
+    async def run():
+        path = str(tmp_path / "fsm.sqlite3")
+        storage = SQLiteStorage(path)
+        await storage.set_state(KEY, ShowLabStates.showing_list)
+        await storage.set_data(KEY, large_state_data())
+        await storage.close()
+
+        reopened = SQLiteStorage(path)
+        assert await reopened.get_state(KEY) == ShowLabStates.showing_list.state
+        assert await reopened.get_data(KEY) == large_state_data()
+        await reopened.close()
+
+    asyncio.run(run())
@@ -0,0 +1,100 @@
+import asyncio
+import os
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.utils.i18n import I18n
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from bot.src.api_client import api_client
+from bot.src.keyboards.lab_keyboard import disciplines_list
+from bot.src.picker import open_picker, load_picker_page, picker_keyboard, picker_is_empty, picker_item, \
+    PICKER_PAGE_SIZE
+from bot.src.settings import settings
+
+LOCALES = os.path.join(os.path.dirname(__file__), "..", "locales")
+DISCIPLINES = [{"discipline_id": i, "name": f"Дисциплина {i:02}"} for i in range(12)]
+
+
+def create_api(requests: list):
+    """
+    Замена /get_disciplines с постраничной выдачей: курсор - номер последней отданной дисциплины.
+    """
+    async def get_disciplines(request):
+        body = await request.json()
+        requests.append(body)
+        start = 0 if body["cursor"] is None else int(body["cursor"]) + 1
+        page = DISCIPLINES[start:start + body["limit"]]
+        has_next = start + body["limit"] < len(DISCIPLINES)
+        return web.json_response({"disciplines": page,
+                                  "next_cursor": str(page[-1]["discipline_id"]) if has_next else None})
+
+    app = web.Application()
+    app.router.add_get("/get_disciplines", get_disciplines)
+    return app
+
+
+def run_with_api(test, monkeypatch):
+    async def run():
+        requests = []
+        server = TestServer(create_api(requests))
+        await server.start_server()
+        monkeypatch.setattr(settings, "API_URL", str(server.make_url("")).rstrip("/"))
+        state = FSMContext(MemoryStorage(), StorageKey(bot_id=1, chat_id=1, user_id=1))
+        try:
+            await test(state, requests)
+        finally:
+            await api_client.close()
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_pages_are_requested_by_cursor(monkeypatch):
+    async def test(state, requests):
+        response = await open_picker(state, "/get_disciplines", {"user_id": 7}, "disciplines", "name")
+        assert response.status_code == 200
+        assert not await picker_is_empty(state)
+        assert (await picker_item(state, 0))["discipline_id"] == 0
+
+        assert (await load_picker_page(state, 1)).status_code == 200
+        assert (await picker_item(state, 0))["discipline_id"] == PICKER_PAGE_SIZE
+        assert (await load_picker_page(state, 2)).status_code == 200
+        assert [item["discipline_id"] for item in (await state.get_data())["picker"]["items"]] == [10, 11]
+        assert (await load_picker_page(state, 0)).status_code == 200
+
+        assert [request["cursor"] for request in requests] == [None, "4", "9", None]
+        assert all(request["limit"] == PICKER_PAGE_SIZE and request["user_id"] == 7 for request in requests)
+
+    run_with_api(test, monkeypatch)
+
+
+def test_keyboard_shows_only_current_page(monkeypatch):
+    async def test(state, requests):
+        await open_picker(state, "/get_disciplines", {"user_id": 7}, "disciplines", "name")
+        await load_picker_page(state, 1)
+        with I18n(path=LOCALES, default_locale="ru", domain="messages").context():
+            keyboard = await picker_keyboard(state, disciplines_list)
+        buttons = [button for row in keyboard.inline_keyboard for button in row]
+        assert [button.text for button in buttons[:PICKER_PAGE_SIZE]] == \
+               [f"Дисциплина {i:02}" for i in range(5, 10)]
+        assert [button.callback_data for button in buttons[PICKER_PAGE_SIZE:]] == \
+               ["lab_disciplines_page_0", "lab_disciplines_page_2"]
+
+    run_with_api(test, monkeypatch)
+
+
+def test_stale_pages_and_items(monkeypatch):
+    async def test(state, requests):
+        assert await load_picker_page(state, 0) is None
+        assert await picker_item(state, 0) is None
+
+        await open_picker(state, "/get_disciplines", {"user_id": 7}, "disciplines", "name")
+        # Курсор третьей страницы появляется только после открытия второй
+        assert await load_picker_page(state, 2) is None
+        assert await picker_item(state, PICKER_PAGE_SIZE) is None
+        assert len(requests) == 1
+
+    run_with_api(test, monkeypatch)
@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from bot.src.recurrence import week_window, occurrences, next_occurrence, occurrences_array
+
+TODAY = date(2026, 10, 14)
+PERIODICITIES = [0, 1, 7, 14, 30]
+# Начало раньше окна, в окне (включая его границы) и после окна
+START_DATES = [date(2025, 9, 1), date(2026, 9, 30), date(2026, 10, 5), date(2026, 10, 14),
+               date(2026, 10, 26), date(2026, 11, 20)]
+
+
+def generate_dates(start_date, periodicity_days, today, weeks=3):
+    # Перебор повторений, которым даты занятий вычислялись до recurrence
+    target_date = today - timedelta(days=7)
+    start_monday = target_date - timedelta(days=target_date.weekday())
+    end_date = start_monday + timedelta(weeks=weeks)
+    dates = []
+    if periodicity_days == 0:
+        if start_monday <= start_date <= end_date:
+            dates.append(start_date)
+    else:
+        current_date = start_date
+        while current_date < start_monday:
+            current_date += timedelta(days=periodicity_days)
+        while current_date <= end_date:
+            dates.append(current_date)
+            current_date += timedelta(days=periodicity_days)
+    return dates
+
+
+def next_by_loop(start_date, periodicity_days, today):
+    if periodicity_days == 0:
+        return start_date if start_date >= today else None
+    current_date = start_date
+    while current_date < today:
+        current_date += timedelta(days=periodicity_days)
+    return current_date
+
+
+def test_week_window():
+    assert week_window(TODAY) == (date(2026, 10, 5), date(2026, 10, 26))
+    assert week_window(date(2026, 10, 12)) == (date(2026, 10, 5), date(2026, 10, 26))
+
+
+@pytest.mark.parametrize("periodicity_days", PERIODICITIES)
+@pytest.mark.parametrize("start_date", START_DATES)
+def test_occurrences_matches_loop(start_date, periodicity_days):
+    assert occurrences(start_date, periodicity_days, *week_window(TODAY)) == \
+        generate_dates(start_date, periodicity_days, TODAY)
+
+
+@pytest.mark.parametrize("periodicity_days", PERIODICITIES)
+@pytest.mark.parametrize("start_date", START_DATES)
+def test_next_occurrence_matches_loop(start_date, periodicity_days):
+    assert next_occurrence(start_date, periodicity_days, TODAY) == next_by_loop(start_date, periodicity_days, TODAY)
+
+
+def test_occurrences_array_matches_occurrences():
+    lessons = [(start_date, periodicity_days) for start_date in START_DATES for periodicity_days in PERIODICITIES]
+    window_start, window_end = week_window(TODAY)
+
+    lesson_index, dates = occurrences_array([start for start, _ in lessons], [period for _, period in lessons],
+                                            window_start, window_end)
+
+    assert dates.dtype == np.dtype("datetime64[D]")
+    assert len(lesson_index) == len(dates)
+    expected_index = []
+    expected_dates = []
+    for index, (start_date, periodicity_days) in enumerate(lessons):
+        lesson_dates = occurrences(start_date, periodicity_days, window_start, window_end)
+        expected_index += [index] * len(lesson_dates)
+        expected_dates += lesson_dates
+    assert lesson_index.tolist() == expected_index
+    assert dates.astype(object).tolist() == expected_dates
+
+
+def test_occurrences_array_empty():
+    lesson_index, dates = occurrences_array([], [], *week_window(TODAY))
+    assert len(lesson_index) == 0
+    assert len(dates) == 0
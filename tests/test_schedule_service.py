@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+from aiohttp.test_utils import TestServer
+
+from bot.src.api_client import api_client
+from bot.src.petrsu_stub import PetrsuStub, SAMPLE_GROUPS
+from bot.src.schedule_service import ScheduleService, EMPTY_SCHEDULE
+
+GROUP = SAMPLE_GROUPS[0]
+
+
+def run_with_stub(test, delay: float = 0.0, **service_options):
+    """
+    Запускает test(service, stub) с сервисом расписания, обращающимся к локальной замене API ПетрГУ.
+    """
+    async def run():
+        stub = PetrsuStub(delay=delay)
+        server = TestServer(stub.create_app())
+        await server.start_server()
+        service = ScheduleService(str(server.make_url("")), **{"ttl": 60, "stale_ttl": 600, **service_options})
+        ingested = []
+
+        async def ingest(group, text):
+            ingested.append(group)
+
+        service._ingest = ingest
+        try:
+            await test(service, stub)
+        finally:
+            await api_client.close()
+            await server.close()
+        return ingested
+
+    return asyncio.run(run())
+
+
+def test_fresh_response_is_served_from_cache():
+    async def test(service, stub):
+        first = await service.get_schedule(GROUP)
+        second = await service.get_schedule(GROUP)
+        assert first == second
+        assert first["numerator"]
+        assert stub.requests[GROUP] == 1
+
+    assert run_with_stub(test) == [GROUP]
+
+
+def test_concurrent_requests_share_one_fetch():
+    async def test(service, stub):
+        responses = await asyncio.gather(*(service.schedule(GROUP) for _ in range(20)))
+        assert {response.status_code for response in responses} == {200}
+        assert len({response.text for response in responses}) == 1
+        assert stub.requests[GROUP] == 1
+
+    run_with_stub(test, delay=0.2)
+
+
+def test_stale_response_is_served_while_refreshing():
+    async def test(service, stub):
+        first = await service.schedule(GROUP)
+        await asyncio.sleep(0.15)
+
+        started = time.monotonic()
+        stale = await service.schedule(GROUP)
+        assert time.monotonic() - started < 0.2
+        assert stale.text == first.text
+        assert stub.requests[GROUP] == 1
+
+        # Обновление идет в фоне и после завершения отдается из кэша
+        await service.refresh(service.schedule_path(GROUP))
+        assert stub.requests[GROUP] == 2
+        await service.schedule(GROUP)
+        assert stub.requests[GROUP] == 2
+
+    run_with_stub(test, delay=0.3, ttl=0.1)
+
+
+def test_response_older_than_stale_ttl_is_fetched_again():
+    async def test(service, stub):
+        await service.schedule(GROUP)
+        await asyncio.sleep(0.15)
+        await service.schedule(GROUP)
+        assert stub.requests[GROUP] == 2
+
+    run_with_stub(test, ttl=0.05, stale_ttl=0.1)
+
+
+def test_disk_cache_is_shared_between_instances(tmp_path):
+    async def test(service, stub):
+        await service.schedule(GROUP)
+        other = ScheduleService(service.base_url, ttl=60, stale_ttl=600, root=str(tmp_path))
+        assert (await other.get_schedule(GROUP))["numerator"]
+        assert stub.requests[GROUP] == 1
+
+    run_with_stub(test, root=str(tmp_path))
+
+
+def test_unknown_group_returns_empty_schedule():
+    async def test(service, stub):
+        assert await service.get_schedule("00000") == EMPTY_SCHEDULE
+
+    assert run_with_stub(test) == []
+
+
+def test_ingest_does_not_delay_response():
+    async def test(service, stub):
+        ingest_finished = asyncio.Event()
+
+        async def slow_ingest(group, text):
+            await asyncio.sleep(0.5)
+            ingest_finished.set()
+
+        service._ingest = slow_ingest
+        started = time.monotonic()
+        assert (await service.schedule(GROUP)).status_code == 200
+        assert time.monotonic() - started < 0.4
+        assert not ingest_finished.is_set()
+        await asyncio.wait_for(ingest_finished.wait(), timeout=2)
+
+    run_with_stub(test)
+
+
+def test_stored_schedule_waits_for_ingest():
+    async def test(service, stub):
+        ingest_finished = asyncio.Event()
+
+        async def slow_ingest(group, text):
+            await asyncio.sleep(0.2)
+            ingest_finished.set()
+
+        service._ingest = slow_ingest
+        assert (await service.stored_schedule(GROUP)).status_code == 200
+        assert ingest_finished.is_set()
+        assert not service._ingests
+
+    run_with_stub(test)
@@ -0,0 +1,92 @@
+import asyncio
+
+from aiogram.types import Update
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from bot.src.webhook import UpdatePipeline
+
+
+def make_update(update_id: int, chat_id: int) -> Update:
+    return Update.model_validate({
+        "update_id": update_id,
+        "message": {"message_id": update_id, "date": 0, "chat": {"id": chat_id, "type": "private"},
+                    "from": {"id": chat_id, "is_bot": False, "first_name": "Test"}, "text": "test"},
+    })
+
+
+class SlowDispatcher:
+    """
+    Записывает порядок обработки обновлений, обновления чата slow_chat обрабатываются долго.
+    """
+
+    def __init__(self, slow_chat: int, delay: float):
+        self.slow_chat = slow_chat
+        self.delay = delay
+        self.processed: list[tuple[int, int]] = []
+
+    async def feed_update(self, bot, update: Update):
+        if update.message.chat.id == self.slow_chat:
+            await asyncio.sleep(self.delay)
+        self.processed.append((update.message.chat.id, update.update_id))
+
+
+def test_chat_order_and_no_head_of_line_blocking():
+    async def run():
+        dp = SlowDispatcher(slow_chat=1, delay=0.2)
+        pipeline = UpdatePipeline(dp, bot=None, workers=4, queue_size=100, enqueue_timeout=1)
+        for update_id in range(3):
+            assert await pipeline.submit(make_update(update_id, 1))
+        # Чаты с тем же остатком от деления, что и медленный, не ждут его
+        for chat_id in (5, 9, 13):
+            assert await pipeline.submit(make_update(100 + chat_id, chat_id))
+
+        await asyncio.sleep(0.05)
+        assert sorted(chat_id for chat_id, _ in dp.processed) == [5, 9, 13]
+
+        await pipeline.stop(timeout=5)
+        assert [update_id for chat_id, update_id in dp.processed if chat_id == 1] == [0, 1, 2]
+        assert not pipeline._queues and not pipeline._tasks
+
+    asyncio.run(run())
+
+
+def test_submit_rejects_when_queue_is_full():
+    async def run():
+        pipeline = UpdatePipeline(SlowDispatcher(slow_chat=1, delay=0.2), bot=None, workers=1, queue_size=2,
+                                  enqueue_timeout=0.01)
+        assert await pipeline.submit(make_update(1, 1))
+        assert await pipeline.submit(make_update(2, 1))
+        assert not await pipeline.submit(make_update(3, 2))
+        await pipeline.stop(timeout=5)
+        assert await pipeline.submit(make_update(4, 2))
+        await pipeline.stop(timeout=5)
+
+    asyncio.run(run())
+
+
+def test_stop_gives_up_after_timeout():
+    async def run():
+        dp = SlowDispatcher(slow_chat=1, delay=10)
+        pipeline = UpdatePipeline(dp, bot=None, workers=1, queue_size=10, enqueue_timeout=1)
+        await pipeline.submit(make_update(1, 1))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(pipeline.stop(timeout=0.05), timeout=1)
+        assert dp.processed == []
+        assert not pipeline._tasks
+
+    asyncio.run(run())
+
+
+def test_bad_request_body_returns_400():
+    async def run():
+        pipeline = UpdatePipeline(SlowDispatcher(slow_chat=1, delay=0), bot=None, workers=1, queue_size=10,
+                                  enqueue_timeout=1)
+        app = web.Application()
+        app.router.add_post("/webhook", pipeline.handle_request)
+        async with TestClient(TestServer(app)) as client:
+            for body in ("not json", '{"message": "not an update"}'):
+                response = await client.post("/webhook", data=body)
+                assert response.status == 400
+
+    asyncio.run(run())